@@ -0,0 +1,119 @@
+"""Generate a synthetic .docx corpus for benchmarks (deterministic per --seed).
+
+Documents look like the technical specs docxbrief is tuned for: a cover
+block, a revision table, numbered section headings taken from
+summarize._KNOWN_HEADINGS, body paragraphs in Japanese/English and
+optional embedded images (to make the zip heavy without adding text).
+
+    python benchmarks/gen_corpus.py --out /tmp/corpus --files 200 --paragraphs 120 --images 2
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import random
+import struct
+import sys
+import zlib
+from pathlib import Path
+
+from docx import Document
+from docx.shared import Inches
+
+try:
+    from docxbrief.summarize import _KNOWN_HEADINGS
+except ImportError:  # running from a source checkout without install
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+    from docxbrief.summarize import _KNOWN_HEADINGS
+
+_JA_WORDS = (
+    "本書", "解析", "条件", "結果", "確認", "設計", "要求", "評価", "試験", "手順",
+    "対象", "範囲", "変更", "影響", "検討", "方針", "仕様", "構成", "性能", "安全",
+)
+_EN_WORDS = (
+    "the", "system", "shall", "analysis", "result", "load", "case", "margin",
+    "design", "review", "input", "output", "model", "test", "value", "limit",
+)
+_FOCUS = ("目的", "結論", "決定事項", "TODO")
+
+
+def _png(width: int, height: int, rng: random.Random) -> bytes:
+    """Noise RGB PNG (incompressible, so it really weighs on the zip)."""
+    raw = b"".join(b"\x00" + rng.randbytes(width * 3) for _ in range(height))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", ihdr) + chunk(b"IDAT", zlib.compress(raw, 1)) + chunk(b"IEND", b"")
+
+
+def _sentence(rng: random.Random, lang: str) -> str:
+    if lang == "mixed":
+        lang = rng.choice(("ja", "en"))
+    if lang == "ja":
+        words = [rng.choice(_JA_WORDS) for _ in range(rng.randint(6, 18))]
+        s = "の".join(words) + "を行う。"
+    else:
+        words = [rng.choice(_EN_WORDS) for _ in range(rng.randint(8, 24))]
+        s = " ".join(words).capitalize() + "."
+    if rng.random() < 0.05:
+        s = f"{rng.choice(_FOCUS)}: {s}"
+    return s
+
+
+def make_document(path: Path, rng: random.Random, paragraphs: int, lang: str, images: int, image_px: int) -> None:
+    doc = Document()
+    doc.add_paragraph(f"技術資料 {path.stem}")
+    doc.add_paragraph("Synthetic benchmark document")
+    table = doc.add_table(rows=3, cols=4)
+    for i, h in enumerate(("改訂", "変更内容", "著者", "日付")):
+        table.cell(0, i).text = h
+    table.cell(1, 0).text = "A"
+    table.cell(1, 3).text = "2026/01/28"
+
+    headings = list(_KNOWN_HEADINGS)
+    per_section = max(1, paragraphs // len(headings))
+    written = 0
+    for n, heading in enumerate(headings, start=1):
+        doc.add_paragraph(f"{n}. {heading}")
+        for _ in range(per_section):
+            if written >= paragraphs:
+                break
+            doc.add_paragraph(_sentence(rng, lang))
+            written += 1
+        if images and n <= images:
+            doc.add_picture(io.BytesIO(_png(image_px, image_px, rng)), width=Inches(2))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    doc.save(str(path))
+
+
+def generate(out: Path, files: int, paragraphs: int, lang: str, images: int, image_px: int, dirs: int, seed: int) -> list[Path]:
+    rng = random.Random(seed)
+    paths = []
+    for i in range(files):
+        sub = out / f"dir{i % dirs:02d}" if dirs > 1 else out
+        p = sub / f"doc{i:05d}.docx"
+        make_document(p, random.Random(rng.getrandbits(64)), paragraphs, lang, images, image_px)
+        paths.append(p)
+    return paths
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--out", required=True, help="Output directory")
+    ap.add_argument("--files", type=int, default=50)
+    ap.add_argument("--paragraphs", type=int, default=80, help="Body paragraphs per document")
+    ap.add_argument("--lang", choices=["ja", "en", "mixed"], default="mixed")
+    ap.add_argument("--images", type=int, default=0, help="Embedded images per document")
+    ap.add_argument("--image-px", type=int, default=256, help="Image width/height in pixels")
+    ap.add_argument("--dirs", type=int, default=4, help="Spread files over this many subdirectories")
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args(argv)
+    paths = generate(Path(args.out), args.files, args.paragraphs, args.lang, args.images, args.image_px, args.dirs, args.seed)
+    print(f"Generated {len(paths)} file(s) under {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,196 @@
+"""Time docxbrief phases on a .docx corpus and compare against a baseline.
+
+Phases: scan_files, sha256_file, extract_docx_text, summarize_text,
+summarize_reuse (every section bullet taken from a previous run), render_summary, cold build (empty state), no-op update and the line diff
+engine on synthetic 10k-line table-like inputs (a few hundred edits, and
+unrelated texts that hit the edit cutoff). Each phase runs --repeat times;
+min and median wall seconds are reported.
+
+    python benchmarks/run_bench.py --generate 100 --out bench.json
+    python benchmarks/run_bench.py --corpus /tmp/corpus --baseline bench.json --threshold 0.25
+
+With --baseline the exit status is 1 when any phase's min time exceeds the
+baseline min by more than --threshold (relative) and --min-delta (seconds).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+try:
+    import docxbrief
+except ImportError:  # running from a source checkout without install
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+    import docxbrief
+
+from docxbrief.config import Config
+from docxbrief.scan import scan_files
+from docxbrief.state import sha256_file, load_manifest, wipe_state
+from docxbrief.extract import extract_docx_text
+from docxbrief.summarize import summarize_sections, summarize_text
+from docxbrief.render import render_summary
+from docxbrief.build import build_summary, update_summary
+from docxbrief.diffutil import diff_stats
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from gen_corpus import generate  # noqa: E402
+
+
+def _set(raw: dict, dotted: str, value: str) -> None:
+    keys = dotted.split(".")
+    d = raw
+    for k in keys[:-1]:
+        d = d.setdefault(k, {})
+    try:
+        d[keys[-1]] = json.loads(value)
+    except json.JSONDecodeError:
+        d[keys[-1]] = value
+
+
+def _project(corpus: Path, work: Path, overrides: list[str]) -> Config:
+    raw = {
+        "project": {
+            "name": "bench",
+            "input_dir": str(corpus),
+            "output_adoc": str(work / "summary.adoc"),
+            "state_dir": str(work / "state"),
+        },
+        "scan": {"include_glob": ["**/*.docx"], "exclude_glob": ["**/~$*.docx"]},
+        "filter": {"filename_regex": [], "max_files": 1_000_000},
+    }
+    for item in overrides:
+        key, _, value = item.partition("=")
+        _set(raw, key, value)
+    return Config(raw=raw, config_path=work / "docxbrief.yaml")
+
+
+def _time(fn: Callable[[], object], repeat: int, setup: Callable[[], object] | None = None) -> dict:
+    runs = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - t0)
+    return {"min": min(runs), "median": statistics.median(runs), "runs": runs}
+
+
+def _diff_inputs(lines: int = 10_000, edits: int = 300, seed: int = 1) -> tuple[str, str, str]:
+    """Table-heavy text (few distinct, often repeated rows), an edited copy and an unrelated text."""
+    rnd = random.Random(seed)
+    rows = [f"| {i} | 2024/01/{i % 28 + 1:02d} | 改訂 |" for i in range(150)]
+    old = [rnd.choice(rows) for _ in range(lines)]
+    new = list(old)
+    for _ in range(edits):
+        new[rnd.randrange(lines)] = rnd.choice(rows)
+    other = [rnd.choice(rows) for _ in range(lines)]
+    return "\n".join(old), "\n".join(new), "\n".join(other)
+
+
+def run(cfg: Config, repeat: int) -> dict:
+    files = scan_files(cfg)
+    texts = [extract_docx_text(cfg, p) for p in files]
+    phases: dict[str, dict] = {}
+    phases["scan_files"] = _time(lambda: scan_files(cfg), repeat)
+    phases["sha256_file"] = _time(lambda: [sha256_file(p) for p in files], repeat)
+    phases["extract_docx_text"] = _time(lambda: [extract_docx_text(cfg, p) for p in files], repeat)
+    phases["summarize_text"] = _time(lambda: [summarize_text(cfg, t) for t in texts], repeat)
+    # an update whose sections all kept their hash: the cost left is splitting and hashing
+    reuse = [{sec["hash"]: sec["bullet"] for sec in summarize_sections(cfg, t)[1] if "bullet" in sec} for t in texts]
+    phases["summarize_reuse"] = _time(lambda: [summarize_sections(cfg, t, r) for t, r in zip(texts, reuse)], repeat)
+
+    phases["build_cold"] = _time(lambda: build_summary(cfg), repeat, setup=lambda: wipe_state(cfg))
+    manifest = load_manifest(cfg)
+    summaries = {k: v.get("summary", []) for k, v in manifest.get("files", {}).items()}
+    phases["render_summary"] = _time(lambda: render_summary(cfg, files, summaries, manifest), repeat)
+    phases["update_noop"] = _time(lambda: update_summary(cfg), repeat)
+
+    old, new, other = _diff_inputs()
+    max_edits = int(cfg.raw.get("update", {}).get("diff_max_edits", 1000))
+    phases["diff_10k_edited"] = _time(lambda: diff_stats(old, new, max_edits), repeat)
+    phases["diff_10k_cutoff"] = _time(lambda: diff_stats(old, other, max_edits), repeat)
+    return {
+        "meta": {
+            "docxbrief": docxbrief.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "files": len(files),
+            "bytes": sum(p.stat().st_size for p in files),
+            "chars": sum(len(t) for t in texts),
+            "repeat": repeat,
+            "config": {k: cfg.raw[k] for k in cfg.raw if k not in ("project", "scan", "filter")},
+        },
+        "phases": phases,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float, min_delta: float) -> list[str]:
+    regressions = []
+    for name, base in baseline.get("phases", {}).items():
+        cur = current["phases"].get(name)
+        if cur is None:
+            continue
+        limit = base["min"] * (1.0 + threshold)
+        if cur["min"] > limit and cur["min"] - base["min"] > min_delta:
+            regressions.append(f"{name}: {cur['min']:.4f}s vs baseline {base['min']:.4f}s (+{(cur['min'] / base['min'] - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--corpus", help="Existing directory of .docx files")
+    src.add_argument("--generate", type=int, metavar="N", help="Generate N synthetic files (see gen_corpus.py)")
+    ap.add_argument("--paragraphs", type=int, default=80, help="--generate: paragraphs per document")
+    ap.add_argument("--images", type=int, default=1, help="--generate: images per document")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--set", dest="overrides", action="append", default=[], metavar="KEY=VALUE",
+                    help="Config override, e.g. --set extract.engine=stream --set build.jobs=4")
+    ap.add_argument("--out", help="Write results JSON here")
+    ap.add_argument("--baseline", help="Baseline results JSON to compare against")
+    ap.add_argument("--threshold", type=float, default=0.25, help="Allowed relative slowdown (default: 0.25)")
+    ap.add_argument("--min-delta", type=float, default=0.005, help="Ignore slowdowns below this many seconds")
+    args = ap.parse_args(argv)
+
+    work = Path(tempfile.mkdtemp(prefix="docxbrief-bench-"))
+    try:
+        if args.generate is not None:
+            corpus = work / "corpus"
+            generate(corpus, args.generate, args.paragraphs, "mixed", args.images, 256, 4, args.seed)
+        else:
+            corpus = Path(args.corpus)
+        results = run(_project(corpus, work, args.overrides), args.repeat)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    meta = results["meta"]
+    print(f"docxbrief {meta['docxbrief']} / Python {meta['python']}: {meta['files']} file(s), {meta['bytes'] / 1e6:.1f} MB")
+    for name, r in results["phases"].items():
+        print(f"  {name:<18} min {r['min']:.4f}s  median {r['median']:.4f}s")
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.threshold, args.min_delta)
+        if regressions:
+            print("REGRESSIONS:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"No regressions vs {args.baseline} (threshold {args.threshold:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,16 +3,24 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 import datetime as _dt
+import json
+import os
 import shlex
 import subprocess
+import tempfile
 import time
-from typing import Iterable, Optional, Tuple
+from typing import Iterable, Optional, Sequence, Tuple
 
 import yaml
 
+from .tmuxctl import open_tmux, send_lines
+from .inotify import Inotify, inotify_available, IN_CLOSE_WRITE, IN_CREATE, IN_MOVED_TO
+
 
 DEFAULT_SESSION = "docxbrief-b"
 DEFAULT_WINDOW = "main"
+RESULTS_DIR = Path("b/results")
+RESULTS_INDEX = Path("b/state/results-index.json")
 PANE_FALLBACK = {
     "shogun": "0",
     "karo": "1",
@@ -76,25 +84,6 @@ def _send_keys(target: str, lines: Iterable[str]) -> None:
     subprocess.check_call(["tmux", "send-keys", "-t", target, msg, "C-m"])
 
 
-def _tmux_check_session(session: str) -> None:
-    subprocess.check_call(["tmux", "has-session", "-t", session])
-
-
-def _tmux_find_pane_id_by_title(session: str, title: str) -> Optional[str]:
-    out = subprocess.check_output(
-        ["tmux", "list-panes", "-t", session, "-a", "-F", "#{pane_id}\t#{pane_title}"],
-        text=True,
-    )
-    for line in out.splitlines():
-        try:
-            pane_id, pane_title = line.split("\t", 1)
-        except ValueError:
-            continue
-        if pane_title.strip() == title:
-            return pane_id.strip()
-    return None
-
-
 def _task_expected_path(task: dict) -> Optional[str]:
     try:
         exp = task.get("outputs", {}).get("expected", [])
@@ -105,15 +94,6 @@ def _task_expected_path(task: dict) -> Optional[str]:
     return None
 
 
-def _send_line(target: str, line: str) -> None:
-    # Use literal mode for the message, and send Enter separately (twice for reliability).
-    subprocess.check_call(["tmux", "send-keys", "-t", target, "-l", line])
-    time.sleep(0.05)
-    subprocess.check_call(["tmux", "send-keys", "-t", target, "Enter"])
-    time.sleep(0.05)
-    subprocess.check_call(["tmux", "send-keys", "-t", target, "Enter"])
-
-
 def _expected_results(task: dict) -> list[Path]:
     outputs = task.get("outputs", {})
     expected = outputs.get("expected", [])
@@ -165,68 +145,215 @@ def _task_info(task_path: Path) -> TaskInfo:
     )
 
 
-def dispatch_task(task_path: Path) -> None:
+def _dispatch_plan(task_path: Path, assignee: Optional[str] = None) -> tuple[str, str, Optional[str], list[str]]:
+    """(task_id, assignee, expected, lines to type) for one task YAML."""
     task = yaml.safe_load(task_path.read_text(encoding="utf-8"))
     task_id = str(task.get("id", task_path.stem))
-    assignee = str(task.get("assignee", "ashigaru1"))
-    session = _session_name()
+    assignee = assignee or str(task.get("assignee", "ashigaru1"))
+    expected = _task_expected_path(task)
+    lines = [f"Read: {task_path.as_posix()}"]
+    if expected:
+        lines.append(f"You must create: {expected} (task_id={task_id})")
+    else:
+        lines.append(f"Use task_id={task_id}. Write result YAML under b/results/.")
+    return task_id, assignee, expected, lines
+
+
+def _pane_ids_by_title(tmux) -> dict[str, str]:
+    (out,) = tmux.run([["list-panes", "-a", "-F", "#{pane_id}\t#{pane_title}"]])
+    panes: dict[str, str] = {}
+    for line in out:
+        try:
+            pane_id, pane_title = line.split("\t", 1)
+        except ValueError:
+            continue
+        panes.setdefault(pane_title.strip(), pane_id.strip())
+    return panes
 
-    _tmux_check_session(session)
-    pane_id = _tmux_find_pane_id_by_title(session, assignee)
-    if pane_id is None:
-        raise RuntimeError(
-            f"Cannot find pane with title '{assignee}' in tmux session '{session}'. "
-            f"Run: tmux list-panes -t {session} -a -F '#{{pane_id}} \"#{{pane_title}}\"'"
+
+def dispatch_many(
+    task_paths: Sequence[Path],
+    backend: str = "control",
+    tmux=None,
+    assignees: Optional[dict[Path, str]] = None,
+) -> list[str]:
+    """Dispatch a batch of tasks over one tmux connection; returns the task ids.
+
+    Panes are resolved once for the whole batch and every pane is typed into
+    in parallel (tasks for the same assignee follow each other in order).
+    Each task gets the same lock file and dispatch.log line as dispatch_task.
+    `assignees` overrides the task YAML's assignee per path; an open `tmux`
+    connection may be passed in to reuse it across batches.
+    """
+    assignees = assignees or {}
+    plans = [(p, *_dispatch_plan(p, assignees.get(p))) for p in task_paths]
+    session = _session_name()
+    own = tmux is None
+    if own:
+        tmux = open_tmux(session, backend)
+    try:
+        panes = _pane_ids_by_title(tmux)
+        by_pane: dict[str, list[str]] = {}
+        for _path, _task_id, assignee, _expected, lines in plans:
+            pane_id = panes.get(assignee)
+            if pane_id is None:
+                raise RuntimeError(
+                    f"Cannot find pane with title '{assignee}' in tmux session '{session}'. "
+                    f"Run: tmux list-panes -t {session} -a -F '#{{pane_id}} \"#{{pane_title}}\"'"
+                )
+            by_pane.setdefault(pane_id, []).extend(lines)
+        send_lines(tmux, by_pane)
+    finally:
+        if own:
+            tmux.close()
+
+    for _path, task_id, assignee, expected, _lines in plans:
+        _write_lock(assignee, task_id)
+        _log_line(
+            Path("b/logs/dispatch.log"),
+            f"dispatch {task_id} -> {assignee} ({session}) pane={panes[assignee]} expected={expected}",
         )
+    return [task_id for _p, task_id, *_rest in plans]
 
-    expected = _task_expected_path(task)
 
-    _send_line(pane_id, f"Read: {task_path.as_posix()}")
-    if expected:
-        _send_line(pane_id, f"You must create: {expected} (task_id={task_id})")
-    else:
-        _send_line(pane_id, f"Use task_id={task_id}. Write result YAML under b/results/.")
+def dispatch_task(task_path: Path, backend: str = "control") -> None:
+    dispatch_many([task_path], backend=backend)
 
-    _write_lock(assignee, task_id)
-    _log_line(Path("b/logs/dispatch.log"), f"dispatch {task_id} -> {assignee} ({session}) pane={pane_id} expected={expected}")
+
+def _load_results_index() -> dict:
+    try:
+        data = json.loads(RESULTS_INDEX.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {"version": 1, "files": {}}
+    if not isinstance(data, dict) or data.get("version") != 1 or not isinstance(data.get("files"), dict):
+        return {"version": 1, "files": {}}
+    return data
+
+
+def _save_results_index(index: dict) -> None:
+    RESULTS_INDEX.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=RESULTS_INDEX.parent, prefix=".results-index.", suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False)
+    os.replace(tmp, RESULTS_INDEX)
+
+
+def _refresh_results_index() -> dict:
+    """Bring b/state/results-index.json in line with b/results/.
+
+    Entries are keyed by file name and carry (mtime_ns, size, task_id); only
+    files that are new or whose mtime/size changed are YAML-parsed again.
+    """
+    index = _load_results_index()
+    files: dict = index["files"]
+    seen: set[str] = set()
+    changed = False
+    try:
+        it = os.scandir(RESULTS_DIR)
+    except FileNotFoundError:
+        it = None
+    if it is not None:
+        with it:
+            for e in it:
+                if not (e.name.startswith("RESULT-") and e.name.endswith(".yaml")):
+                    continue
+                try:
+                    st = e.stat()
+                except OSError:
+                    continue
+                seen.add(e.name)
+                prev = files.get(e.name)
+                if prev and prev.get("mtime_ns") == st.st_mtime_ns and prev.get("size") == st.st_size:
+                    continue
+                try:
+                    task_id = str(_load_yaml(Path(e.path)).get("task_id", "")).strip()
+                except Exception:
+                    task_id = None  # unreadable/partial: parsed again once it changes
+                files[e.name] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "task_id": task_id}
+                changed = True
+    for name in [n for n in files if n not in seen]:
+        del files[name]
+        changed = True
+    if changed:
+        _save_results_index(index)
+    return index
 
 
 def _find_latest_result_by_task_id(task_id: str) -> Path | None:
-    results_dir = Path("b/results")
-    if not results_dir.exists():
-        return None
     latest_path: Path | None = None
-    latest_mtime = -1.0
-    for path in results_dir.glob("RESULT-*.yaml"):
-        try:
-            data = _load_yaml(path)
-        except Exception:
-            continue
-        if str(data.get("task_id", "")).strip() == task_id:
-            mtime = path.stat().st_mtime
-            if mtime > latest_mtime:
-                latest_mtime = mtime
-                latest_path = path
+    latest_mtime = -1
+    for name, entry in _refresh_results_index()["files"].items():
+        if entry.get("task_id") == task_id and entry["mtime_ns"] > latest_mtime:
+            latest_mtime = entry["mtime_ns"]
+            latest_path = RESULTS_DIR / name
     return latest_path
 
 
+class _DirWaiter:
+    """Block until something is created/written in one of the directories
+    (inotify), or sleep a polling interval where inotify is unavailable or a
+    directory does not exist yet."""
+
+    POLL_INTERVAL = 0.5
+    # re-check even with inotify, in case events are missed (network filesystems)
+    SAFETY_INTERVAL = 5.0
+
+    def __init__(self, *directories: Path) -> None:
+        self.ino: Inotify | None = None
+        self.interval = self.POLL_INTERVAL
+        if inotify_available():
+            try:
+                self.ino = Inotify()
+                complete = True
+                for d in dict.fromkeys(directories):
+                    if d.is_dir():
+                        self.ino.add_watch(str(d), IN_CLOSE_WRITE | IN_CREATE | IN_MOVED_TO)
+                    else:
+                        complete = False
+                if complete:
+                    self.interval = self.SAFETY_INTERVAL
+            except OSError:
+                self.close()
+
+    def wait(self, timeout: float) -> None:
+        if self.ino is None:
+            time.sleep(min(timeout, self.interval))
+        else:
+            self.ino.read(min(timeout, self.interval))
+
+    def close(self) -> None:
+        if self.ino is not None:
+            self.ino.close()
+            self.ino = None
+
+
 def await_result(task_path: Path, timeout: float) -> tuple[Path | None, str]:
     info = _task_info(task_path)
     deadline = time.monotonic() + timeout
     if info.expected_results:
         expected = info.expected_results[0]
         description = f"expected: {expected.as_posix()}"
+        watch_dir = expected.parent
+
+        def check() -> Path | None:
+            return expected if expected.exists() else None
+    else:
+        description = f"searched: b/results/*.yaml with task_id == {info.task_id}"
+        watch_dir = RESULTS_DIR
+
+        def check() -> Path | None:
+            return _find_latest_result_by_task_id(info.task_id)
+
+    # watch first, then check: a result written in between still wakes us up
+    waiter = _DirWaiter(watch_dir)
+    try:
         while True:
-            if expected.exists():
-                return expected, description
-            if time.monotonic() >= deadline:
+            match = check()
+            if match is not None:
+                return match, description
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
                 return None, description
-            time.sleep(0.5)
-    description = f"searched: b/results/*.yaml with task_id == {info.task_id}"
-    while True:
-        match = _find_latest_result_by_task_id(info.task_id)
-        if match is not None:
-            return match, description
-        if time.monotonic() >= deadline:
-            return None, description
-        time.sleep(0.5)
+            waiter.wait(remaining)
+    finally:
+        waiter.close()
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from pathlib import Path
+import datetime as _dt
+import hashlib
+from typing import Optional, Sequence
+
+import yaml
+
+from .config import Config
+from .scan import scan_entries
+from .state import load_manifest
+
+TASKS_DIR = Path("b/tasks")
+PLAN_PREFIX = "TASK-plan-"
+DEFAULT_OBJECTIVE = "Review the listed documents and report findings (one section per document)."
+
+
+def estimate_work(cfg: Config) -> list[tuple[Path, int, bool]]:
+    """(path, estimated extracted chars, measured?) for every scanned file.
+
+    Files whose manifest entry still matches (same size) use the char count
+    recorded at build time; the rest are estimated from their size with the
+    chars/byte ratio of the measured files (1.0 if nothing is measured yet).
+    """
+    entries = load_manifest(cfg).get("files", {})
+    rows: list[tuple[Path, int, Optional[int]]] = []
+    known_chars = known_bytes = 0
+    for p, st in scan_entries(cfg):
+        e = entries.get(str(p)) or {}
+        chars = e.get("chars") if e.get("size") == st.st_size else None
+        if chars is not None:
+            known_chars += int(chars)
+            known_bytes += st.st_size
+        rows.append((p, st.st_size, chars))
+    ratio = (known_chars / known_bytes) if known_bytes else 1.0
+    return [
+        (p, int(chars) if chars is not None else max(1, round(size * ratio)), chars is not None)
+        for p, size, chars in rows
+    ]
+
+
+def balance(items: Sequence[tuple[Path, int]], n: int) -> list[list[tuple[Path, int]]]:
+    """Longest-processing-time-first bin packing into n bins.
+
+    Deterministic: items are taken by (-work, path) and ties between equally
+    loaded bins go to the lowest index; each bin is then listed by path.
+    """
+    n = max(1, n)
+    bins: list[list[tuple[Path, int]]] = [[] for _ in range(n)]
+    loads = [0] * n
+    for p, w in sorted(items, key=lambda x: (-x[1], str(x[0]))):
+        i = min(range(n), key=lambda k: (loads[k], k))
+        bins[i].append((p, w))
+        loads[i] += w
+    return [sorted(b, key=lambda x: str(x[0])) for b in bins]
+
+
+def _shard_id(paths: Sequence[Path]) -> str:
+    h = hashlib.sha256("\n".join(p.as_posix() for p in paths).encode("utf-8"))
+    return h.hexdigest()[:8]
+
+
+def _task_spec(task_id: str, assignee: str, members: list[tuple[Path, int]], issuer: str, objective: str) -> dict:
+    suffix = task_id[5:]
+    total = sum(w for _, w in members)
+    return {
+        "version": 1,
+        "id": task_id,
+        "issued_at": _dt.datetime.now().astimezone().isoformat(timespec="seconds"),
+        "issuer": issuer,
+        "assignee": assignee,
+        "title": f"Review {len(members)} document(s) (~{total} chars)",
+        "objective": objective,
+        "inputs": {
+            "repo_root": ".",
+            "files": [p.as_posix() for p, _ in members],
+            "estimated_chars": total,
+        },
+        "outputs": {"expected": [f"b/results/RESULT-{suffix}.yaml"]},
+        "acceptance": ["Covers every listed document", "Cites the document path for each finding"],
+        "constraints": {"network": "disallow", "write_policy": "no_direct_edit"},
+        "handoff": {"return_to": issuer},
+    }
+
+
+def plan_tasks(
+    cfg: Config,
+    assignees: Sequence[str],
+    shards: Optional[int] = None,
+    *,
+    issuer: str = "karo",
+    objective: str = DEFAULT_OBJECTIVE,
+    dry_run: bool = False,
+    clean: bool = False,
+) -> list[Path]:
+    """Bin scanned documents into size-balanced Task Spec v1 YAMLs under b/tasks/.
+
+    Shard i goes to assignees[i % len(assignees)]. Task ids are derived from
+    the member paths, so re-planning an unchanged corpus maps to the same
+    files; existing ones are left untouched (issued_at included). With
+    clean=True, earlier TASK-plan-* files that are no longer part of the plan
+    are removed.
+    """
+    if not assignees:
+        raise ValueError("b plan needs at least one assignee")
+    work = estimate_work(cfg)
+    n = shards or len(assignees)
+    bins = [b for b in balance([(p, w) for p, w, _ in work], n) if b]
+    measured = sum(1 for *_, m in work if m)
+
+    print(f"Plan: {len(work)} document(s) into {len(bins)} task(s) ({measured} measured, {len(work) - measured} estimated from size)")
+    written: list[Path] = []
+    for i, members in enumerate(bins):
+        assignee = assignees[i % len(assignees)]
+        task_id = PLAN_PREFIX + _shard_id([p for p, _ in members])
+        path = TASKS_DIR / f"{task_id}-{assignee}.yaml"
+        total = sum(w for _, w in members)
+        state = "unchanged" if path.exists() else ("would write" if dry_run else "written")
+        print(f"  {path.as_posix()}  {len(members):4d} doc(s)  ~{total} chars  [{state}]")
+        if not dry_run and not path.exists():
+            TASKS_DIR.mkdir(parents=True, exist_ok=True)
+            spec = _task_spec(task_id, assignee, members, issuer, objective)
+            path.write_text(yaml.safe_dump(spec, sort_keys=False, allow_unicode=True), encoding="utf-8")
+        written.append(path)
+
+    if clean and TASKS_DIR.exists():
+        keep = set(written)
+        for old in sorted(TASKS_DIR.glob(f"{PLAN_PREFIX}*.yaml")):
+            if old not in keep:
+                print(f"  {old.as_posix()}  [{'would remove' if dry_run else 'removed'}]")
+                if not dry_run:
+                    old.unlink()
+    return written
@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+import datetime as _dt
+import time
+from typing import Callable, Optional, Sequence
+
+import yaml
+
+from .bdispatch import (
+    RESULTS_DIR,
+    TaskInfo,
+    _DirWaiter,
+    _find_latest_result_by_task_id,
+    _load_yaml,
+    _session_name,
+    _task_info,
+    _write_lock,
+    dispatch_many,
+)
+from .tmuxctl import open_tmux
+
+STATE_DIR = Path("b/state")
+DEFAULT_ASSIGNEES = ("ashigaru1", "ashigaru2")
+# assignee value that lets the scheduler pick any free pane from the pool
+ANY_ASSIGNEE = "any"
+
+
+@dataclass
+class _Task:
+    info: TaskInfo
+    depends_on: list[str]
+    state: str = "pending"  # pending | running | done | failed | skipped
+    assignee: str = ""
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    result: Optional[Path] = None
+    dependents: list[str] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+
+def _log(message: str) -> None:
+    now = _dt.datetime.now().isoformat(timespec="seconds")
+    print(f"[{now}] {message}", flush=True)
+
+
+def load_tasks(task_paths: Sequence[Path]) -> dict[str, _Task]:
+    """Read task YAMLs (Task Spec v1 + optional depends_on) and validate the DAG."""
+    tasks: dict[str, _Task] = {}
+    for p in task_paths:
+        info = _task_info(p)
+        if info.task_id in tasks:
+            raise ValueError(f"duplicate task id {info.task_id}: {tasks[info.task_id].info.path} and {p}")
+        deps = _load_yaml(p).get("depends_on") or []
+        if isinstance(deps, str):
+            deps = [deps]
+        tasks[info.task_id] = _Task(info=info, depends_on=[str(d).strip() for d in deps])
+
+    for tid, t in tasks.items():
+        for d in t.depends_on:
+            if d not in tasks:
+                raise ValueError(f"{tid} depends on unknown task {d}")
+            tasks[d].dependents.append(tid)
+
+    # Kahn's algorithm: anything left over sits on a cycle
+    indeg = {tid: len(t.depends_on) for tid, t in tasks.items()}
+    ready = [tid for tid, n in indeg.items() if n == 0]
+    seen = 0
+    while ready:
+        tid = ready.pop()
+        seen += 1
+        for dep in tasks[tid].dependents:
+            indeg[dep] -= 1
+            if indeg[dep] == 0:
+                ready.append(dep)
+    if seen != len(tasks):
+        cyclic = sorted(tid for tid, n in indeg.items() if n > 0)
+        raise ValueError(f"dependency cycle among: {', '.join(cyclic)}")
+    return tasks
+
+
+def _find_result(info: TaskInfo) -> Optional[Path]:
+    if info.expected_results:
+        expected = info.expected_results[0]
+        return expected if expected.exists() else None
+    return _find_latest_result_by_task_id(info.task_id)
+
+
+def _result_failed(path: Path) -> bool:
+    try:
+        data = _load_yaml(path)
+    except Exception:
+        return False
+    # Result Spec v1: done|needs-info|blocked|failed; no status counts as done
+    status = str(data.get("status", "done") if isinstance(data, dict) else "done").strip().lower()
+    return status != "done"
+
+
+def _read_lock(assignee: str) -> Optional[str]:
+    try:
+        data = _load_yaml(STATE_DIR / f"lock-{assignee}")
+    except (FileNotFoundError, yaml.YAMLError):
+        return None
+    return str(data.get("task_id", "")).strip() or None
+
+
+def _release_lock(assignee: str, still_running: list[str]) -> None:
+    if still_running:
+        _write_lock(assignee, still_running[0])
+    else:
+        (STATE_DIR / f"lock-{assignee}").unlink(missing_ok=True)
+
+
+def _foreign_lock_done(task_id: str) -> bool:
+    """A lock from outside this run is stale once its task has a result."""
+    suffix = task_id[5:] if task_id.startswith("TASK-") else task_id
+    return (RESULTS_DIR / f"RESULT-{suffix}.yaml").exists() or _find_latest_result_by_task_id(task_id) is not None
+
+
+def critical_path(tasks: dict[str, _Task]) -> tuple[float, list[str]]:
+    """Longest chain of dependent task durations (dispatch -> result)."""
+    best: dict[str, tuple[float, list[str]]] = {}
+
+    def visit(tid: str) -> tuple[float, list[str]]:
+        if tid not in best:
+            t = tasks[tid]
+            prev = max((visit(d) for d in t.depends_on), key=lambda x: x[0], default=(0.0, []))
+            best[tid] = (prev[0] + t.duration, prev[1] + [tid])
+        return best[tid]
+
+    return max((visit(tid) for tid in tasks), key=lambda x: x[0], default=(0.0, []))
+
+
+def run_tasks(
+    task_paths: Sequence[Path],
+    *,
+    assignees: Sequence[str] = DEFAULT_ASSIGNEES,
+    limits: Optional[dict[str, int]] = None,
+    default_limit: int = 1,
+    timeout: float = 3600.0,
+    backend: str = "control",
+    dispatch: Optional[Callable[[list[Path], dict[Path, str]], None]] = None,
+) -> bool:
+    """Dispatch tasks as their depends_on are satisfied, await all in-flight
+    results at once and release assignees as results arrive.
+
+    A task whose YAML says `assignee: any` goes to the pool assignee with the
+    most free slots. Tasks whose result already exists count as done (so an
+    interrupted run can simply be started again). A result whose status is
+    not "done" (needs-info/blocked/failed) skips everything depending on it.
+    `dispatch(paths, assignee_by_path)` replaces the tmux dispatcher (e.g.
+    for a stand-in agent). Returns True when every task finished.
+    """
+    tasks = load_tasks(task_paths)
+    limits = dict(limits or {})
+    pool = list(assignees)
+
+    def limit(a: str) -> int:
+        return max(1, int(limits.get(a, default_limit)))
+
+    running: dict[str, list[str]] = {}
+    foreign: dict[str, str] = {}
+    for t in tasks.values():
+        if t.info.assignee != ANY_ASSIGNEE and t.info.assignee not in pool:
+            pool.append(t.info.assignee)
+    for a in pool:
+        holder = _read_lock(a)
+        if holder is None:
+            continue
+        if holder in tasks:
+            # dispatched by an earlier, interrupted run: keep awaiting it
+            t = tasks[holder]
+            t.state, t.assignee, t.started = "running", a, time.monotonic()
+            running.setdefault(a, []).append(holder)
+        elif not _foreign_lock_done(holder):
+            foreign[a] = holder
+        else:
+            (STATE_DIR / f"lock-{a}").unlink(missing_ok=True)
+
+    tmux = None
+    if dispatch is None:
+        def dispatch(paths: list[Path], by_path: dict[Path, str]) -> None:
+            nonlocal tmux
+            if tmux is None:
+                tmux = open_tmux(_session_name(), backend)
+            dispatch_many(paths, tmux=tmux, assignees=by_path)
+
+    watch_dirs = {RESULTS_DIR} | {t.info.expected_results[0].parent for t in tasks.values() if t.info.expected_results}
+    waiter = _DirWaiter(*sorted(watch_dirs))
+    started = time.monotonic()
+    deadline = started + timeout
+
+    def settle() -> bool:
+        """Collect finished tasks; True if anything changed."""
+        changed = False
+        for a, holder in list(foreign.items()):
+            if _foreign_lock_done(holder) or _read_lock(a) != holder:
+                del foreign[a]
+                changed = True
+        for t in tasks.values():
+            if t.state == "pending":
+                result = _find_result(t.info)
+                if result is not None:
+                    t.state, t.result = ("failed" if _result_failed(result) else "done"), result
+                    _log(f"{t.info.task_id}: result already present ({result.as_posix()})")
+                    changed = True
+            elif t.state == "running":
+                result = _find_result(t.info)
+                if result is None:
+                    continue
+                t.finished, t.result = time.monotonic(), result
+                t.state = "failed" if _result_failed(result) else "done"
+                running[t.assignee].remove(t.info.task_id)
+                _release_lock(t.assignee, running[t.assignee])
+                _log(f"{t.info.task_id}: {t.state} on {t.assignee} after {t.duration:.1f}s ({result.as_posix()})")
+                changed = True
+        # a failed dependency skips the whole downstream subtree
+        for t in tasks.values():
+            if t.state == "pending" and any(tasks[d].state in ("failed", "skipped") for d in t.depends_on):
+                t.state = "skipped"
+                _log(f"{t.info.task_id}: skipped (dependency failed)")
+                changed = True
+        return changed
+
+    def free_slots(a: str) -> int:
+        if a in foreign:
+            return 0
+        return limit(a) - len(running.get(a, []))
+
+    def launch() -> None:
+        batch: list[Path] = []
+        by_path: dict[Path, str] = {}
+        for t in tasks.values():
+            if t.state != "pending" or any(tasks[d].state != "done" for d in t.depends_on):
+                continue
+            if t.info.assignee == ANY_ASSIGNEE:
+                candidates = sorted(pool, key=lambda a: -free_slots(a))
+                a = candidates[0] if candidates else ""
+            else:
+                a = t.info.assignee
+            if not a or free_slots(a) <= 0:
+                continue
+            t.state, t.assignee, t.started = "running", a, time.monotonic()
+            running.setdefault(a, []).append(t.info.task_id)
+            batch.append(t.info.path)
+            by_path[t.info.path] = a
+        if batch:
+            for p in batch:
+                _log(f"{p.as_posix()}: dispatching to {by_path[p]}")
+            dispatch(batch, by_path)
+
+    try:
+        settle()
+        while True:
+            launch()
+            if not any(t.state in ("pending", "running") for t in tasks.values()):
+                break
+            if not any(running.values()) and not foreign:
+                # nothing in flight and nothing launchable: unsatisfiable assignees
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            waiter.wait(remaining)
+            settle()
+    finally:
+        waiter.close()
+        if tmux is not None:
+            tmux.close()
+
+    _print_summary(tasks, time.monotonic() - started)
+    return all(t.state == "done" for t in tasks.values())
+
+
+def _print_summary(tasks: dict[str, _Task], wall: float) -> None:
+    counts: dict[str, int] = {}
+    for t in tasks.values():
+        counts[t.state] = counts.get(t.state, 0) + 1
+    print("b run summary")
+    print(f"  tasks       : {len(tasks)} (" + ", ".join(f"{k} {v}" for k, v in sorted(counts.items())) + ")")
+    print(f"  wall time   : {wall:.1f}s")
+    busy: dict[str, float] = {}
+    for t in tasks.values():
+        if t.assignee:
+            busy[t.assignee] = busy.get(t.assignee, 0.0) + t.duration
+    work = sum(busy.values())
+    print(f"  task time   : {work:.1f}s (sum of dispatch -> result)")
+    cp_time, cp = critical_path(tasks)
+    print(f"  critical path: {cp_time:.1f}s  {' -> '.join(cp)}")
+    for a, b in sorted(busy.items()):
+        share = (b / wall * 100.0) if wall > 0 else 0.0
+        print(f"    {a:<12} busy {b:7.1f}s ({share:.0f}% of wall)")
+    for t in tasks.values():
+        if t.state != "done":
+            print(f"    {t.info.task_id}: {t.state}")
@@ -1,15 +1,26 @@
 from __future__ import annotations
 
 from pathlib import Path
+from functools import partial
+from typing import Iterable, Iterator
 import datetime
-import difflib
+import hashlib
+import json
+import os
+import time
 
 from .config import Config
-from .scan import scan_files
-from .state import load_manifest, save_manifest, ensure_state, sha256_file
-from .extract import extract_docx_text
-from .summarize import summarize_text
+from .scan import scan_entries, path_matcher
+from .state import load_manifest, save_manifest, ensure_state, sha256_file, set_file_entry, drop_file_entry, state_backend
+from .extract import content_fingerprint, extract_settings
+from .cache import extract_cached, get_text, cache_enabled, prune_cache
+from .summarize import summarize_sections, section_settings_key, summarize_settings
+from .diffutil import DEFAULT_MAX_EDITS, diff_stats, section_changes, describe_section_changes, unified_diff
 from .render import render_summary
+from .changelog import rotate_changelog
+from .parallel import WorkerPool, resolve_jobs
+from .metrics import RunMetrics
+from .dedup import dedup_enabled, known_contents, share_duplicates, with_shared, summaries as dedup_summaries
 
 
 def _now_local_date() -> str:
@@ -17,109 +28,636 @@ def _now_local_date() -> str:
     return datetime.datetime.now().strftime("%Y-%m-%d")
 
 
-def _append_changelog(manifest: dict, target: str, message: str) -> None:
+def _append_changelog(manifest: dict, target: str, message: str, **extra) -> None:
     manifest.setdefault("changelog", []).append(
-        {"date": _now_local_date(), "target": target, "message": message}
+        {"date": _now_local_date(), "target": target, "message": message, **extra}
     )
 
 
-def build_summary(cfg: Config, force: bool = False) -> bool:
+def _hash_file(path: Path) -> tuple[str, float, float]:
+    """sha256 + (wall, cpu) seconds. Runs inside the worker pool."""
+    t0, c0 = time.perf_counter(), time.process_time()
+    sha = sha256_file(path)
+    return sha, time.perf_counter() - t0, time.process_time() - c0
+
+
+def _diff_settings(cfg: Config) -> tuple[int, int]:
+    """(update.diff_context_lines, update.diff_max_edits); context < 0 = store no diff."""
+    upd = cfg.raw.get("update", {})
+    return int(upd.get("diff_context_lines", 2)), int(upd.get("diff_max_edits", DEFAULT_MAX_EDITS))
+
+
+def _text_changes(
+    cfg: Config, path: Path, text: str | None, index: list[dict], prev: dict | None
+) -> tuple[list[dict] | None, list[str] | None]:
+    """(section changes, unified diff lines) against the previous entry of path.
+
+    Both are None without a previous section index; the previous text comes
+    from the text cache (without it sections are only reported as changed).
+    """
+    old_index = (prev or {}).get("sections")
+    if old_index is None or text is None:
+        return None, None
+    context, max_edits = _diff_settings(cfg)
+    old_text = get_text(cfg, prev.get("sha256", "")) if cache_enabled(cfg) and prev.get("sha256") else None
+    changes = section_changes(old_text, old_index, text, index, max_edits)
+    text_diff = None
+    if changes and old_text is not None and context >= 0:
+        text_diff = unified_diff(
+            [ln.strip() for ln in old_text.splitlines() if ln.strip()],
+            [ln.strip() for ln in text.splitlines() if ln.strip()],
+            context, "a/" + path.as_posix(), "b/" + path.as_posix(), max_edits,
+        )
+    return changes, text_diff
+
+
+def _summarize_file(cfg: Config, item: tuple[Path, str, dict | None, bool]) -> tuple[list[str], dict, dict]:
+    """Extract (via text cache) + summarize one file. Runs inside the worker pool.
+
+    item is (path, sha256, previous manifest entry or None, reuse allowed).
+    Sections whose hash is unchanged since the previous entry keep their
+    bullet; changed sections are diffed against the previous text when it is
+    still in the text cache. Returns (bullets, per-file metrics, entry fields).
+    """
+    path, sha, prev, reuse_ok = item
+    t0, c0 = time.perf_counter(), time.process_time()
+    text, hit = extract_cached(cfg, path, sha)
+    t1 = time.perf_counter()
+    key = section_settings_key(cfg)
+    old_index = (prev or {}).get("sections")
+    reuse = None
+    if reuse_ok and old_index and prev.get("sections_key") == key:
+        reuse = {sec["hash"]: sec["bullet"] for sec in old_index if "bullet" in sec}
+    bullets, index = summarize_sections(cfg, text, reuse)
+    t2 = time.perf_counter()
+    changes, text_diff = _text_changes(cfg, path, text, index, prev)
+    t3 = time.perf_counter()
+    return bullets, {
+        "extract_s": t1 - t0,
+        "summarize_s": t2 - t1,
+        "diff_s": t3 - t2,
+        "cpu_s": time.process_time() - c0,
+        "chars": len(text),
+        "paragraphs": sum(1 for ln in text.splitlines() if ln.strip()),
+        "bullets": len(bullets),
+        "sections": len(index),
+        "sections_reused": sum(1 for sec in index if reuse and "bullet" in sec and sec["hash"] in reuse),
+        "cache_hit": hit,
+    }, {"sections": index, "sections_key": key, "section_changes": changes, "text_diff": text_diff}
+
+
+class _Checkpoint:
+    """Periodic manifest saves during a build/update, for resuming after a crash.
+
+    manifest["checkpoint"] marks the run as unfinished and lists the files it
+    has stored so far; it is saved every build.checkpoint_files stored files
+    or build.checkpoint_seconds, and on the way out of an aborted run.
+    With build.dedup it also carries the digests written or dropped so far
+    (shas), which share_duplicates() regroups at the end of the resumed run.
+    """
+
+    def __init__(self, cfg: Config, manifest: dict, command: str, force: bool, first_build: bool) -> None:
+        b = cfg.raw.get("build", {})
+        self.cfg = cfg
+        self.manifest = manifest
+        self.every_files = int(b.get("checkpoint_files", 100))
+        self.every_seconds = float(b.get("checkpoint_seconds", 60))
+        self.dedup = dedup_enabled(cfg)
+        prev = manifest.get("checkpoint") or {}
+        self.shas: set[str] = set(prev.get("shas", []))
+        manifest["checkpoint"] = {
+            "command": command,
+            "force": force,
+            "first_build": first_build,
+            "done": prev.get("done", []) if prev.get("force") and force else [],
+        }
+        self._pending = 0
+        self._last = time.monotonic()
+
+    def done(self, sp: str, *shas: str | None) -> None:
+        """sp was stored; shas are its previous and new digest."""
+        self.manifest["checkpoint"]["done"].append(sp)
+        self.shas.update(sha for sha in shas if sha)
+        self._pending += 1
+        if (self.every_files > 0 and self._pending >= self.every_files) or (
+            self.every_seconds > 0 and time.monotonic() - self._last >= self.every_seconds
+        ):
+            self.save()
+
+    def save(self) -> None:
+        if self.dedup:
+            self.manifest["checkpoint"]["shas"] = sorted(self.shas)
+        save_manifest(self.cfg, self.manifest)
+        self._pending = 0
+        self._last = time.monotonic()
+
+    def close(self) -> None:
+        """The run completed: the final save_manifest() drops the marker."""
+        self.manifest.pop("checkpoint", None)
+
+
+def _resume(manifest: dict, command: str, force: bool) -> tuple[bool, set[str], bool | None]:
+    """(force, files already done, first_build) when continuing an interrupted run.
+
+    A forced run resumes forced but skips what it already stored; an
+    unforced one simply relies on change detection. first_build is None
+    when there is nothing to resume.
+    """
+    cp = manifest.get("checkpoint")
+    if not cp:
+        return force, set(), None
+    done = cp.get("done", [])
+    print(f"Resuming interrupted {cp.get('command', command)} ({len(done)} file(s) already stored).")
+    if cp.get("force"):
+        return True, set(done), bool(cp.get("first_build"))
+    return force, set(), bool(cp.get("first_build"))
+
+
+def _copy_result(
+    cfg: Config, path: Path, sha: str, data: dict, prev: dict | None
+) -> tuple[list[str], dict, dict]:
+    """_summarize_file() output for a byte-identical copy of already summarized content.
+
+    Nothing is extracted; the diff against the path's previous entry uses the
+    text cache and is left out (None) when the text is not cached.
+    """
+    t0, c0 = time.perf_counter(), time.process_time()
+    text = get_text(cfg, sha) if cache_enabled(cfg) else None
+    changes, text_diff = _text_changes(cfg, path, text, data["sections"], prev)
+    return data["summary"], {
+        "diff_s": time.perf_counter() - t0,
+        "cpu_s": time.process_time() - c0,
+        "chars": data.get("chars", len(text or "")),
+        "bullets": len(data["summary"]),
+        "sections": len(data["sections"]),
+        "dedup": True,
+    }, {"sections": data["sections"], "sections_key": data["sections_key"], "section_changes": changes, "text_diff": text_diff}
+
+
+def _summarize_or_error(cfg: Config, item: tuple[Path, str, dict | None, bool]) -> tuple[list[str] | None, dict, dict]:
+    """_summarize_file(), but a broken document yields (None, {"error": ...}, {})."""
+    try:
+        return _summarize_file(cfg, item)
+    except Exception as exc:
+        return None, {"error": f"{type(exc).__name__}: {exc}"}, {}
+
+
+def _detect_by(cfg: Config) -> str:
+    mode = str(cfg.raw.get("update", {}).get("detect_by", "sha256")).strip().lower()
+    if mode not in ("sha256", "stat", "stat+sha256", "content"):
+        raise ValueError(f"unknown update.detect_by: {mode!r} (expected sha256|stat|stat+sha256|content)")
+    return mode
+
+
+def _stat_fields(st: os.stat_result) -> dict:
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "inode": st.st_ino}
+
+
+def _stat_matches(prev: dict, st: os.stat_result) -> bool:
+    return (
+        prev.get("size") == st.st_size
+        and prev.get("mtime_ns") == st.st_mtime_ns
+        and prev.get("inode") == st.st_ino
+    )
+
+
+def stage_settings(cfg: Config) -> dict[str, dict]:
+    """Settings each processing stage depends on; manifest["settings"] keeps the last run's."""
+    return {"extract": extract_settings(cfg), "summarize": summarize_settings(cfg)}
+
+
+def _settings_fp(settings: dict) -> str:
+    return hashlib.sha256(json.dumps(settings, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+
+def _stale_reason(entry, current: dict[str, tuple[str, dict]], recorded: dict[str, tuple[str, dict]]) -> str | None:
+    """Why an entry made with other extract/summarize settings must be redone (None: up to date).
+
+    current/recorded map stage -> (fingerprint, settings) of this run and of
+    the last completed one; entries from before fingerprints were stored
+    count as made with the recorded settings.
+    """
+    reasons = []
+    for stage, (fp, settings) in current.items():
+        old_fp = entry.get(f"{stage}_fp") or recorded.get(stage, (fp,))[0]
+        if old_fp == fp:
+            continue
+        keys = []
+        if stage in recorded and recorded[stage][0] == old_fp:
+            old = recorded[stage][1]
+            keys = [f"{stage}.{k}" for k in sorted({*settings, *old}) if settings.get(k) != old.get(k)]
+        reasons.append(f"{stage} settings changed" + (f": {', '.join(keys)}" if keys else ""))
+    return "; ".join(reasons) or None
+
+
+def _process_changed(
+    cfg: Config,
+    files: list[Path],
+    stats: list[os.stat_result],
+    manifest: dict,
+    force: bool,
+    jobs: int | None,
+    metrics: RunMetrics,
+    persist: bool = True,
+    retry_failed: bool = False,
+) -> Iterator[tuple[Path, str, os.stat_result, list[str], dict]]:
+    """Detect changed files, then extract+summarize them in a worker pool.
+
+    update.detect_by:
+    - sha256: hash every file (default)
+    - stat: size/mtime_ns/inode match => unchanged; mismatch => changed
+    - stat+sha256: stat match => unchanged; mismatch => hash decides
+    - content: stat match => unchanged; mismatch => the zip central directory
+      fingerprint of the text parts decides (a re-save that only touched
+      docProps etc. is hashed for its new sha256/stat but not extracted);
+      new/changed fingerprint => hash decides. Entries stored before
+      content mode get their fingerprint on the next stat match.
+
+    Yields (path, sha256, stat, bullets, extra entry fields) for changed files
+    in scan order, each as soon as it is ready, so callers can persist
+    progress file by file. extra["section_changes"] (see
+    diffutil.section_changes; None without a previous section index) and
+    extra["text_diff"] (unified diff lines or None) are for the changelog and
+    must be popped before storing the entry, as must extra["reprocess"]: the
+    reason an unchanged file is redone because the extract/summarize settings
+    that produced its entry changed (None otherwise). Summarize-only changes
+    take the text from the text cache. persist=False keeps stat refreshes in
+    the manifest dict only (shard builds never touch the state).
+
+    A file whose extraction/summarization raises is recorded in
+    manifest["failed"] (sha256 + error) instead of being yielded; it keeps
+    being skipped while its sha256 is unchanged, unless retry_failed.
+    """
+    detect_by = _detect_by(cfg)
+    entries = manifest.get("files", {})
+    failed = manifest.get("failed", {})
+
+    def refresh(sp: str, entry: dict) -> None:
+        if persist:
+            set_file_entry(cfg, manifest, sp, entry)
+        else:
+            entries[sp] = entry
+
+    current = {stage: (_settings_fp(v), v) for stage, v in stage_settings(cfg).items()}
+    recorded = {stage: (_settings_fp(v), v) for stage, v in manifest.get("settings", {}).items()}
+    stamp = {f"{stage}_fp": fp for stage, (fp, _) in current.items()}
+
+    def stale(prev) -> str | None:
+        return None if force else _stale_reason(with_shared(manifest, prev), current, recorded)
+
+    to_hash: list[int] = []
+    fingerprints: dict[int, str | None] = {}
+    same_text: set[int] = set()  # content mode: changed bytes, same text parts
+    restage: dict[int, str] = {}  # unchanged content, other settings: no hashing needed
+    for i, (p, st) in enumerate(zip(files, stats)):
+        prev = entries.get(str(p))
+        if force or prev is None or detect_by == "sha256":
+            to_hash.append(i)
+        elif not _stat_matches(prev, st):
+            if detect_by == "content":
+                fp = fingerprints[i] = content_fingerprint(p)
+                if fp is not None and fp == prev.get("content_fp"):
+                    same_text.add(i)
+            to_hash.append(i)
+        else:
+            if detect_by == "content" and "content_fp" not in prev:
+                # stored before content mode: fingerprint it now instead of reprocessing it later
+                prev = {**prev, "content_fp": content_fingerprint(p)}
+                refresh(str(p), prev)
+            if reason := stale(prev):
+                restage[i] = reason
+    if detect_by == "content":
+        for i in to_hash:
+            if i not in fingerprints:
+                fingerprints[i] = content_fingerprint(files[i])
+
+    with WorkerPool(resolve_jobs(cfg, jobs)) as pool:
+        with metrics.phase("hash"):
+            hashed = pool.map(_hash_file, [files[i] for i in to_hash], chunksize=8)
+        queued: list[tuple[int, tuple[Path, str, os.stat_result, dict]]] = []
+        for i, (sha, wall, cpu) in zip(to_hash, hashed):
+            p, st = files[i], stats[i]
+            metrics.file(str(p), bytes_hashed=st.st_size, hash_s=wall, cpu_s=cpu)
+            prev = entries.get(str(p))
+            extra = {"content_fp": fingerprints[i]} if detect_by == "content" else {}
+            if i in same_text:
+                # a re-save that left the text alone: keep the summary, record the new bytes
+                if prev.get("sha256") != sha:
+                    prev = with_shared(manifest, prev)  # no longer a copy of its old digest
+                refresh(str(p), {**prev, "sha256": sha, "mtime": st.st_mtime, **_stat_fields(st), **extra})
+                if reason := stale(prev):
+                    queued.append((i, (p, sha, st, {**extra, "reprocess": reason})))
+                continue
+            if not retry_failed and failed.get(str(p), {}).get("sha256") == sha:
+                continue  # known bad content
+            if force or prev is None or detect_by == "stat" or prev.get("sha256") != sha:
+                queued.append((i, (p, sha, st, extra)))
+            elif reason := stale(prev):
+                queued.append((i, (p, sha, st, {**extra, "reprocess": reason})))
+            else:
+                # Same content (e.g. touched/copied back): refresh stat so the next run skips hashing
+                refresh(str(p), {**prev, **_stat_fields(st), **extra})
+        for i, reason in restage.items():
+            prev = entries[str(files[i])]
+            if not retry_failed and failed.get(str(files[i]), {}).get("sha256") == prev["sha256"]:
+                continue
+            extra = {"content_fp": prev.get("content_fp")} if detect_by == "content" else {}
+            queued.append((i, (files[i], prev["sha256"], stats[i], {**extra, "reprocess": reason})))
+        todo = [t for _, t in sorted(queued, key=lambda q: q[0])]
+        # One extract+summarize per distinct content: copies of a digest that
+        # is already summarized (with the current settings) or that appears
+        # earlier in this run take over its bullets and section index.
+        dedup = dedup_enabled(cfg)
+        key = section_settings_key(cfg)
+        known = known_contents(manifest, {sha for _, sha, _, _ in todo}) if dedup and not force else {}
+        known = {sha: data for sha, data in known.items() if all(data.get(k) == v for k, v in stamp.items())}
+        prevs, items, seen = [], [], set()
+        for p, sha, _, _ in todo:
+            prev = with_shared(manifest, entries.get(str(p)))
+            if prev is not None:
+                prev = {k: prev[k] for k in ("sha256", "sections", "sections_key") if k in prev}
+            prevs.append(prev)
+            if sha not in known and not (dedup and sha in seen):
+                items.append((p, sha, prev, not force))
+            seen.add(sha)
+        results = pool.imap(partial(_summarize_or_error, cfg), items)
+        for (p, sha, st, extra), prev in zip(todo, prevs):
+            if "error" in known.get(sha, {}):
+                bullets, info, fields = None, {"error": known[sha]["error"]}, {}
+            elif sha in known:
+                bullets, info, fields = _copy_result(cfg, p, sha, known[sha], prev)
+            else:
+                bullets, info, fields = next(results)
+                if dedup and bullets is None:
+                    known[sha] = {"error": info["error"]}
+                elif dedup:
+                    known[sha] = {"summary": bullets, "sections": fields["sections"], "sections_key": key, "chars": info["chars"], **stamp}
+            info["cpu_s"] = info.get("cpu_s", 0.0) + metrics.files.get(str(p), {}).get("cpu_s", 0.0)
+            metrics.file(str(p), **info)
+            if bullets is None:
+                manifest["failed"] = failed
+                failed[str(p)] = {"sha256": sha, "error": info["error"], "date": _now_local_date()}
+                print(f"Failed: {p}: {info['error']} (skipped; retry with --retry-failed)")
+                continue
+            failed.pop(str(p), None)
+            yield p, sha, st, bullets, {"chars": info["chars"], **extra, **fields, **stamp}
+    if todo and cache_enabled(cfg):
+        with metrics.phase("cache_prune"):
+            prune_cache(cfg)
+
+
+def build_summary(cfg: Config, force: bool = False, jobs: int | None = None, retry_failed: bool = False) -> bool:
     """Initial build: compute summaries for all matched files and write summary.adoc."""
     ensure_state(cfg)
-    files = scan_files(cfg)
-    manifest = load_manifest(cfg)
-
-    is_first_build = (not manifest.get("files"))
-
-    for p in files:
-        sp = str(p)
-        sha = sha256_file(p)
-        prev = manifest.get("files", {}).get(sp)
-        need = force or (prev is None) or (prev.get("sha256") != sha)
-        if need:
-            text = extract_docx_text(cfg, p)
-            bullets = summarize_text(cfg, text)
-            manifest.setdefault("files", {})[sp] = {
-                "sha256": sha,
-                "mtime": p.stat().st_mtime,
-                "summary": bullets,
-            }
+    metrics = RunMetrics("build")
+    with metrics.phase("scan"):
+        scanned = scan_entries(cfg)
+    files = [p for p, _ in scanned]
+    stats = [st for _, st in scanned]
+    with metrics.phase("load"):
+        manifest = load_manifest(cfg)
+
+    force, done, resumed_first = _resume(manifest, "build", force)
+    is_first_build = (not manifest.get("files")) if resumed_first is None else resumed_first
+    checkpoint = _Checkpoint(cfg, manifest, "build", force, is_first_build)
+
+    # Merge in scan order so the manifest/output do not depend on worker timing
+    n_processed = 0
+    todo = [i for i, p in enumerate(files) if str(p) not in done]
+    with metrics.phase("process"):
+        try:
+            for p, sha, st, bullets, extra in _process_changed(
+                cfg, [files[i] for i in todo], [stats[i] for i in todo], manifest, force, jobs, metrics,
+                retry_failed=retry_failed,
+            ):
+                n_processed += 1
+                extra.pop("section_changes", None)
+                extra.pop("text_diff", None)
+                extra.pop("reprocess", None)
+                old_sha = (manifest.get("files", {}).get(str(p)) or {}).get("sha256")
+                set_file_entry(cfg, manifest, str(p), {
+                    "sha256": sha,
+                    "mtime": st.st_mtime,
+                    **_stat_fields(st),
+                    **extra,
+                    "summary": bullets,
+                })
+                checkpoint.done(str(p), old_sha, sha)
+        except BaseException:
+            checkpoint.save()
+            raise
+    checkpoint.close()
 
     # Remove entries for files no longer matched (only if not first build)
     current = {str(p) for p in files}
     to_remove = [k for k in manifest.get("files", {}).keys() if k not in current]
     for k in to_remove:
         # keep record but drop from current build view
-        manifest["files"].pop(k, None)
+        checkpoint.shas.add(manifest["files"][k].get("sha256"))
+        drop_file_entry(cfg, manifest, k)
+    _prune_failed(manifest, current)
 
     manifest["generated_at"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    manifest["settings"] = stage_settings(cfg)
 
+    # files that never extracted have no entry and stay out of the output
+    files = [p for p in files if str(p) in manifest.get("files", {})]
     if is_first_build:
         _append_changelog(manifest, "(all)", f"Initial build: {len(files)} file(s) processed.")
 
-    save_manifest(cfg, manifest)
+    with metrics.phase("save"):
+        rotated = rotate_changelog(cfg, manifest)
+        if dedup_enabled(cfg):
+            share_duplicates(cfg, manifest, checkpoint.shas)
+        save_manifest(cfg, manifest)
 
     # Render from manifest summaries (stable)
-    summaries = {k: v.get("summary", []) for k, v in manifest.get("files", {}).items()}
-    render_summary(cfg, files, summaries, manifest)
+    with metrics.phase("render"):
+        summaries = dedup_summaries(manifest)
+        render_summary(cfg, files, summaries, manifest)
+    _report_failed(manifest)
+    metrics.finish(cfg, bool(n_processed or to_remove or rotated),
+                   scanned=len(current), processed=n_processed, removed=len(to_remove), rotated=rotated,
+                   failed=len(manifest.get("failed", {})))
     return True
 
 
-def update_summary(cfg: Config, force: bool = False) -> bool:
-    """Update: re-summarize changed/new files, keep unchanged, and append changelog."""
+def _prune_failed(manifest: dict, current: set[str]) -> None:
+    """Forget failures of files that left the scan; drop the key once empty."""
+    failed = manifest.get("failed", {})
+    for k in [k for k in failed if k not in current]:
+        del failed[k]
+    if not failed:
+        manifest.pop("failed", None)
+
+
+def _report_failed(manifest: dict) -> None:
+    failed = manifest.get("failed", {})
+    if failed:
+        print(f"{len(failed)} file(s) failed to extract and were skipped (see `docxbrief status`; retry with --retry-failed).")
+
+
+def _rescan_touched(
+    cfg: Config, manifest: dict, touched: Iterable[Path | str]
+) -> tuple[list[Path], list[tuple[Path, os.stat_result]]] | None:
+    """File list = manifest paths +/- re-checked touched paths (no directory walk).
+
+    Returns (files, touched entries that still match), or None when a full scan
+    is needed because the previous scan may have been cut off by max_files.
+    """
+    max_files = int(cfg.raw.get("filter", {}).get("max_files", 200))
+    known = set(manifest.get("files", {})) | set(manifest.get("failed", {}))
+    if 0 <= max_files <= len(known):
+        return None
+    matches = path_matcher(cfg)
+    current = set(known)
+    candidates: list[tuple[Path, os.stat_result]] = []
+    for p in sorted({Path(t) for t in touched}):
+        try:
+            st = p.stat() if matches(p) else None
+        except OSError:
+            st = None
+        if st is None:
+            current.discard(str(p))
+        else:
+            current.add(str(p))
+            candidates.append((p, st))
+    files = sorted(Path(sp) for sp in current)
+    if 0 <= max_files < len(files):
+        return None
+    return files, candidates
+
+
+def update_summary(
+    cfg: Config,
+    force: bool = False,
+    jobs: int | None = None,
+    touched: Iterable[Path | str] | None = None,
+    retry_failed: bool = False,
+) -> bool:
+    """Update: re-summarize changed/new files, keep unchanged, and append changelog.
+
+    touched: when given (watch mode), only these paths are re-checked; every
+    other tracked file is assumed unchanged and no directory walk happens.
+    """
     ensure_state(cfg)
-    files = scan_files(cfg)
-    manifest = load_manifest(cfg)
+    metrics = RunMetrics("update")
+    with metrics.phase("load"):
+        manifest = load_manifest(cfg)
 
-    # First build fallback
+    # First build fallback (also finishes an interrupted build)
     if not manifest.get("files"):
-        return build_summary(cfg, force=True)
+        return build_summary(cfg, force=True, jobs=jobs, retry_failed=retry_failed)
+    if (manifest.get("checkpoint") or {}).get("command") == "build":
+        return build_summary(cfg, force=force, jobs=jobs, retry_failed=retry_failed)
+
+    with metrics.phase("scan"):
+        rescanned = _rescan_touched(cfg, manifest, touched) if touched is not None else None
+        if rescanned is None:
+            scanned = scan_entries(cfg)
+            files = [p for p, _ in scanned]
+        else:
+            files, scanned = rescanned
+    candidates = [p for p, _ in scanned]
+    stats = [st for _, st in scanned]
 
     current = {str(p) for p in files}
+    force, done, _ = _resume(manifest, "update", force)
+    checkpoint = _Checkpoint(cfg, manifest, "update", force, False)
+    failed_before = dict(manifest.get("failed", {}))
 
     # Detect removed files (no longer matched)
     removed = [k for k in list(manifest.get("files", {}).keys()) if k not in current]
     for k in removed:
-        manifest["files"].pop(k, None)
+        checkpoint.shas.add(manifest["files"][k].get("sha256"))
+        drop_file_entry(cfg, manifest, k)
         _append_changelog(manifest, k, "Removed from scan scope.")
 
-    # Process current files
-    for p in files:
-        sp = str(p)
-        sha = sha256_file(p)
-        prev = manifest.get("files", {}).get(sp)
-
-        if force or (prev is None) or (prev.get("sha256") != sha):
-            old_summary = (prev or {}).get("summary", [])
-            text = extract_docx_text(cfg, p)
-            new_summary = summarize_text(cfg, text)
-
-            # diff stats at "bullet level" (cheap, but useful)
-            sm = difflib.SequenceMatcher(a=old_summary, b=new_summary)
-            added = removed_n = 0
-            for tag, i1, i2, j1, j2 in sm.get_opcodes():
-                if tag == "insert":
-                    added += (j2 - j1)
-                elif tag == "delete":
-                    removed_n += (i2 - i1)
-                elif tag == "replace":
-                    removed_n += (i2 - i1)
-                    added += (j2 - j1)
-
-            if prev is None:
-                _append_changelog(manifest, sp, "Added (new file).")
-            else:
-                _append_changelog(manifest, sp, f"Updated summary (+{added}/-{removed_n} bullets).")
+    def stat_key(sp: str) -> tuple:
+        e = manifest.get("files", {}).get(sp) or {}
+        return tuple(e.get(k) for k in ("size", "mtime_ns", "inode", "content_fp", "sha256"))
+
+    # watch mode: remember stat fields so refreshes of unchanged files can be told apart
+    stats_before = {str(p): stat_key(str(p)) for p in candidates} if touched is not None else {}
+
+    # Process changed files (pooled), merging results in scan order
+    n_changed = len(removed)
+    todo = [i for i, p in enumerate(candidates) if str(p) not in done]
+    with metrics.phase("process"):
+        try:
+            for p, sha, st, new_summary, extra in _process_changed(
+                cfg, [candidates[i] for i in todo], [stats[i] for i in todo], manifest, force, jobs, metrics,
+                retry_failed=retry_failed,
+            ):
+                n_changed += 1
+                sp = str(p)
+                prev = manifest.get("files", {}).get(sp)
+                old_summary = (with_shared(manifest, prev) or {}).get("summary", [])
+
+                # diff stats at "bullet level" (cheap, but useful)
+                st_b = diff_stats("\n".join(old_summary), "\n".join(new_summary))
+                changes = extra.pop("section_changes", None)
+                text_diff = extra.pop("text_diff", None)
+                reprocess = extra.pop("reprocess", None)
+
+                if prev is None:
+                    _append_changelog(manifest, sp, "Added (new file).")
+                elif reprocess:
+                    _append_changelog(
+                        manifest, sp, f"Reprocessed ({reprocess}): +{st_b['added']}/-{st_b['removed']} bullets."
+                    )
+                else:
+                    message = f"Updated summary (+{st_b['added']}/-{st_b['removed']} bullets)"
+                    if changes is None:
+                        _append_changelog(manifest, sp, message + ".")
+                    elif changes:
+                        row = {"sections": changes}
+                        if text_diff is not None:
+                            row["diff"] = "\n".join(text_diff)
+                        _append_changelog(manifest, sp, f"{message}; sections: {describe_section_changes(changes)}.", **row)
+                    else:
+                        _append_changelog(manifest, sp, f"{message}; no section text changed.")
+
+                set_file_entry(cfg, manifest, sp, {
+                    "sha256": sha,
+                    "mtime": st.st_mtime,
+                    **_stat_fields(st),
+                    **extra,
+                    "summary": new_summary,
+                })
+                checkpoint.done(sp, (prev or {}).get("sha256"), sha)
+        except BaseException:
+            checkpoint.save()
+            raise
+    checkpoint.close()
+    _prune_failed(manifest, current)
 
-            manifest.setdefault("files", {})[sp] = {
-                "sha256": sha,
-                "mtime": p.stat().st_mtime,
-                "summary": new_summary,
-            }
+    refreshed = [sp for sp, k in stats_before.items() if stat_key(sp) != k]
+    # a content-mode re-save refreshes the sha256 shown in the table: that still needs a render
+    new_digest = any(stat_key(sp)[-1] != stats_before[sp][-1] for sp in refreshed)
+    if touched is not None and not n_changed and not new_digest and manifest.get("failed", {}) == failed_before:
+        # watch mode: events only touched unmatched/unchanged files; nothing to render, but
+        # stat refreshes must reach disk (sqlite already wrote them) or they are re-hashed
+        # no metrics record either: the watcher would see every no-op event as a run
+        if state_backend(cfg) != "sqlite" and refreshed:
+            save_manifest(cfg, manifest)
+        return True
 
     manifest["generated_at"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
-    save_manifest(cfg, manifest)
+    if touched is None:
+        # watch runs re-check only touched files; the rest may still carry older settings
+        manifest["settings"] = stage_settings(cfg)
+    with metrics.phase("save"):
+        rotated = rotate_changelog(cfg, manifest)
+        if dedup_enabled(cfg):
+            share_duplicates(cfg, manifest, checkpoint.shas)
+        save_manifest(cfg, manifest)
 
-    summaries = {k: v.get("summary", []) for k, v in manifest.get("files", {}).items()}
-    render_summary(cfg, files, summaries, manifest)
+    with metrics.phase("render"):
+        summaries = dedup_summaries(manifest)
+        render_summary(cfg, [p for p in files if str(p) in summaries], summaries, manifest)
+    _report_failed(manifest)
+    metrics.finish(cfg, bool(n_changed or rotated),
+                   scanned=len(files), processed=n_changed - len(removed), removed=len(removed), rotated=rotated,
+                   failed=len(manifest.get("failed", {})))
     return True
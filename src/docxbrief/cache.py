@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from pathlib import Path
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from .config import Config
+from .extract import extract_docx_text, extract_settings
+
+_TMP_PREFIX = ".tmp-"
+_TMP_STALE_S = 3600  # a temp file this old is a crashed write, not one in progress
+
+
+def cache_dir(cfg: Config) -> Path:
+    return cfg.state_dir / "cache"
+
+
+def cache_enabled(cfg: Config) -> bool:
+    return bool(cfg.raw.get("cache", {}).get("enabled", True))
+
+
+def cache_max_bytes(cfg: Config) -> int:
+    max_mb = cfg.raw.get("cache", {}).get("max_mb", 512)
+    return int(float(max_mb) * 1024 * 1024)
+
+
+def cache_key(cfg: Config, sha: str) -> str:
+    """Content address: file sha256 + the extractor settings that shape the text."""
+    payload = json.dumps({"sha256": sha, **extract_settings(cfg)}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _entry_path(cfg: Config, key: str) -> Path:
+    return cache_dir(cfg) / key[:2] / f"{key}.txt"
+
+
+def get_text(cfg: Config, sha: str) -> str | None:
+    p = _entry_path(cfg, cache_key(cfg, sha))
+    try:
+        text = p.read_text(encoding="utf-8")
+    except (FileNotFoundError, UnicodeDecodeError):
+        return None
+    try:
+        os.utime(p)  # mtime doubles as LRU timestamp
+    except OSError:
+        pass
+    return text
+
+
+def put_text(cfg: Config, sha: str, text: str) -> None:
+    p = _entry_path(cfg, cache_key(cfg, sha))
+    p.parent.mkdir(parents=True, exist_ok=True)
+    # temp + rename: concurrent workers never see a partial entry
+    fd, tmp = tempfile.mkstemp(dir=p.parent, prefix=_TMP_PREFIX, suffix=".txt")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, p)
+    except BaseException:
+        # e.g. ENOSPC: never leave a temp file behind
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def extract_cached(cfg: Config, path: Path, sha: str) -> tuple[str, bool]:
+    """extract_docx_text() with a lookup in the content-addressed text cache.
+
+    Returns (text, cache_hit).
+    """
+    if not cache_enabled(cfg):
+        return extract_docx_text(cfg, path), False
+    text = get_text(cfg, sha)
+    if text is not None:
+        return text, True
+    text = extract_docx_text(cfg, path)
+    put_text(cfg, sha, text)
+    return text, False
+
+
+def _scan(cfg: Config) -> tuple[list[tuple[float, int, Path]], list[tuple[float, Path]]]:
+    """(cache entries as (mtime, size, path), temp files as (mtime, path))."""
+    entries: list[tuple[float, int, Path]] = []
+    temps: list[tuple[float, Path]] = []
+    root = cache_dir(cfg)
+    if not root.exists():
+        return entries, temps
+    for sub in os.scandir(root):
+        if not sub.is_dir():
+            continue
+        for e in os.scandir(sub.path):
+            if not e.is_file() or not e.name.endswith(".txt"):
+                continue
+            st = e.stat()
+            if e.name.startswith(_TMP_PREFIX):
+                temps.append((st.st_mtime, Path(e.path)))
+            else:
+                entries.append((st.st_mtime, st.st_size, Path(e.path)))
+    return entries, temps
+
+
+def _entries(cfg: Config) -> list[tuple[float, int, Path]]:
+    return _scan(cfg)[0]
+
+
+def cache_stats(cfg: Config) -> dict:
+    entries = _entries(cfg)
+    return {
+        "path": str(cache_dir(cfg)),
+        "entries": len(entries),
+        "bytes": sum(size for _, size, _ in entries),
+        "max_bytes": cache_max_bytes(cfg),
+    }
+
+
+def prune_cache(cfg: Config, max_bytes: int | None = None) -> int:
+    """Evict least recently used entries until the cache fits; returns evicted count.
+
+    Temp files left by a crashed writer are removed once they are older than
+    _TMP_STALE_S (younger ones may belong to a worker that is still writing).
+    """
+    limit = cache_max_bytes(cfg) if max_bytes is None else max_bytes
+    entries, temps = _scan(cfg)
+    entries.sort()
+    stale = time.time() - _TMP_STALE_S
+    for mtime, p in temps:
+        if mtime < stale:
+            try:
+                p.unlink()
+            except FileNotFoundError:
+                pass
+    total = sum(size for _, size, _ in entries)
+    evicted = 0
+    for _, size, p in entries:
+        if total <= limit:
+            break
+        try:
+            p.unlink()
+        except FileNotFoundError:
+            pass
+        total -= size
+        evicted += 1
+    return evicted
+
+
+def clear_cache(cfg: Config) -> None:
+    if cache_dir(cfg).exists():
+        shutil.rmtree(cache_dir(cfg))
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterator
+import datetime
+import gzip
+import json
+import os
+import tempfile
+
+from .config import Config
+from .state import trim_changelog
+
+MODES = ("append", "rotate")
+RENDER_MODES = ("recent", "archive")
+
+
+def changelog_settings(cfg: Config) -> dict:
+    upd = cfg.raw.get("update", {})
+    s = {
+        "mode": str(upd.get("changelog_mode", "append")).strip().lower(),
+        "keep_rows": int(upd.get("changelog_keep_rows", 500)),
+        "keep_days": int(upd.get("changelog_keep_days", 0)),
+        "segment_rows": max(1, int(upd.get("changelog_segment_rows", 1000))),
+        "render": str(upd.get("changelog_render", "recent")).strip().lower(),
+    }
+    if s["mode"] not in MODES:
+        raise ValueError(f"unknown update.changelog_mode: {s['mode']!r} (expected {'|'.join(MODES)})")
+    if s["render"] not in RENDER_MODES:
+        raise ValueError(f"unknown update.changelog_render: {s['render']!r} (expected {'|'.join(RENDER_MODES)})")
+    return s
+
+
+def segments_dir(cfg: Config) -> Path:
+    return cfg.state_dir / "changelog"
+
+
+def _segment_name(first: int, last: int) -> str:
+    # absolute row numbers: a segment name never changes once written
+    return f"{first:09d}-{last:09d}.jsonl.gz"
+
+
+def list_segments(cfg: Config) -> list[tuple[int, int, Path]]:
+    """(first row, last row, path) of every archived segment, oldest first."""
+    root = segments_dir(cfg)
+    if not root.exists():
+        return []
+    out = []
+    for e in os.scandir(root):
+        stem = e.name[: -len(".jsonl.gz")] if e.name.endswith(".jsonl.gz") else ""
+        first, _, last = stem.partition("-")
+        if first.isdigit() and last.isdigit():
+            out.append((int(first), int(last), Path(e.path)))
+    return sorted(out)
+
+
+def read_segment(path: Path) -> Iterator[dict]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _write_segment(path: Path, rows: list[dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".gz")
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+            for r in rows:
+                f.write((json.dumps(r, ensure_ascii=False) + "\n").encode("utf-8"))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _cutoff_date(days: int) -> str:
+    return (datetime.date.today() - datetime.timedelta(days=days)).isoformat()
+
+
+def _outside_window(rows: list[dict], keep_rows: int, keep_days: int) -> int:
+    """Number of leading (oldest) rows that fall outside the keep window."""
+    n = max(0, len(rows) - keep_rows) if keep_rows > 0 else 0
+    if keep_days > 0:
+        cutoff = _cutoff_date(keep_days)
+        while n < len(rows) and str(rows[n].get("date", "")) < cutoff:
+            n += 1
+    return n
+
+
+def recent_rows(cfg: Config, manifest: dict) -> list[dict]:
+    """Inline rows inside the keep window (everything in append mode)."""
+    rows = manifest.get("changelog", [])
+    s = changelog_settings(cfg)
+    if s["mode"] != "rotate":
+        return rows
+    return rows[_outside_window(rows, s["keep_rows"], s["keep_days"]):]
+
+
+def rotate_changelog(cfg: Config, manifest: dict) -> int:
+    """Move old inline rows into compressed segments; returns rows moved.
+
+    Only whole segments of update.changelog_segment_rows rows are cut, so the
+    manifest holds between keep_rows and keep_rows + segment_rows rows and a
+    5-minute cron does not leave a tiny segment behind on every run. The
+    segment is written before the rows leave the manifest; a crash in between
+    rewrites the same segment (same name) on the next run.
+    """
+    s = changelog_settings(cfg)
+    rows = manifest.get("changelog", [])
+    if s["mode"] != "rotate":
+        return 0
+    n = _outside_window(rows, s["keep_rows"], s["keep_days"])
+    n -= n % s["segment_rows"]
+    if n <= 0:
+        return 0
+    first = int(manifest.get("changelog_archived", 0))
+    for i in range(0, n, s["segment_rows"]):
+        chunk = rows[i : i + s["segment_rows"]]
+        start = first + i
+        _write_segment(segments_dir(cfg) / _segment_name(start, start + len(chunk) - 1), chunk)
+    trim_changelog(cfg, manifest, n)
+    return n
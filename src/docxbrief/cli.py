@@ -8,15 +8,35 @@ from .config import load_config, init_templates
 from .scan import scan_files
 from .build import build_summary, update_summary
 from .shell import run_shell
+from .watch import watch_project
 from .status import show_status
 from .reset import reset_project
-from .bdispatch import dispatch_task, await_result
+from .cache import cache_stats, prune_cache, clear_cache
+from .metrics import show_perf
+from .bdispatch import dispatch_task, dispatch_many, await_result
+from .brun import run_tasks, DEFAULT_ASSIGNEES
+from .bplan import plan_tasks, DEFAULT_OBJECTIVE
+from .shard import build_shard, merge_partials, parse_shard
 
 
 def _add_common_args(p: argparse.ArgumentParser) -> None:
     p.add_argument("-c", "--config", default="docxbrief.yaml", help="Path to config YAML (default: docxbrief.yaml)")
 
 
+def _profiled(cfg, cmd: str, path: str | None, fn, *args, **kwargs):
+    """Run fn under cProfile (main process only) and dump pstats to path."""
+    import cProfile
+
+    out = Path(path) if path else cfg.state_dir / f"profile-{cmd}.pstats"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    prof = cProfile.Profile()
+    try:
+        return prof.runcall(fn, *args, **kwargs)
+    finally:
+        prof.dump_stats(str(out))
+        print(f"Profile written: {out} (inspect with: python -m pstats {out})")
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(prog="docxbrief", description="Scan .docx files and generate AsciiDoc summary (Stage A).")
     sub = parser.add_subparsers(dest="cmd", required=True)
@@ -34,22 +54,51 @@ def main(argv: list[str] | None = None) -> int:
     p_build = sub.add_parser("build", help="Build summary for all matched files (initial build).")
     _add_common_args(p_build)
     p_build.add_argument("--force", action="store_true", help="Rebuild even if manifest exists")
+    p_build.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: build.jobs; 0 = all cores)")
+    p_build.add_argument("--profile", nargs="?", const="", default=None, metavar="PATH",
+                         help="Write cProfile stats (default: <state_dir>/profile-build.pstats)")
+    p_build.add_argument("--retry-failed", action="store_true", help="Retry files whose extraction failed before")
+    p_build.add_argument("--shard", default=None, metavar="I/N",
+                         help="Process only shard I of N (stable path hash) into <state_dir>/partial/; combine with merge")
+
+    p_merge = sub.add_parser("merge", help="Combine build --shard partial manifests and render once.")
+    _add_common_args(p_merge)
+    p_merge.add_argument("partials", nargs="*", help="Partial manifest JSONs (default: all in <state_dir>/partial/)")
+    p_merge.add_argument("--keep", action="store_true", help="Keep merged partials from <state_dir>/partial/")
 
     p_update = sub.add_parser("update", help="Update summary only for changed files.")
     _add_common_args(p_update)
     p_update.add_argument("--force", action="store_true", help="Force reprocess all matched files")
+    p_update.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: build.jobs; 0 = all cores)")
+    p_update.add_argument("--profile", nargs="?", const="", default=None, metavar="PATH",
+                         help="Write cProfile stats (default: <state_dir>/profile-update.pstats)")
+    p_update.add_argument("--retry-failed", action="store_true", help="Retry files whose extraction failed before")
+
+    p_watch = sub.add_parser("watch", help="Watch input_dir and update incrementally on changes.")
+    _add_common_args(p_watch)
+    p_watch.add_argument("--debounce", type=float, default=None, help="Quiet period before updating (default: watch.debounce_seconds)")
+    p_watch.add_argument("--poll", action="store_true", default=None, help="Use stat polling instead of inotify")
+    p_watch.add_argument("--interval", type=float, default=None, help="Polling interval seconds (default: watch.poll_interval)")
+    p_watch.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: build.jobs; 0 = all cores)")
 
     p_shell = sub.add_parser("shell", help="Interactive helper (Shogun A).")
     _add_common_args(p_shell)
 
     p_status = sub.add_parser("status", help="Show current config and manifest overview.")
     _add_common_args(p_status)
+    p_status.add_argument("--perf", action="store_true", help="Show slowest phases/files from recent runs")
+    p_status.add_argument("--runs", type=int, default=5, help="--perf: number of recent runs (default: 5)")
 
     p_reset = sub.add_parser("reset", help="Reset state (and optionally output) to avoid stale changelog.")
     _add_common_args(p_reset)
     p_reset.add_argument("--all", action="store_true", help="Also remove output summary.adoc")
     p_reset.add_argument("--yes", action="store_true", help="Skip confirmation")
 
+    p_cache = sub.add_parser("cache", help="Inspect or trim the extracted-text cache.")
+    _add_common_args(p_cache)
+    p_cache.add_argument("cache_cmd", choices=["stats", "prune", "clear"], help="stats | prune (LRU down to cache.max_mb) | clear")
+    p_cache.add_argument("--max-mb", type=float, default=None, help="prune: target size in MB (default: cache.max_mb)")
+
     p_b = sub.add_parser("b", help="Stage B helpers (tmux/Codex dispatcher).")
     _add_common_args(p_b)
     b_sub = p_b.add_subparsers(dest="b_cmd", required=True)
@@ -57,12 +106,42 @@ def main(argv: list[str] | None = None) -> int:
     p_dispatch = b_sub.add_parser("dispatch", help="Dispatch a task YAML to the assignee pane.")
     _add_common_args(p_dispatch)
     p_dispatch.add_argument("task_yaml", help="Path to task YAML (b/tasks/*.yaml)")
+    p_dispatch.add_argument("--backend", choices=["control", "cli"], default="control",
+                            help="control = one tmux -C connection (default), cli = one tmux process per command")
+
+    p_dispatch_many = b_sub.add_parser("dispatch-many", help="Dispatch several task YAMLs in one batch.")
+    _add_common_args(p_dispatch_many)
+    p_dispatch_many.add_argument("task_yaml", nargs="+", help="Paths to task YAMLs (e.g. b/tasks/*.yaml)")
+    p_dispatch_many.add_argument("--backend", choices=["control", "cli"], default="control",
+                                 help="control = one tmux -C connection (default), cli = one tmux process per command")
 
     p_await = b_sub.add_parser("await", help="Wait for result YAML for a task.")
     _add_common_args(p_await)
     p_await.add_argument("task_yaml", help="Path to task YAML (b/tasks/*.yaml)")
     p_await.add_argument("--timeout", type=float, default=600.0, help="Timeout seconds (default: 600)")
 
+    p_run = b_sub.add_parser("run", help="Dispatch a DAG of tasks (depends_on) across panes and gather results.")
+    _add_common_args(p_run)
+    p_run.add_argument("task_yaml", nargs="+", help="Paths to task YAMLs (e.g. b/tasks/*.yaml)")
+    p_run.add_argument("--assignees", default=",".join(DEFAULT_ASSIGNEES),
+                       help="Pool for tasks with 'assignee: any' (default: %(default)s)")
+    p_run.add_argument("--max-per-assignee", type=int, default=1, help="In-flight tasks per assignee (default: 1)")
+    p_run.add_argument("--limit", action="append", default=[], metavar="ASSIGNEE=N",
+                       help="Per-assignee override of --max-per-assignee (repeatable)")
+    p_run.add_argument("--timeout", type=float, default=3600.0, help="Overall timeout seconds (default: 3600)")
+    p_run.add_argument("--backend", choices=["control", "cli"], default="control",
+                       help="control = one tmux -C connection (default), cli = one tmux process per command")
+
+    p_plan = b_sub.add_parser("plan", help="Split scanned documents into size-balanced task YAMLs.")
+    _add_common_args(p_plan)
+    p_plan.add_argument("--assignees", default=",".join(DEFAULT_ASSIGNEES),
+                        help="Comma-separated assignees, shard i -> assignee i mod N (default: %(default)s)")
+    p_plan.add_argument("--shards", type=int, default=None, help="Number of tasks (default: one per assignee)")
+    p_plan.add_argument("--issuer", default="karo", help="Task issuer / handoff target (default: karo)")
+    p_plan.add_argument("--objective", default=DEFAULT_OBJECTIVE, help="Objective text for every task")
+    p_plan.add_argument("--dry-run", action="store_true", help="Print the plan without writing files")
+    p_plan.add_argument("--clean", action="store_true", help="Remove earlier TASK-plan-* files not in this plan")
+
     args = parser.parse_args(argv)
 
     if args.cmd == "init":
@@ -83,17 +162,47 @@ def main(argv: list[str] | None = None) -> int:
                 print(p)
         return 0
 
-    if args.cmd == "build":
-        return 0 if build_summary(cfg, force=args.force) else 1
+    if args.cmd == "build" and args.shard:
+        try:
+            i, n = parse_shard(args.shard)
+        except ValueError as exc:
+            print(str(exc))
+            return 2
+        if args.profile is not None:
+            _profiled(cfg, "build", args.profile, build_shard, cfg, i, n, force=args.force, jobs=args.jobs,
+                      retry_failed=args.retry_failed)
+        else:
+            build_shard(cfg, i, n, force=args.force, jobs=args.jobs, retry_failed=args.retry_failed)
+        return 0
+
+    if args.cmd == "merge":
+        try:
+            ok = merge_partials(cfg, [Path(p) for p in args.partials] or None, keep=args.keep)
+        except ValueError as exc:
+            print(str(exc))
+            return 1
+        return 0 if ok else 1
+
+    if args.cmd in ("build", "update"):
+        fn = build_summary if args.cmd == "build" else update_summary
+        if args.profile is not None:
+            ok = _profiled(cfg, args.cmd, args.profile, fn, cfg, force=args.force, jobs=args.jobs,
+                           retry_failed=args.retry_failed)
+        else:
+            ok = fn(cfg, force=args.force, jobs=args.jobs, retry_failed=args.retry_failed)
+        return 0 if ok else 1
 
-    if args.cmd == "update":
-        return 0 if update_summary(cfg, force=args.force) else 1
+    if args.cmd == "watch":
+        watch_project(cfg, debounce=args.debounce, poll=args.poll, interval=args.interval, jobs=args.jobs)
+        return 0
 
     if args.cmd == "shell":
         return 0 if run_shell(cfg) else 1
 
     if args.cmd == "status":
         show_status(cfg)
+        if args.perf:
+            show_perf(cfg, runs=args.runs)
         return 0
 
     if args.cmd == "reset":
@@ -105,14 +214,73 @@ def main(argv: list[str] | None = None) -> int:
         print("Reset complete.")
         return 0
 
+    if args.cmd == "cache":
+        if args.cache_cmd == "stats":
+            st = cache_stats(cfg)
+            print("DocxBrief Cache")
+            print(f"  path     : {st['path']}")
+            print(f"  entries  : {st['entries']}")
+            print(f"  size     : {st['bytes'] / (1024 * 1024):.1f} MB / {st['max_bytes'] / (1024 * 1024):.1f} MB")
+        elif args.cache_cmd == "prune":
+            limit = None if args.max_mb is None else int(args.max_mb * 1024 * 1024)
+            print(f"Evicted {prune_cache(cfg, limit)} cache entries.")
+        else:
+            clear_cache(cfg)
+            print("Cache cleared.")
+        return 0
+
     if args.cmd == "b":
         if args.b_cmd == "dispatch":
             try:
-                dispatch_task(Path(args.task_yaml))
+                dispatch_task(Path(args.task_yaml), backend=args.backend)
+            except RuntimeError as exc:
+                print(str(exc))
+                return 1
+            return 0
+        if args.b_cmd == "dispatch-many":
+            try:
+                task_ids = dispatch_many([Path(p) for p in args.task_yaml], backend=args.backend)
             except RuntimeError as exc:
                 print(str(exc))
                 return 1
+            print(f"Dispatched {len(task_ids)} task(s): {', '.join(task_ids)}")
             return 0
+        if args.b_cmd == "plan":
+            try:
+                plan_tasks(
+                    cfg,
+                    [a.strip() for a in args.assignees.split(",") if a.strip()],
+                    args.shards,
+                    issuer=args.issuer,
+                    objective=args.objective,
+                    dry_run=args.dry_run,
+                    clean=args.clean,
+                )
+            except ValueError as exc:
+                print(str(exc))
+                return 1
+            return 0
+        if args.b_cmd == "run":
+            limits = {}
+            for item in args.limit:
+                name, sep, n = item.partition("=")
+                if not sep or not n.strip().isdigit():
+                    print(f"Invalid --limit {item!r} (expected ASSIGNEE=N)")
+                    return 2
+                limits[name.strip()] = int(n)
+            try:
+                ok = run_tasks(
+                    [Path(p) for p in args.task_yaml],
+                    assignees=[a.strip() for a in args.assignees.split(",") if a.strip()],
+                    limits=limits,
+                    default_limit=args.max_per_assignee,
+                    timeout=float(args.timeout),
+                    backend=args.backend,
+                )
+            except (RuntimeError, ValueError) as exc:
+                print(str(exc))
+                return 1
+            return 0 if ok else 1
         if args.b_cmd == "await":
             result, info = await_result(Path(args.task_yaml), timeout=float(args.timeout))
             if result is None:
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from typing import Iterable, Mapping
+
+from .config import Config
+from .state import set_file_entry
+
+# Entry fields that depend only on the content (sha256) and the extract/summarize
+# settings; byte-identical copies keep one set of them in manifest["shared"].
+SHARED_KEYS = ("summary", "sections", "sections_key", "extract_fp", "summarize_fp")
+
+
+def dedup_enabled(cfg: Config) -> bool:
+    return bool(cfg.raw.get("build", {}).get("dedup", False))
+
+
+def with_shared(manifest: dict, entry: Mapping | None) -> Mapping | None:
+    """The entry with its shared summary/sections filled in (as a plain dict)."""
+    if entry is None or not entry.get("shared"):
+        return entry
+    data = manifest.get("shared", {}).get(entry.get("sha256"), {})
+    return {**{k: v for k, v in entry.items() if k != "shared"}, **data}
+
+
+def summaries(manifest: dict) -> dict[str, list[str]]:
+    """path -> bullets for rendering; copies share one list object."""
+    shared = manifest.get("shared", {})
+    out = {}
+    for sp, e in manifest.get("files", {}).items():
+        if e.get("shared"):
+            out[sp] = shared.get(e.get("sha256"), {}).get("summary", [])
+        else:
+            out[sp] = e.get("summary", [])
+    return out
+
+
+def known_contents(manifest: dict, shas: Iterable[str]) -> dict[str, dict]:
+    """sha256 -> shared fields (+ chars) already in the manifest, for the given digests only."""
+    wanted = set(shas)
+    found: dict[str, dict] = {}
+    if not wanted:
+        return found
+    shared = manifest.get("shared", {})
+    for sp, e in manifest.get("files", {}).items():
+        sha = e.get("sha256")
+        if sha not in wanted or sha in found:
+            continue
+        full = with_shared(manifest, e) if sha in shared else e
+        if full.get("sections_key") is not None and "summary" in full:
+            found[sha] = {k: full[k] for k in (*SHARED_KEYS, "chars") if k in full}
+    return found
+
+
+def share_duplicates(cfg: Config, manifest: dict, shas: Iterable[str | None] | None = None) -> int:
+    """Move the content fields of byte-identical entries into manifest["shared"].
+
+    Entries with the same sha256 keep their own path/stat fields and get
+    "shared": true; summary/sections/sections_key live once under
+    manifest["shared"][sha256]. Content that is down to a single path is
+    inlined again and unused shared records are dropped. Only the given
+    digests (those written or dropped by this run) are regrouped, which reads
+    just the sha256 of the other entries; None regroups every entry. Returns
+    the number of regrouped entries that refer to shared content.
+    """
+    files = manifest.get("files", {})
+    old = manifest.get("shared", {})
+    wanted = None if shas is None else {sha for sha in shas if sha}
+    if wanted is not None and not wanted:
+        return 0
+    groups: dict[str, list[tuple[str, Mapping]]] = {}
+    for sp, e in files.items():
+        sha = e.get("sha256", "")
+        if wanted is None or sha in wanted:
+            groups.setdefault(sha, []).append((sp, e))
+
+    shared: dict[str, dict] = {} if wanted is None else {k: v for k, v in old.items() if k not in wanted}
+    n = 0
+    for sha, members in groups.items():
+        if len(members) == 1:
+            sp, e = members[0]
+            if sha in old and e.get("shared"):
+                set_file_entry(cfg, manifest, sp, with_shared(manifest, e))
+            continue
+        # an inline member was (re)summarized more recently than the shared record
+        data = next((
+            {k: e[k] for k in SHARED_KEYS if k in e} for _, e in members if not e.get("shared") and "sections_key" in e
+        ), None) or old.get(sha)
+        if data is None:
+            continue
+        shared[sha] = data
+        for sp, e in members:
+            n += 1
+            if not e.get("shared"):
+                set_file_entry(cfg, manifest, sp, {**{k: v for k, v in e.items() if k not in SHARED_KEYS}, "shared": True})
+    if shared:
+        manifest["shared"] = shared
+    else:
+        manifest.pop("shared", None)
+    return n
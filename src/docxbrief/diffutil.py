@@ -1,16 +1,135 @@
 from __future__ import annotations
 
-import difflib
-from typing import Dict
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Tuple
 
 
-def diff_stats(old: str, new: str) -> Dict[str, int]:
-    """Return simple diff stats: added/removed lines."""
+# Edit-distance cutoff: beyond this many inserted+deleted lines the Myers
+# search stops and diff_stats() falls back to a multiset estimate.
+DEFAULT_MAX_EDITS = 1000
+
+Opcode = Tuple[str, int, int, int, int]
+
+
+def _intern(a: List[str], b: List[str]) -> Tuple[List[int], List[int]]:
+    """Map lines to small ints so the diff loop compares ints, not strings."""
+    ids: Dict[str, int] = {}
+    return [ids.setdefault(x, len(ids)) for x in a], [ids.setdefault(x, len(ids)) for x in b]
+
+
+def _myers(a: List[int], b: List[int], max_d: int) -> Optional[List[Opcode]]:
+    """Myers O(ND) diff; opcodes like SequenceMatcher.get_opcodes(), or None
+    when the edit distance exceeds max_d."""
+    n, m = len(a), len(b)
+    # common prefix / suffix are cheap and shrink the search a lot
+    lo = 0
+    while lo < n and lo < m and a[lo] == b[lo]:
+        lo += 1
+    hi_a, hi_b = n, m
+    while hi_a > lo and hi_b > lo and a[hi_a - 1] == b[hi_b - 1]:
+        hi_a -= 1
+        hi_b -= 1
+    A, B = a[lo:hi_a], b[lo:hi_b]
+    N, M = len(A), len(B)
+
+    moves: List[str] = []  # reversed sequence of "=", "-", "+"
+    if N == 0 or M == 0:
+        if N + M > max_d:
+            return None  # same cap as the search below: no full opcodes for a huge insert/delete
+        moves = ["+"] * M + ["-"] * N
+    else:
+        limit = min(N + M, max_d)
+        off = limit + 1
+        v = [0] * (2 * limit + 3)
+        trace: List[List[int]] = []
+        found = False
+        for d in range(limit + 1):
+            # v[k] for k in [-d-1, d+1], as read by this round (index k + d + 1)
+            trace.append(v[off - d - 1 : off + d + 2])
+            for k in range(-d, d + 1, 2):
+                if k == -d or (k != d and v[off + k - 1] < v[off + k + 1]):
+                    x = v[off + k + 1]
+                else:
+                    x = v[off + k - 1] + 1
+                y = x - k
+                while x < N and y < M and A[x] == B[y]:
+                    x += 1
+                    y += 1
+                v[off + k] = x
+                if x >= N and y >= M:
+                    found = True
+                    break
+            if found:
+                break
+        if not found:
+            return None
+        x, y = N, M
+        for d in range(len(trace) - 1, -1, -1):
+            vd = trace[d]
+            k = x - y
+            if k == -d or (k != d and vd[k - 1 + d + 1] < vd[k + 1 + d + 1]):
+                prev_k = k + 1
+            else:
+                prev_k = k - 1
+            prev_x = vd[prev_k + d + 1]
+            prev_y = prev_x - prev_k
+            while x > prev_x and y > prev_y:
+                moves.append("=")
+                x -= 1
+                y -= 1
+            if d > 0:
+                moves.append("+" if x == prev_x else "-")
+            x, y = prev_x, prev_y
+
+    ops: List[Opcode] = []
+    if lo:
+        ops.append(("equal", 0, lo, 0, lo))
+    i, j = lo, lo
+    pos = len(moves) - 1
+    while pos >= 0:
+        if moves[pos] == "=":
+            i0, j0 = i, j
+            while pos >= 0 and moves[pos] == "=":
+                i += 1
+                j += 1
+                pos -= 1
+            ops.append(("equal", i0, i, j0, j))
+            continue
+        i0, j0 = i, j
+        while pos >= 0 and moves[pos] != "=":
+            if moves[pos] == "-":
+                i += 1
+            else:
+                j += 1
+            pos -= 1
+        tag = "replace" if i > i0 and j > j0 else ("delete" if i > i0 else "insert")
+        ops.append((tag, i0, i, j0, j))
+    if hi_a < n:
+        ops.append(("equal", hi_a, n, hi_b, m))
+    return ops
+
+
+def diff_lines(a: List[str], b: List[str], max_edits: int = DEFAULT_MAX_EDITS) -> Optional[List[Opcode]]:
+    """Line diff as opcodes (tag, i1, i2, j1, j2); None beyond max_edits."""
+    ia, ib = _intern(a, b)
+    return _myers(ia, ib, max(0, int(max_edits)))
+
+
+def diff_stats(old: str, new: str, max_edits: int = DEFAULT_MAX_EDITS) -> Dict[str, int]:
+    """Return simple diff stats: added/removed lines.
+
+    When the edit distance exceeds max_edits the result is a multiset
+    estimate (lines whose count went down/up) flagged with "approx": True;
+    it never undercounts by more than moved lines.
+    """
     old_lines = old.splitlines()
     new_lines = new.splitlines()
-    sm = difflib.SequenceMatcher(a=old_lines, b=new_lines)
+    ops = diff_lines(old_lines, new_lines, max_edits)
+    if ops is None:
+        ca, cb = Counter(old_lines), Counter(new_lines)
+        return {"added": sum((cb - ca).values()), "removed": sum((ca - cb).values()), "approx": True}
     added = removed = 0
-    for tag, i1, i2, j1, j2 in sm.get_opcodes():
+    for tag, i1, i2, j1, j2 in ops:
         if tag == "insert":
             added += (j2 - j1)
         elif tag == "delete":
@@ -19,3 +138,133 @@ def diff_stats(old: str, new: str) -> Dict[str, int]:
             removed += (i2 - i1)
             added += (j2 - j1)
     return {"added": added, "removed": removed}
+
+
+def _grouped(ops: List[Opcode], n: int) -> Iterator[List[Opcode]]:
+    """Hunks with up to n lines of context (as difflib's get_grouped_opcodes)."""
+    if not ops:
+        ops = [("equal", 0, 1, 0, 1)]
+    ops = list(ops)
+    if ops[0][0] == "equal":
+        tag, i1, i2, j1, j2 = ops[0]
+        ops[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    if ops[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = ops[-1]
+        ops[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+    nn = n + n
+    group: List[Opcode] = []
+    for tag, i1, i2, j1, j2 in ops:
+        if tag == "equal" and i2 - i1 > nn:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+
+def _range(start: int, stop: int) -> str:
+    length = stop - start
+    beginning = start + 1 if length else start
+    return f"{beginning}" if length == 1 else f"{beginning},{length}"
+
+
+def unified_diff(
+    a: List[str], b: List[str], n: int = 3, fromfile: str = "", tofile: str = "",
+    max_edits: int = DEFAULT_MAX_EDITS,
+) -> Optional[List[str]]:
+    """difflib.unified_diff()-style lines (no trailing newlines) from the fast
+    engine; None when the edit distance exceeds max_edits."""
+    ops = diff_lines(a, b, max_edits)
+    if ops is None:
+        return None
+    out: List[str] = []
+    for group in _grouped(ops, max(0, n)):
+        if not out:
+            out += [f"--- {fromfile}", f"+++ {tofile}"]
+        first, last = group[0], group[-1]
+        out.append(f"@@ -{_range(first[1], last[2])} +{_range(first[3], last[4])} @@")
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                out.extend(" " + line for line in a[i1:i2])
+                continue
+            if tag in ("replace", "delete"):
+                out.extend("-" + line for line in a[i1:i2])
+            if tag in ("replace", "insert"):
+                out.extend("+" + line for line in b[j1:j2])
+    return out
+
+
+def _section_lines(paras: List[str], sec: dict) -> List[str]:
+    return paras[sec["start"] : sec["end"]]
+
+
+def section_changes(
+    old_text: Optional[str], old_index: List[dict], new_text: str, new_index: List[dict],
+    max_edits: int = DEFAULT_MAX_EDITS,
+) -> List[dict]:
+    """Sections that differ between two section indexes (see summarize_sections).
+
+    Sections are paired by heading (and occurrence, for repeated headings);
+    a section whose hash still exists anywhere counts as unchanged (moved).
+    Each change is {heading, change: changed|added|removed, added, removed}
+    with line counts; for "changed" they come from diff_stats() when the old
+    text is available, otherwise added/removed are None.
+    """
+    old_paras = [ln.strip() for ln in old_text.splitlines() if ln.strip()] if old_text is not None else None
+    new_paras = [ln.strip() for ln in new_text.splitlines() if ln.strip()]
+
+    def keyed(index: List[dict]) -> Dict[tuple, dict]:
+        seen: Dict[str, int] = {}
+        out = {}
+        for sec in index:
+            n = seen[sec["heading"]] = seen.get(sec["heading"], 0) + 1
+            out[(sec["heading"], n)] = sec
+        return out
+
+    old_by_key = keyed(old_index)
+    new_by_key = keyed(new_index)
+    old_hashes = {sec["hash"] for sec in old_index}
+    new_hashes = {sec["hash"] for sec in new_index}
+
+    changes: List[dict] = []
+    for key, sec in new_by_key.items():
+        if sec["hash"] in old_hashes:
+            continue
+        old = old_by_key.get(key)
+        n_new = sec["end"] - sec["start"]
+        if old is None:
+            changes.append({"heading": sec["heading"], "change": "added", "added": n_new, "removed": 0})
+        elif old_paras is None:
+            changes.append({"heading": sec["heading"], "change": "changed", "added": None, "removed": None})
+        else:
+            st = diff_stats(
+                "\n".join(_section_lines(old_paras, old)), "\n".join(_section_lines(new_paras, sec)), max_edits
+            )
+            changes.append({"heading": sec["heading"], "change": "changed", **st})
+    for key, sec in old_by_key.items():
+        if key in new_by_key or sec["hash"] in new_hashes:
+            continue
+        changes.append({"heading": sec["heading"], "change": "removed", "added": 0, "removed": sec["end"] - sec["start"]})
+    return changes
+
+
+def describe_section_changes(changes: List[dict], limit: int = 5) -> str:
+    """'結果 (+3/-1 lines), 付録 (added, +5 lines)' for a changelog message."""
+    parts = []
+    for ch in changes[:limit]:
+        name = ch["heading"] or "(front matter)"
+        if ch["change"] == "changed":
+            if ch["added"] is None:
+                parts.append(f"{name} (changed)")
+            else:
+                approx = "~" if ch.get("approx") else ""
+                parts.append(f"{name} ({approx}+{ch['added']}/-{ch['removed']} lines)")
+        elif ch["change"] == "added":
+            parts.append(f"{name} (added, +{ch['added']} lines)")
+        else:
+            parts.append(f"{name} (removed, -{ch['removed']} lines)")
+    if len(changes) > limit:
+        parts.append(f"+{len(changes) - limit} more")
+    return ", ".join(parts)
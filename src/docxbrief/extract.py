@@ -1,18 +1,153 @@
 from __future__ import annotations
 
+from contextlib import closing
 from pathlib import Path
+from typing import Iterator
+from xml.etree import ElementTree as ET
+import hashlib
+import re
+import zipfile
+
 from docx import Document
 from .config import Config
 
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_RELS_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
 
-def extract_docx_text(cfg: Config, path: Path) -> str:
+# Run children that contribute text, mirroring python-docx Run.text
+_RUN_TEXT = {
+    _W + "tab": "\t",
+    _W + "ptab": "\t",
+    _W + "cr": "\n",
+    _W + "noBreakHyphen": "-",
+}
+
+
+def _iter_paragraphs_docx(path: Path) -> Iterator[str]:
     doc = Document(str(path))
-    parts: list[str] = []
     for para in doc.paragraphs:
-        t = (para.text or "").strip()
-        if not t:
-            continue
-        parts.append(t)
+        yield para.text or ""
+
+
+def _main_part_name(zf: zipfile.ZipFile) -> str:
+    """Resolve the main document part via _rels/.rels (usually word/document.xml)."""
+    try:
+        rels = ET.fromstring(zf.read("_rels/.rels"))
+    except (KeyError, ET.ParseError):
+        return "word/document.xml"
+    for rel in rels.iter(_RELS_NS + "Relationship"):
+        if rel.get("Type", "").endswith("/officeDocument"):
+            return rel.get("Target", "word/document.xml").lstrip("/")
+    return "word/document.xml"
+
+
+def _run_text(r: ET.Element) -> str:
+    out: list[str] = []
+    for child in r:
+        tag = child.tag
+        if tag == _W + "t":
+            out.append(child.text or "")
+        elif tag == _W + "br":
+            # Only text-wrapping breaks are newlines; page/column breaks are ""
+            if child.get(_W + "type", "textWrapping") == "textWrapping":
+                out.append("\n")
+        elif tag in _RUN_TEXT:
+            out.append(_RUN_TEXT[tag])
+    return "".join(out)
+
+
+def _paragraph_text(p: ET.Element) -> str:
+    out: list[str] = []
+    for child in p:
+        if child.tag == _W + "r":
+            out.append(_run_text(child))
+        elif child.tag == _W + "hyperlink":
+            out.extend(_run_text(r) for r in child if r.tag == _W + "r")
+    return "".join(out)
+
+
+def _iter_paragraphs_stream(path: Path) -> Iterator[str]:
+    """Yield body paragraph texts straight from the main document XML.
+
+    Only the main part is read (no styles/numbering/media), and it is parsed
+    incrementally; each top-level body element is dropped once handled.
+    Like python-docx Document.paragraphs, only direct w:body/w:p children are
+    yielded (table cells and revision marks are skipped).
+    """
+    with zipfile.ZipFile(path) as zf, zf.open(_main_part_name(zf)) as f:
+        depth = 0
+        body: ET.Element | None = None
+        for event, elem in ET.iterparse(f, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                if depth == 2 and elem.tag == _W + "body":
+                    body = elem
+                continue
+            if depth == 3 and body is not None:
+                if elem.tag == _W + "p":
+                    yield _paragraph_text(elem)
+                body.remove(elem)
+            depth -= 1
+
+
+# Parts whose bytes can change the document text; docProps/*, styles, settings,
+# rels etc. are rewritten by every save and deliberately left out.
+_TEXT_PART_RE = re.compile(r"word/(?:document|header|footer|footnotes|endnotes|comments)\d*\.xml")
+
+
+def content_fingerprint(path: Path) -> str | None:
+    """Fingerprint of the text-bearing parts from the zip central directory only.
+
+    Combines (name, CRC-32, uncompressed size) of word/document.xml, headers,
+    footers, foot/endnotes and comments; nothing is decompressed. Returns None
+    for files that are not readable zips.
+    """
+    try:
+        with zipfile.ZipFile(path) as zf:
+            parts = sorted(
+                (i.filename, i.CRC, i.file_size) for i in zf.infolist() if _TEXT_PART_RE.fullmatch(i.filename)
+            )
+    except (OSError, zipfile.BadZipFile):
+        return None
+    if not parts:
+        return None
+    h = hashlib.sha256()
+    for name, crc, size in parts:
+        h.update(f"{name}\0{crc:08x}\0{size}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+_ENGINES = {
+    "python-docx": _iter_paragraphs_docx,
+    "stream": _iter_paragraphs_stream,
+}
+
+
+def extract_settings(cfg: Config) -> dict:
+    """Settings that determine extracted text (used for cache keys)."""
+    ext_cfg = cfg.raw.get("extract", {})
+    engine = str(ext_cfg.get("engine", "python-docx"))
+    if engine not in _ENGINES:
+        raise ValueError(f"unknown extract.engine: {engine!r} (expected {'|'.join(_ENGINES)})")
+    return {"engine": engine, "max_chars_per_file": int(ext_cfg.get("max_chars_per_file", 12000))}
+
+
+def extract_docx_text(cfg: Config, path: Path) -> str:
+    settings = extract_settings(cfg)
+    engine = settings["engine"]
+    max_chars = settings["max_chars_per_file"]
+
+    parts: list[str] = []
+    size = 0
+    with closing(_ENGINES[engine](path)) as paras:
+        for raw in paras:
+            t = raw.strip()
+            if not t:
+                continue
+            parts.append(t)
+            # joined length so far ("\n" between parts); stop once the budget is full
+            size += len(t) + (1 if len(parts) > 1 else 0)
+            if size >= max_chars:
+                break
     text = "\n".join(parts)
-    max_chars = int(cfg.raw.get("extract", {}).get("max_chars_per_file", 12000))
     return text[:max_chars]
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+import datetime
+import json
+import os
+import time
+
+from .config import Config
+
+
+def metrics_path(cfg: Config) -> Path:
+    return cfg.state_dir / "metrics.jsonl"
+
+
+class RunMetrics:
+    """Per-phase (main process) and per-file (worker) timings for one build/update.
+
+    Phases may nest (e.g. "hash" inside "process"); each records wall and
+    CPU seconds. finish() appends one JSON line to <state_dir>/metrics.jsonl
+    (only the metrics.keep_files slowest files; the file keeps the last
+    metrics.keep_runs runs) and a one-line summary to <state_dir>/log.txt.
+    """
+
+    def __init__(self, command: str) -> None:
+        self.command = command
+        self.started_at = datetime.datetime.now().astimezone().isoformat(timespec="seconds")
+        self._t0 = time.perf_counter()
+        self._c0 = time.process_time()
+        self.phases: dict[str, dict[str, float]] = {}
+        self.files: dict[str, dict] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        t0, c0 = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            ph = self.phases.setdefault(name, {"wall_s": 0.0, "cpu_s": 0.0})
+            ph["wall_s"] += time.perf_counter() - t0
+            ph["cpu_s"] += time.process_time() - c0
+
+    def file(self, path: str, **values) -> None:
+        self.files.setdefault(path, {"path": path}).update(values)
+
+    def finish(self, cfg: Config, record_run: bool = True, **summary) -> dict:
+        """Write the run record; record_run=False (nothing changed) only logs the summary line."""
+        mcfg = cfg.raw.get("metrics", {})
+        keep_files = int(mcfg.get("keep_files", 50))
+        files = list(self.files.values())
+        record = {
+            "command": self.command,
+            "started_at": self.started_at,
+            "wall_s": time.perf_counter() - self._t0,
+            "cpu_s": time.process_time() - self._c0,
+            **summary,
+            "phases": self.phases,
+            # summed per-file worker time (may exceed wall time with --jobs > 1)
+            "workers": {
+                k: sum(f.get(k, 0) for f in files)
+                for k in ("hash_s", "extract_s", "summarize_s", "cpu_s", "bytes_hashed", "chars")
+            },
+            "files_total": len(files),
+            "files": sorted(files, key=_file_time, reverse=True)[:max(keep_files, 0)],
+        }
+        cfg.state_dir.mkdir(parents=True, exist_ok=True)
+        if record_run:
+            with metrics_path(cfg).open("a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            _trim(metrics_path(cfg), int(mcfg.get("keep_runs", 200)))
+        extra = ", ".join(f"{k}={v}" for k, v in summary.items())
+        with (cfg.state_dir / "log.txt").open("a", encoding="utf-8") as f:
+            f.write(f"[{self.started_at}] {self.command}: {extra} wall={record['wall_s']:.2f}s cpu={record['cpu_s']:.2f}s\n")
+        return record
+
+
+def _file_time(f: dict) -> float:
+    return f.get("hash_s", 0) + f.get("extract_s", 0) + f.get("summarize_s", 0)
+
+
+def _trim(path: Path, keep: int) -> None:
+    """Cut metrics.jsonl down to its last `keep` runs once it holds about twice that.
+
+    The slack keeps the rewrite (temp file + rename) rare instead of once per run.
+    """
+    if keep <= 0:
+        return
+    lines = _tail_lines(path, keep)
+    kept = sum(len(ln.encode("utf-8")) + 1 for ln in lines)
+    if path.stat().st_size <= 2 * kept:
+        return
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp.open("w", encoding="utf-8") as f:
+            f.write("".join(ln + "\n" for ln in lines))
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _tail_lines(path: Path, n: int, block: int = 64 * 1024) -> list[str]:
+    """Last n lines without reading the whole (append-only) file."""
+    with path.open("rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b""
+        while pos > 0 and data.count(b"\n") <= n:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    lines = [ln for ln in data.decode("utf-8", errors="replace").splitlines() if ln.strip()]
+    return lines[-n:]
+
+
+def load_runs(cfg: Config, n: int) -> list[dict]:
+    p = metrics_path(cfg)
+    if not p.exists() or n <= 0:
+        return []
+    runs = []
+    for ln in _tail_lines(p, n):
+        try:
+            runs.append(json.loads(ln))
+        except json.JSONDecodeError:
+            continue
+    return runs
+
+
+def show_perf(cfg: Config, runs: int = 5, top: int = 10) -> None:
+    records = load_runs(cfg, runs)
+    print(f"DocxBrief Perf (last {len(records)} run(s) from {metrics_path(cfg)})")
+    if not records:
+        return
+    for r in records:
+        print(
+            f"  {r.get('started_at', '')}  {r.get('command', ''):<7} wall {r.get('wall_s', 0):7.2f}s"
+            f"  cpu {r.get('cpu_s', 0):7.2f}s  scanned {r.get('scanned', 0)}  processed {r.get('processed', 0)}"
+        )
+
+    print("  slowest phases (wall, summed over runs):")
+    totals: dict[str, float] = {}
+    for r in records:
+        for name, ph in r.get("phases", {}).items():
+            totals[name] = totals.get(name, 0.0) + ph.get("wall_s", 0.0)
+        for name in ("hash_s", "extract_s", "summarize_s"):
+            key = f"{name[:-2]} (workers)"
+            totals[key] = totals.get(key, 0.0) + r.get("workers", {}).get(name, 0.0)
+    for name, t in sorted(totals.items(), key=lambda kv: -kv[1]):
+        print(f"    {name:<20} {t:8.3f}s")
+
+    print(f"  slowest files (top {top}):")
+    slow = []
+    for r in records:
+        for f in r.get("files", []):
+            slow.append((_file_time(f), f))
+    slow.sort(key=lambda x: -x[0])
+    for t, f in slow[:top]:
+        print(
+            f"    {t:8.3f}s  {f.get('path')}  (hash {f.get('hash_s', 0):.3f}s, extract {f.get('extract_s', 0):.3f}s,"
+            f" summarize {f.get('summarize_s', 0):.3f}s, {f.get('chars', 0)} chars)"
+        )
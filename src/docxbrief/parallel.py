@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+import os
+from typing import Any, Callable, Iterable, Iterator
+
+from .config import Config
+
+
+def resolve_jobs(cfg: Config, jobs: int | None = None) -> int:
+    """Worker count: explicit value > build.jobs > 1. 0 (or less) means all cores."""
+    if jobs is None:
+        jobs = cfg.raw.get("build", {}).get("jobs", 1)
+    n = int(jobs or 0)
+    if n <= 0:
+        n = os.cpu_count() or 1
+    return n
+
+
+class WorkerPool:
+    """Lazily started process pool whose map() keeps input order.
+
+    With jobs <= 1 (or a single item) everything runs in-process, so the
+    serial path has no pickling/fork overhead.
+    """
+
+    def __init__(self, jobs: int) -> None:
+        self.jobs = max(1, int(jobs))
+        self._executor: ProcessPoolExecutor | None = None
+
+    def map(self, fn: Callable[[Any], Any], items: Iterable[Any], chunksize: int = 1) -> list[Any]:
+        return list(self.imap(fn, items, chunksize))
+
+    def imap(self, fn: Callable[[Any], Any], items: Iterable[Any], chunksize: int = 1) -> Iterator[Any]:
+        """Like map(), but yields each result (in input order) as soon as it is ready."""
+        items = list(items)
+        if self.jobs <= 1 or len(items) <= 1:
+            return (fn(x) for x in items)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.jobs)
+        return self._executor.map(fn, items, chunksize=max(1, chunksize))
+
+    def close(self, wait: bool = True) -> None:
+        """Shut the pool down; wait=False drops queued work instead of finishing it."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=not wait)
+            self._executor = None
+
+    def __enter__(self) -> "WorkerPool":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        # on Ctrl-C or an error mid-run, do not sit through the rest of the backlog
+        self.close(wait=exc_type is None)
@@ -0,0 +1,398 @@
+from __future__ import annotations
+
+from collections.abc import ItemsView, Mapping, MutableMapping, ValuesView
+from pathlib import Path
+from typing import Iterator
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import tempfile
+
+# manifest.bin layout (little endian):
+#   header   MAGIC, version, n_files, n_dirs, n_changelog, then (offset, length)
+#            of the dirs, index, names, blobs, meta and changelog sections
+#   dirs     n_dirs x (u32 length + utf-8), the interned directory prefixes
+#   index    n_files fixed-size _REC records sorted by path (binary search);
+#            a flags byte marks which of mtime_ns/size/inode are present
+#   names    utf-8 file names (the part after the directory prefix)
+#   blobs    per file: summary JSON, then the other entry fields as JSON
+#   meta     JSON of every manifest key except files/changelog (small)
+#   changelog JSON list of changelog rows
+MAGIC = b"DXBM"
+FORMAT_VERSION = 2
+_HEADER = struct.Struct("<4sIIII12Q")
+# dir, name off/len, flags, digest, mtime, mtime_ns, size, inode, summary off/len, extra off/len
+_REC = struct.Struct("<IIHB32sdqQQQIQI")
+_U32 = struct.Struct("<I")
+
+# entry keys held in fixed record fields; anything else goes to the extra blob
+_FIXED = ("sha256", "mtime", "mtime_ns", "size", "inode", "summary")
+_OPTIONAL = ("mtime_ns", "size", "inode")  # flags bit i set: _OPTIONAL[i] is present
+
+
+def _split(sp: str) -> tuple[str, str]:
+    d, _, name = sp.rpartition("/")
+    return d, name
+
+
+class FileRecord(Mapping):
+    """One manifest entry: fixed fields in slots, summary/extra decoded on first use.
+
+    Reads like the plain dict entries of the json/sqlite backends
+    (rec["sha256"] is the hex digest, rec.get("size"), {**rec, ...}), but
+    keeps the digest as 32 raw bytes, shares the directory prefix string
+    with every other record in that directory and leaves the JSON blobs in
+    the memory-mapped file until a key from them is asked for.
+    """
+
+    __slots__ = ("dir", "name", "digest", "mtime", "mtime_ns", "size", "inode", "_blobs", "_summary", "_extra")
+
+    def __init__(
+        self, dir: str, name: str, digest: bytes, mtime: float,
+        mtime_ns: int | None, size: int | None, inode: int | None, blobs,
+    ) -> None:
+        self.dir = dir
+        self.name = name
+        self.digest = digest
+        self.mtime = mtime
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.inode = inode
+        self._blobs = blobs  # (buffer, summary off, len, extra off, len)
+        self._summary = None
+        self._extra = None
+
+    @property
+    def path(self) -> str:
+        return f"{self.dir}/{self.name}" if self.dir else self.name
+
+    def _load_summary(self) -> list:
+        if self._summary is None:
+            buf, off, n, _, _ = self._blobs
+            self._summary = json.loads(bytes(buf[off : off + n]))
+        return self._summary
+
+    def _load_extra(self) -> dict:
+        if self._extra is None:
+            buf, _, _, off, n = self._blobs
+            self._extra = json.loads(bytes(buf[off : off + n])) if n else {}
+        return self._extra
+
+    def __getitem__(self, key: str):
+        if key == "sha256":
+            return self.digest.hex()
+        if key == "mtime":
+            return None if math.isnan(self.mtime) else self.mtime
+        if key in ("mtime_ns", "size", "inode"):
+            v = getattr(self, key)
+            if v is None:
+                raise KeyError(key)
+            return v
+        if key == "summary":
+            return self._load_summary()
+        return self._load_extra()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield "sha256"
+        yield "mtime"
+        for key in ("size", "mtime_ns", "inode"):
+            if getattr(self, key) is not None:
+                yield key
+        yield from self._load_extra()
+        yield "summary"
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"FileRecord({self.path!r}, sha256={self.digest.hex()[:12]}...)"
+
+
+class BinaryFiles(MutableMapping):
+    """manifest["files"] backed by a memory-mapped manifest.bin.
+
+    Lookups binary-search the sorted index; only the records asked for are
+    built. Writes and deletions stay in an overlay until write_manifest(),
+    which copies unchanged records byte for byte.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self._buf = None
+        self._dirs: list[str] = []
+        self._n = 0
+        self._overlay: dict[str, Mapping] = {}
+        self._deleted: set[str] = set()
+        if path is not None:
+            self._open(path)
+
+    def _open(self, path: Path) -> None:
+        with path.open("rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        hdr = read_header(buf)
+        off, _ = hdr["dirs"]
+        dirs = []
+        for _ in range(hdr["n_dirs"]):
+            (n,) = _U32.unpack_from(buf, off)
+            dirs.append(sys.intern(buf[off + 4 : off + 4 + n].decode("utf-8")))
+            off += 4 + n
+        self._buf, self._hdr, self._dirs, self._n = buf, hdr, dirs, hdr["n_files"]
+
+    def rebase(self, path: Path) -> None:
+        """Switch to a freshly written file (which already holds the overlay)."""
+        self._overlay.clear()
+        self._deleted.clear()
+        self._open(path)
+
+    # --- base (on-disk) records ---
+
+    def _rec(self, i: int) -> tuple:
+        """(dir, name off, name len, digest, mtime, mtime_ns, size, inode, summary off, len, extra off, len);
+        missing optional fields are None."""
+        d, name_off, name_len, flags, *rest = _REC.unpack_from(self._buf, self._hdr["index"][0] + i * _REC.size)
+        opt = tuple(v if flags & (1 << k) else None for k, v in enumerate(rest[2:5]))
+        return (d, name_off, name_len, *rest[:2], *opt, *rest[5:])
+
+    def _path_at(self, i: int) -> str:
+        d, name_off, name_len = self._rec(i)[:3]
+        start = self._hdr["names"][0] + name_off
+        name = self._buf[start : start + name_len].decode("utf-8")
+        return f"{self._dirs[d]}/{name}" if self._dirs[d] else name
+
+    def _find(self, sp: str) -> int | None:
+        lo, hi = 0, self._n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._path_at(mid) < sp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < self._n and self._path_at(lo) == sp else None
+
+    def _record(self, i: int) -> FileRecord:
+        d, name_off, name_len, digest, mtime, mtime_ns, size, inode, s_off, s_len, x_off, x_len = self._rec(i)
+        start = self._hdr["names"][0] + name_off
+        blobs = self._hdr["blobs"][0]
+        return FileRecord(
+            self._dirs[d], self._buf[start : start + name_len].decode("utf-8"), digest, mtime, mtime_ns, size, inode,
+            (self._buf, blobs + s_off, s_len, blobs + x_off, x_len),
+        )
+
+    def raw_records(self) -> Iterator[tuple[str, tuple]]:
+        """(path, (digest, mtime, mtime_ns, size, inode, summary bytes, extra bytes))
+        for every on-disk record not changed or deleted since mapping, in path order."""
+        if self._buf is None:
+            return
+        names, blobs = self._hdr["names"][0], self._hdr["blobs"][0]
+        for i in range(self._n):
+            d, name_off, name_len, digest, mtime, mtime_ns, size, inode, s_off, s_len, x_off, x_len = self._rec(i)
+            name = self._buf[names + name_off : names + name_off + name_len].decode("utf-8")
+            sp = f"{self._dirs[d]}/{name}" if self._dirs[d] else name
+            if sp in self._overlay or sp in self._deleted:
+                continue
+            yield sp, (
+                digest, mtime, mtime_ns, size, inode,
+                self._buf[blobs + s_off : blobs + s_off + s_len], self._buf[blobs + x_off : blobs + x_off + x_len],
+            )
+
+    # --- MutableMapping ---
+
+    def __getitem__(self, sp: str) -> Mapping:
+        if sp in self._overlay:
+            return self._overlay[sp]
+        if sp in self._deleted:
+            raise KeyError(sp)
+        i = self._find(sp) if self._buf is not None else None
+        if i is None:
+            raise KeyError(sp)
+        return self._record(i)
+
+    def __setitem__(self, sp: str, entry: Mapping) -> None:
+        self._overlay[sp] = entry
+        self._deleted.discard(sp)
+
+    def __delitem__(self, sp: str) -> None:
+        if sp in self._overlay:
+            del self._overlay[sp]
+            if self._buf is not None and self._find(sp) is not None:
+                self._deleted.add(sp)
+        elif sp not in self._deleted and self._buf is not None and self._find(sp) is not None:
+            self._deleted.add(sp)
+        else:
+            raise KeyError(sp)
+
+    def __contains__(self, sp: object) -> bool:
+        if sp in self._overlay:
+            return True
+        if sp in self._deleted or self._buf is None or not isinstance(sp, str):
+            return False
+        return self._find(sp) is not None
+
+    def _base_paths(self) -> Iterator[str]:
+        for i in range(self._n):
+            yield self._path_at(i)
+
+    def __iter__(self) -> Iterator[str]:
+        for sp in self._base_paths():
+            if sp not in self._deleted and sp not in self._overlay:
+                yield sp
+        yield from self._overlay
+
+    def _iter_items(self) -> Iterator[tuple[str, Mapping]]:
+        # one sequential pass over the index instead of a binary search per key
+        for i in range(self._n):
+            rec = self._record(i)
+            sp = rec.path
+            if sp not in self._deleted and sp not in self._overlay:
+                yield sp, rec
+        yield from self._overlay.items()
+
+    def items(self) -> ItemsView:
+        return _Items(self)
+
+    def values(self) -> ValuesView:
+        return _Values(self)
+
+    def __len__(self) -> int:
+        new = sum(1 for sp in self._overlay if self._buf is None or self._find(sp) is None)
+        return self._n - len(self._deleted) + new
+
+
+class _Items(ItemsView):
+    def __iter__(self):
+        return self._mapping._iter_items()
+
+
+class _Values(ValuesView):
+    def __iter__(self):
+        return (rec for _, rec in self._mapping._iter_items())
+
+
+def read_header(buf) -> dict:
+    magic, version, n_files, n_dirs, n_changelog, *spans = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError("not a docxbrief binary manifest")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"unsupported binary manifest version {version}")
+    names = ("dirs", "index", "names", "blobs", "meta", "changelog")
+    return {
+        "n_files": n_files,
+        "n_dirs": n_dirs,
+        "n_changelog": n_changelog,
+        **{k: (spans[2 * i], spans[2 * i + 1]) for i, k in enumerate(names)},
+    }
+
+
+def read_overview(path: Path) -> dict:
+    """Header counts + the meta section, without touching files or changelog."""
+    with path.open("rb") as f:
+        hdr = read_header(f.read(_HEADER.size))
+        off, n = hdr["meta"]
+        f.seek(off)
+        meta = json.loads(f.read(n))
+    return {**meta, "n_files": hdr["n_files"], "n_changelog": hdr["n_changelog"]}
+
+
+def load_binary(path: Path) -> dict:
+    files = BinaryFiles(path)
+    buf, hdr = files._buf, files._hdr
+    meta = json.loads(bytes(buf[hdr["meta"][0] : hdr["meta"][0] + hdr["meta"][1]]))
+    changelog = json.loads(bytes(buf[hdr["changelog"][0] : hdr["changelog"][0] + hdr["changelog"][1]]))
+    return {**meta, "files": files, "changelog": changelog}
+
+
+def _encode(sp: str, entry: Mapping) -> tuple:
+    sha = entry.get("sha256", "")
+    try:
+        digest = bytes.fromhex(sha)
+    except ValueError:
+        digest = b""
+    if len(digest) != 32:
+        raise ValueError(f"{sp}: sha256 must be 64 hex digits, got {sha!r}")
+    mtime = entry.get("mtime")
+    extra = {k: v for k, v in entry.items() if k not in _FIXED}
+    return (
+        digest,
+        float("nan") if mtime is None else float(mtime),
+        *(None if entry.get(k) is None else int(entry[k]) for k in _OPTIONAL),
+        json.dumps(list(entry.get("summary", [])), ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        json.dumps(extra, ensure_ascii=False, separators=(",", ":")).encode("utf-8") if extra else b"",
+    )
+
+
+def write_manifest(path: Path, manifest: dict) -> None:
+    """Write manifest.bin atomically (temp file + fsync + rename).
+
+    Records that were not touched since the file was mapped are copied as
+    raw bytes; only new/changed entries are encoded.
+    """
+    files = manifest.get("files", {})
+    if isinstance(files, BinaryFiles):
+        records = list(files.raw_records()) + [(sp, _encode(sp, e)) for sp, e in files._overlay.items()]
+    else:
+        records = [(sp, _encode(sp, e)) for sp, e in files.items()]
+    records.sort(key=lambda r: r[0])  # mostly sorted already
+
+    dirs: dict[str, int] = {}
+    index = bytearray()
+    names = bytearray()
+    blobs = bytearray()
+    for sp, rec in records:
+        digest, mtime, mtime_ns, size, inode, summary, extra = rec
+        d, name = _split(sp)
+        name_b = name.encode("utf-8")
+        s_off = len(blobs)
+        blobs += summary
+        x_off = len(blobs)
+        blobs += extra
+        opt = (mtime_ns, size, inode)
+        flags = sum(1 << k for k, v in enumerate(opt) if v is not None)
+        index += _REC.pack(
+            dirs.setdefault(d, len(dirs)), len(names), len(name_b), flags, digest, mtime,
+            *(0 if v is None else v for v in opt), s_off, len(summary), x_off, len(extra),
+        )
+        names += name_b
+
+    dir_bytes = bytearray()
+    for d in dirs:
+        b = d.encode("utf-8")
+        dir_bytes += _U32.pack(len(b)) + b
+    meta = {k: v for k, v in manifest.items() if k not in ("files", "changelog")}
+    meta_b = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+    changelog = manifest.get("changelog", [])
+    changelog_b = json.dumps(changelog, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    sections = [dir_bytes, index, names, blobs, meta_b, changelog_b]
+    spans: list[int] = []
+    off = _HEADER.size
+    for sec in sections:
+        spans += [off, len(sec)]
+        off += len(sec)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(records), len(dirs), len(changelog), *spans))
+            for sec in sections:
+                f.write(sec)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, mode)  # mkstemp creates 0600
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+    if isinstance(files, BinaryFiles):
+        files.rebase(path)
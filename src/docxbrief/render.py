@@ -1,49 +1,245 @@
 from __future__ import annotations
 
 from pathlib import Path
+from string import Formatter
+from typing import Iterable, Iterator
 import datetime
+import functools
+import hashlib
+import os
+import tempfile
 from .config import Config
+from .changelog import changelog_settings, list_segments, read_segment, recent_rows
+
+TEMPLATE_PATH = Path(__file__).resolve().parent.parent.parent / "templates" / "summary.adoc"
+
+# path -> (manifest entry key, table row, summary section). Only kept in the
+# long-running watch process (keep_fragments()), where it survives across
+# renders so only changed files re-render; one-shot commands render everything once.
+_FRAGMENTS: dict[str, tuple[tuple, str, str]] | None = None
+
+
+def keep_fragments() -> None:
+    """Cache rendered rows/sections in memory from now on (for `docxbrief watch`)."""
+    global _FRAGMENTS
+    if _FRAGMENTS is None:
+        _FRAGMENTS = {}
 
 
 def _iso_from_mtime(mtime: float) -> str:
     return datetime.datetime.fromtimestamp(mtime).isoformat(timespec="seconds")
 
 
-def render_summary(cfg: Config, files, summaries: dict[str, list[str]], manifest: dict) -> None:
-    tpl_path = Path(__file__).resolve().parent.parent.parent / "templates" / "summary.adoc"
-    tpl = tpl_path.read_text(encoding="utf-8")
+@functools.lru_cache(maxsize=8)
+def _parsed_template(path: str, mtime_ns: int) -> tuple[tuple[str, str | None, str, str | None], ...]:
+    tpl = Path(path).read_text(encoding="utf-8")
+    return tuple(Formatter().parse(tpl))
 
-    # file table rows in scan order
-    file_table_rows = []
-    for p in files:
-        sp = str(p)
-        info = manifest.get("files", {}).get(sp, {})
-        sha = info.get("sha256", "")
-        mtime = info.get("mtime", p.stat().st_mtime)
-        file_table_rows.append(f"| {sp} | {_iso_from_mtime(mtime)} | {sha}")
-    file_table_rows_s = "\n".join(file_table_rows)
-
-    # summaries section in scan order
-    parts = []
+
+def _template(path: Path = TEMPLATE_PATH):
+    return _parsed_template(str(path), path.stat().st_mtime_ns)
+
+
+def _fragments(sp: str, info: dict, bullets: list[str], p: Path, copies: tuple[str, ...] = ()) -> tuple[str, str]:
+    key = (info.get("sha256", ""), info.get("mtime"), tuple(bullets), copies)
+    hit = _FRAGMENTS.get(sp) if _FRAGMENTS is not None else None
+    if hit is not None and hit[0] == key:
+        return hit[1], hit[2]
+    mtime = info.get("mtime")
+    if mtime is None:
+        mtime = p.stat().st_mtime
+    row = f"| {sp} | {_iso_from_mtime(mtime)} | {info.get('sha256', '')}"
+    head = [f"=== {sp}"]
+    if copies:
+        head += ["Identical copies: " + ", ".join(copies), ""]
+    section = "\n".join([*head, *(f"* {b}" for b in bullets)])
+    if _FRAGMENTS is not None:
+        _FRAGMENTS[sp] = (key, row, section)
+    return row, section
+
+
+def _write_template(f, segments, values: dict[str, str | tuple[Iterable[str], str]]) -> None:
+    """Stream str.format()-equivalent output; list values are written piecewise."""
+    for literal, field, spec, conv in segments:
+        f.write(literal)
+        if field is None:
+            continue
+        v = values[field]
+        if isinstance(v, tuple):
+            pieces, sep = v
+            if not spec and not conv:
+                for i, piece in enumerate(pieces):
+                    if i:
+                        f.write(sep)
+                    f.write(piece)
+                continue
+            v = sep.join(pieces)
+        if conv:
+            v = {"r": repr, "s": str, "a": ascii}[conv](v)
+        f.write(format(v, spec))
+
+
+def write_atomic(path: Path, write) -> None:
+    """Write via a temp file in the same directory + rename: readers never see partial output."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            write(f)
+        os.chmod(tmp, mode)  # mkstemp creates 0600
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _changelog_row(ch: dict) -> str:
+    return f"| {ch.get('date','')} | {ch.get('target','')} | {ch.get('message','')}"
+
+
+def archive_dir(cfg: Config) -> Path:
+    """Rendered changelog segments, next to the output (summary-changelog/)."""
+    out = cfg.output_adoc
+    return out.parent / f"{out.stem}-changelog"
+
+
+def _archive_includes(cfg: Config) -> Iterator[str]:
+    """include:: lines for every archived segment, rendering missing/stale pages."""
+    root = archive_dir(cfg)
+    for _, _, seg in list_segments(cfg):
+        page = root / (seg.name[: -len(".jsonl.gz")] + ".adoc")
+        try:
+            fresh = page.stat().st_mtime_ns >= seg.stat().st_mtime_ns
+        except FileNotFoundError:
+            fresh = False
+        if not fresh:
+            write_atomic(page, lambda f: f.writelines(_changelog_row(ch) + "\n" for ch in read_segment(seg)))
+        yield f"include::{root.name}/{page.name}[]"
+
+
+def output_layout(cfg: Config) -> dict:
+    out = cfg.raw.get("output", {})
+    s = {
+        "layout": str(out.get("layout", "single")).strip().lower(),
+        "shard_by": str(out.get("shard_by", "directory")).strip().lower(),
+        "shard_files": max(1, int(out.get("shard_files", 200))),
+    }
+    if s["layout"] not in ("single", "sharded"):
+        raise ValueError(f"unknown output.layout: {s['layout']!r} (expected single|sharded)")
+    if s["shard_by"] not in ("directory", "count"):
+        raise ValueError(f"unknown output.shard_by: {s['shard_by']!r} (expected directory|count)")
+    return s
+
+
+def shard_dir(cfg: Config) -> Path:
+    """Per-shard fragments of the sharded layout, next to the output (summary-shards/)."""
+    out = cfg.output_adoc
+    return out.parent / f"{out.stem}-shards"
+
+
+def _shard_name(cfg: Config, p: Path) -> str:
+    """Fragment name of p's directory: components joined by "--" after
+    percent-encoding "%" and "-", so no two directories share a name;
+    the input root is "%root", which no encoded path can produce."""
+    try:
+        rel = p.parent.relative_to(cfg.input_dir)
+    except ValueError:
+        rel = p.parent
+    if rel == Path("."):
+        return "%root"
+    parts = rel.as_posix().strip("/").split("/")
+    return "--".join(part.replace("%", "%25").replace("-", "%2D") for part in parts)
+
+
+def _write_shards(cfg: Config, shards: dict[str, tuple[list[str], list[str]]]) -> None:
+    """One fragment per shard (tagged rows + summaries).
+
+    The first line holds a hash of the content, so unchanged shards are
+    recognised by reading one line and are left alone; shards that no
+    longer exist are removed.
+    """
+    root = shard_dir(cfg)
+    for name, (rows, sections) in shards.items():
+        body = "\n".join(["// tag::rows[]", *rows, "// end::rows[]", "", "// tag::summaries[]", "\n\n".join(sections), "// end::summaries[]", ""])
+        head = f"// docxbrief-shard {hashlib.sha256(body.encode('utf-8')).hexdigest()[:16]}\n"
+        page = root / f"{name}.adoc"
+        try:
+            with page.open(encoding="utf-8") as f:
+                if f.readline() == head:
+                    continue
+        except FileNotFoundError:
+            pass
+        write_atomic(page, lambda f: (f.write(head), f.write(body)))
+    if root.exists():
+        for e in os.scandir(root):
+            if e.name.endswith(".adoc") and e.name[: -len(".adoc")] not in shards:
+                os.unlink(e.path)
+
+
+def _duplicate_paths(files, entries) -> dict[str, list[str]]:
+    """First path of each sha256 with 2+ scanned paths -> all of its paths (scan order)."""
+    groups: dict[str, list[str]] = {}
     for p in files:
+        sha = entries.get(str(p), {}).get("sha256")
+        if sha:
+            groups.setdefault(sha, []).append(str(p))
+    return {paths[0]: paths for paths in groups.values() if len(paths) > 1}
+
+
+def render_summary(cfg: Config, files, summaries: dict[str, list[str]], manifest: dict) -> None:
+    entries = manifest.get("files", {})
+    layout = output_layout(cfg)
+    # output.collapse_duplicates: one summary section per content, listing every path
+    dups = _duplicate_paths(files, entries) if cfg.raw.get("output", {}).get("collapse_duplicates", False) else {}
+    collapsed = {sp for paths in dups.values() for sp in paths[1:]}
+    rows: list[str] = []
+    sections: list[str] = []
+    shards: dict[str, tuple[list[str], list[str]]] = {}
+    # file table rows and summary sections in scan order (grouped by shard when sharded)
+    for i, p in enumerate(files):
         sp = str(p)
-        parts.append(f"=== {sp}")
-        for b in summaries.get(sp, []):
-            parts.append(f"* {b}")
-        parts.append("")
-    file_summaries = "\n".join(parts).strip()
-
-    # changelog rows
-    rows = []
-    for ch in manifest.get("changelog", []):
-        rows.append(f"| {ch.get('date','')} | {ch.get('target','')} | {ch.get('message','')}")
-    changelog_rows = "\n".join(rows)
-
-    out = tpl.format(
-        project_name=cfg.project.get("name", "DocxBrief"),
-        project_description=cfg.project.get("description", ""),
-        file_table_rows=file_table_rows_s,
-        file_summaries=file_summaries,
-        changelog_rows=changelog_rows,
-    )
-    cfg.output_adoc.write_text(out, encoding="utf-8")
+        row, section = _fragments(sp, entries.get(sp, {}), summaries.get(sp, []), p, tuple(dups.get(sp, ())[1:]))
+        if layout["layout"] == "sharded":
+            name = _shard_name(cfg, p) if layout["shard_by"] == "directory" else f"part-{i // layout['shard_files'] + 1:04d}"
+            shard = shards.setdefault(name, ([], []))
+            shard[0].append(row)
+            if sp not in collapsed:
+                shard[1].append(section)
+        else:
+            rows.append(row)
+            if sp not in collapsed:
+                sections.append(section)
+    if layout["layout"] == "sharded":
+        _write_shards(cfg, shards)
+        # the index stays small: include:: lines per shard plus the changelog
+        rows = [f"include::{shard_dir(cfg).name}/{name}.adoc[tag=rows]" for name in shards]
+        sections = [f"include::{shard_dir(cfg).name}/{name}.adoc[tag=summaries]" for name in shards]
+
+    def changelog_rows() -> Iterator[str]:
+        # recent: the keep window only; archive: every segment via include::, then all inline rows
+        if changelog_settings(cfg)["render"] == "archive":
+            yield from _archive_includes(cfg)
+            inline = manifest.get("changelog", [])
+        else:
+            inline = recent_rows(cfg, manifest)
+        for ch in inline:
+            yield _changelog_row(ch)
+
+    values = {
+        "project_name": cfg.project.get("name", "DocxBrief"),
+        "project_description": cfg.project.get("description", ""),
+        "file_table_rows": (rows, "\n"),
+        "file_summaries": (sections, "\n\n"),
+        "changelog_rows": (changelog_rows(), "\n"),
+    }
+    segments = _template()
+    write_atomic(cfg.output_adoc, lambda f: _write_template(f, segments, values))
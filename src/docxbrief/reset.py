@@ -3,6 +3,7 @@ from __future__ import annotations
 import shutil
 
 from .config import Config
+from .render import archive_dir, shard_dir
 
 
 def reset_project(cfg: Config, *, remove_summary: bool = False, remove_state: bool = True) -> None:
@@ -11,7 +12,7 @@ def reset_project(cfg: Config, *, remove_summary: bool = False, remove_state: bo
     This exists to avoid "stale changelog" issues when users swap the input docs set.
 
     - remove_state=True: delete cfg.state_dir (manifest, caches, logs)
-    - remove_summary=True: also delete cfg.output_adoc (generated output)
+    - remove_summary=True: also delete cfg.output_adoc, its shards and its rendered changelog archive
     """
     if remove_state and cfg.state_dir.exists():
         shutil.rmtree(cfg.state_dir)
@@ -20,3 +21,6 @@ def reset_project(cfg: Config, *, remove_summary: bool = False, remove_state: bo
         out = cfg.output_adoc
         if out.exists():
             out.unlink()
+        for d in (shard_dir(cfg), archive_dir(cfg)):
+            if d.exists():
+                shutil.rmtree(d)
@@ -1,41 +1,197 @@
 from __future__ import annotations
 
 from pathlib import Path
+import fnmatch
+import os
 import re
-from typing import Iterable
+from typing import Callable, Iterable
 
 from .config import Config
 
+_FLAGS = re.IGNORECASE if os.name == "nt" else 0
 
-def _glob_paths(input_dir: Path, patterns: list[str]) -> list[Path]:
-    paths: list[Path] = []
-    for pat in patterns:
-        paths.extend(input_dir.glob(pat))
-    # unique + sort
-    uniq = sorted({p for p in paths if p.is_file()})
-    return uniq
 
+class _Glob:
+    """One pathlib-style glob compiled into per-segment matchers.
 
-def scan_files(cfg: Config) -> list[Path]:
-    input_dir = cfg.input_dir
+    Matching is run as a small NFA over path segments: a state is the index
+    of the next pattern segment. Semantics follow Path.glob() on Python 3.11:
+    `**` spans zero or more real directories (symlinked dirs are not
+    recursed), other segments follow symlinks, `*` also matches dotfiles.
+    """
+
+    def __init__(self, pattern: str) -> None:
+        if not pattern:
+            raise ValueError(f"Unacceptable pattern: {pattern!r}")
+        p = Path(pattern)
+        if p.anchor:
+            raise NotImplementedError("Non-relative patterns are unsupported")
+        self.raw: list[str] = []
+        self.segs: list[Callable[[str], object] | None] = []
+        for part in p.parts:
+            if part == "**":
+                if self.raw and self.raw[-1] == "**":
+                    continue
+                self.raw.append(part)
+                self.segs.append(None)
+            elif "**" in part:
+                raise ValueError("Invalid pattern: '**' can only be an entire path component")
+            else:
+                self.raw.append(part)
+                self.segs.append(re.compile(fnmatch.translate(part), _FLAGS).fullmatch)
+        n = len(self.segs)
+        # from state j, no further directory segment can follow a symlink
+        self.recursive_tail = [all(s is None for s in self.segs[j : n - 1]) for j in range(n + 1)]
+        # from state j, every file below (via real dirs) matches: remaining is `**/*`
+        self.matches_all = [self.raw[j:] == ["**", "*"] for j in range(n + 1)]
+
+    def closure(self, states: Iterable[int]) -> frozenset[int]:
+        out = set(states)
+        todo = list(out)
+        while todo:
+            i = todo.pop()
+            if i < len(self.segs) and self.segs[i] is None and i + 1 not in out:
+                out.add(i + 1)
+                todo.append(i + 1)
+        return frozenset(out)
+
+    def enter(self, states: frozenset[int], name: str, is_real_dir: bool, is_dir: bool) -> frozenset[int]:
+        n = len(self.segs)
+        nxt = set()
+        for i in states:
+            if i >= n:
+                continue
+            seg = self.segs[i]
+            if seg is None:
+                if is_real_dir:
+                    nxt.add(i)
+            elif i < n - 1 and is_dir and seg(name):
+                nxt.add(i + 1)
+        return self.closure(nxt) if nxt else frozenset()
+
+    def match_file(self, states: frozenset[int], name: str) -> bool:
+        last = len(self.segs) - 1
+        seg = self.segs[last]
+        return last in states and seg is not None and bool(seg(name))
+
+
+def _compile(cfg: Config) -> tuple[list[_Glob], list[_Glob], list[re.Pattern]]:
     scan_cfg = cfg.raw.get("scan", {})
-    include = scan_cfg.get("include_glob", ["**/*.docx"])
-    exclude = scan_cfg.get("exclude_glob", [])
-
-    files = _glob_paths(input_dir, include)
-
-    # Exclude globs
-    excl_set: set[Path] = set()
-    for pat in exclude:
-        excl_set.update({p for p in input_dir.glob(pat) if p.is_file()})
-    files = [p for p in files if p not in excl_set]
-
-    # filename regex filters
-    filt = cfg.raw.get("filter", {})
-    regexes = filt.get("filename_regex", []) or []
-    if regexes:
-        comp = [re.compile(r) for r in regexes]
-        files = [p for p in files if any(r.search(p.name) for r in comp)]
-
-    max_files = int(filt.get("max_files", 200))
-    return files[:max_files]
+    include = [_Glob(p) for p in scan_cfg.get("include_glob", ["**/*.docx"])]
+    exclude = [_Glob(p) for p in scan_cfg.get("exclude_glob", [])]
+    regexes = [re.compile(r) for r in (cfg.raw.get("filter", {}).get("filename_regex", []) or [])]
+    return include, exclude, regexes
+
+
+def _scan(cfg: Config) -> list[tuple[Path, os.stat_result]]:
+    input_dir = cfg.input_dir
+    include, exclude, regexes = _compile(cfg)
+    max_files = int(cfg.raw.get("filter", {}).get("max_files", 200))
+
+    out: list[tuple[Path, os.stat_result]] = []
+
+    def full() -> bool:
+        return 0 <= max_files <= len(out)
+
+    def walk(dir_path: str, inc: list[frozenset[int]], exc: list[frozenset[int]]) -> bool:
+        """Depth-first walk in sorted name order == sorted(Path) order; True once full."""
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            return False
+
+        # Whole subtree excluded by a `.../**/*` pattern and no include can reach
+        # outside it via symlinks: skip it without listing further.
+        for g, st in zip(exclude, exc):
+            if any(g.matches_all[j] for j in st):
+                if all(all(g2.recursive_tail[j] for j in st2) for g2, st2 in zip(include, inc)):
+                    return False
+
+        for e in entries:
+            try:
+                is_dir = e.is_dir()
+                is_real_dir = is_dir and not e.is_symlink()
+            except OSError:
+                is_dir = is_real_dir = False
+            if is_dir:
+                sub_inc = [g.enter(st, e.name, is_real_dir, True) for g, st in zip(include, inc)]
+                if not any(sub_inc):
+                    continue
+                sub_exc = [g.enter(st, e.name, is_real_dir, True) for g, st in zip(exclude, exc)]
+                if walk(e.path, sub_inc, sub_exc):
+                    return True
+                continue
+            if not any(g.match_file(st, e.name) for g, st in zip(include, inc)):
+                continue
+            if any(g.match_file(st, e.name) for g, st in zip(exclude, exc)):
+                continue
+            if regexes and not any(r.search(e.name) for r in regexes):
+                continue
+            try:
+                if not e.is_file():
+                    continue
+                st = e.stat()
+            except OSError:
+                continue
+            out.append((Path(e.path), st))
+            if full():
+                return True
+        return False
+
+    if not full():
+        walk(
+            str(input_dir),
+            [g.closure([0]) for g in include],
+            [g.closure([0]) for g in exclude],
+        )
+    return out if max_files >= 0 else out[:max_files]
+
+
+def path_matcher(cfg: Config) -> Callable[[Path], bool]:
+    """Compile the scan filters once; the returned predicate tells whether one
+    existing path would be selected by scan_files() (ignoring max_files)."""
+    input_dir = cfg.input_dir
+    include, exclude, regexes = _compile(cfg)
+
+    def matches(path: Path) -> bool:
+        try:
+            rel = Path(path).relative_to(input_dir)
+        except ValueError:
+            return False
+        if not rel.parts:
+            return False
+        inc = [g.closure([0]) for g in include]
+        exc = [g.closure([0]) for g in exclude]
+        cur = input_dir
+        for part in rel.parts[:-1]:
+            cur = cur / part
+            is_dir = cur.is_dir()
+            is_real_dir = is_dir and not cur.is_symlink()
+            inc = [g.enter(st, part, is_real_dir, is_dir) for g, st in zip(include, inc)]
+            exc = [g.enter(st, part, is_real_dir, is_dir) for g, st in zip(exclude, exc)]
+        name = rel.parts[-1]
+        if not any(g.match_file(st, name) for g, st in zip(include, inc)):
+            return False
+        if any(g.match_file(st, name) for g, st in zip(exclude, exc)):
+            return False
+        if regexes and not any(r.search(name) for r in regexes):
+            return False
+        return Path(path).is_file()
+
+    return matches
+
+
+def scan_entries(cfg: Config) -> list[tuple[Path, os.stat_result]]:
+    """Like scan_files(), but also returns the stat result captured during the walk."""
+    return _scan(cfg)
+
+
+def scan_files(cfg: Config) -> list[Path]:
+    """Matched files, sorted, after include/exclude globs, filename regex and max_files.
+
+    Single os.scandir walk: all globs are evaluated together, directories that
+    no include pattern can match (or that an exclude `**/*` covers) are not
+    entered, and the walk stops once max_files paths are collected.
+    """
+    return [p for p, _ in _scan(cfg)]
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Sequence
+import datetime
+import hashlib
+import json
+
+from .config import Config
+from .scan import scan_entries
+from .state import load_manifest, save_manifest, ensure_state, set_file_entry, drop_file_entry
+from .build import _append_changelog, _process_changed, _stat_fields, stage_settings
+from .changelog import rotate_changelog
+from .render import render_summary, write_atomic
+from .metrics import RunMetrics
+from .dedup import dedup_enabled, share_duplicates, summaries, with_shared
+
+
+def parse_shard(spec: str) -> tuple[int, int]:
+    """'2/4' -> (2, 4); shards are numbered 1..N."""
+    i, sep, n = spec.partition("/")
+    if not sep or not i.strip().isdigit() or not n.strip().isdigit():
+        raise ValueError(f"invalid shard {spec!r} (expected i/N, e.g. 1/4)")
+    i, n = int(i), int(n)
+    if not 1 <= i <= n:
+        raise ValueError(f"invalid shard {spec!r}: i must be in 1..{n}")
+    return i, n
+
+
+def shard_of(path: Path, n: int) -> int:
+    """Stable shard number (1..n) of a scanned path: same on every machine and run."""
+    h = hashlib.sha256(path.as_posix().encode("utf-8")).digest()
+    return int.from_bytes(h[:8], "big") % n + 1
+
+
+def partial_dir(cfg: Config) -> Path:
+    return cfg.state_dir / "partial"
+
+
+def partial_path(cfg: Config, i: int, n: int) -> Path:
+    return partial_dir(cfg) / f"shard-{i:03d}-of-{n:03d}.json"
+
+
+def build_shard(
+    cfg: Config, i: int, n: int, force: bool = False, jobs: int | None = None, retry_failed: bool = False
+) -> Path:
+    """Process shard i of n of the scanned files into a partial manifest.
+
+    The canonical manifest is only read (previous entries, stat fields);
+    nothing under the state dir but the partial file is written, so all N
+    shards can run at once against the same project.
+    """
+    ensure_state(cfg)
+    metrics = RunMetrics("shard")
+    with metrics.phase("scan"):
+        scanned = scan_entries(cfg)
+    mine = [(p, st) for p, st in scanned if shard_of(p, n) == i]
+    with metrics.phase("load"):
+        canonical = load_manifest(cfg)
+    # partials are self-contained: shared content is inlined (merge shares it again)
+    manifest = {
+        key: {str(p): dict(with_shared(canonical, canonical[key][str(p)])) for p, _ in mine if str(p) in canonical.get(key, {})}
+        for key in ("files", "failed")
+    }
+
+    n_processed = 0
+    with metrics.phase("process"):
+        files, stats = [p for p, _ in mine], [st for _, st in mine]
+        for p, sha, st, bullets, extra in _process_changed(
+            cfg, files, stats, manifest, force, jobs, metrics, persist=False, retry_failed=retry_failed
+        ):
+            n_processed += 1
+            extra.pop("section_changes", None)
+            extra.pop("text_diff", None)
+            extra.pop("reprocess", None)
+            manifest["files"][str(p)] = {
+                "sha256": sha,
+                "mtime": st.st_mtime,
+                **_stat_fields(st),
+                **extra,
+                "summary": bullets,
+            }
+
+    partial = {
+        "version": 1,
+        "shard": [i, n],
+        "scanned": len(scanned),
+        "generated_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "files": manifest["files"],
+        "failed": manifest.get("failed", {}),
+    }
+    out = partial_path(cfg, i, n)
+    with metrics.phase("save"):
+        write_atomic(out, lambda f: json.dump(partial, f, ensure_ascii=False, indent=2))
+    metrics.finish(cfg, scanned=len(mine), processed=n_processed, failed=len(partial["failed"]), shard=f"{i}/{n}")
+    print(f"Shard {i}/{n}: {len(mine)} of {len(scanned)} file(s), {n_processed} processed, {len(partial['failed'])} failed -> {out}")
+    return out
+
+
+def _load_partials(paths: Sequence[Path]) -> list[dict]:
+    partials = [json.loads(p.read_text(encoding="utf-8")) for p in paths]
+    if not partials:
+        raise ValueError("no partial manifests to merge (run build --shard i/N first)")
+    counts = {tuple(pm.get("shard", ()))[1:] for pm in partials}
+    if len(counts) != 1:
+        raise ValueError("partial manifests come from different shard counts")
+    n = partials[0]["shard"][1]
+    got = sorted(pm["shard"][0] for pm in partials)
+    if got != list(range(1, n + 1)):
+        missing = sorted(set(range(1, n + 1)) - set(got))
+        dup = sorted({k for k in got if got.count(k) > 1})
+        raise ValueError(f"incomplete shard set of {n}: missing {missing or '-'}, duplicated {dup or '-'}")
+    if len({pm.get("scanned") for pm in partials}) != 1:
+        raise ValueError("partial manifests were built from different scans")
+    total = sum(len(pm["files"]) + len(set(pm.get("failed", {})) - set(pm["files"])) for pm in partials)
+    if total != partials[0]["scanned"]:
+        raise ValueError(f"partial manifests cover {total} file(s), but the scan had {partials[0]['scanned']}")
+    for pm in partials:
+        for sp in pm["files"]:
+            if shard_of(Path(sp), n) != pm["shard"][0]:
+                raise ValueError(f"{sp} does not belong to shard {pm['shard'][0]}/{n}")
+    return partials
+
+
+def merge_partials(cfg: Config, paths: Sequence[Path] | None = None, keep: bool = False) -> bool:
+    """Combine partial manifests into the canonical manifest and render once.
+
+    Applies exactly what build_summary does after processing (stale entries
+    dropped, the initial-build changelog row, rotation, save, render), so the
+    result matches a single-node build of the same files. Partials from the
+    default directory are removed after a successful merge unless keep=True.
+    """
+    ensure_state(cfg)
+    metrics = RunMetrics("merge")
+    default = paths is None
+    if default:
+        paths = sorted(partial_dir(cfg).glob("shard-*.json")) if partial_dir(cfg).exists() else []
+    with metrics.phase("load"):
+        partials = _load_partials(paths)
+        manifest = load_manifest(cfg)
+    is_first_build = not manifest.get("files")
+
+    merged: dict[str, dict] = {}
+    failed: dict[str, dict] = {}
+    for pm in partials:
+        merged.update(pm["files"])
+        failed.update(pm.get("failed", {}))
+    files = sorted(Path(sp) for sp in merged)  # == scan order
+    with metrics.phase("process"):
+        for p in files:
+            set_file_entry(cfg, manifest, str(p), merged[str(p)])
+        to_remove = [k for k in manifest.get("files", {}) if k not in merged]
+        for k in to_remove:
+            drop_file_entry(cfg, manifest, k)
+    manifest.pop("checkpoint", None)
+    if failed:
+        manifest["failed"] = failed
+    else:
+        manifest.pop("failed", None)
+
+    manifest["generated_at"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    manifest["settings"] = stage_settings(cfg)
+    if is_first_build:
+        _append_changelog(manifest, "(all)", f"Initial build: {len(files)} file(s) processed.")
+
+    with metrics.phase("save"):
+        rotated = rotate_changelog(cfg, manifest)
+        if dedup_enabled(cfg):
+            share_duplicates(cfg, manifest)  # every entry was just replaced: regroup all of them
+        save_manifest(cfg, manifest)
+    with metrics.phase("render"):
+        render_summary(cfg, files, summaries(manifest), manifest)
+    if default and not keep:
+        for p in paths:
+            p.unlink()
+    metrics.finish(cfg, scanned=len(files), processed=0, removed=len(to_remove), rotated=rotated, shards=len(partials))
+    print(f"Merged {len(partials)} shard(s): {len(files)} file(s), {len(to_remove)} removed -> {cfg.output_adoc}")
+    return True
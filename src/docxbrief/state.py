@@ -4,8 +4,41 @@ from pathlib import Path
 import json
 import hashlib
 import datetime
+import os
+import sqlite3
+import tempfile
 
 from .config import Config
+from .records import BinaryFiles, load_binary, read_overview, write_manifest
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    mtime REAL,
+    extra TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS files_sha256 ON files(sha256);
+CREATE TABLE IF NOT EXISTS summaries (
+    path TEXT PRIMARY KEY REFERENCES files(path) ON DELETE CASCADE,
+    bullets TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS changelog (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL,
+    target TEXT NOT NULL,
+    message TEXT NOT NULL,
+    extra TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS changelog_target ON changelog(target);
+"""
+
+# Manifest keys kept as JSON documents in the sqlite meta table
+_JSON_META = ("failed", "checkpoint", "shared", "settings")
+
+# Open sqlite connections, one per database file (main process only)
+_CONNECTIONS: dict[str, sqlite3.Connection] = {}
 
 
 def ensure_state(cfg: Config) -> None:
@@ -21,22 +54,242 @@ def sha256_file(path: Path) -> str:
     return h.hexdigest()
 
 
+def state_backend(cfg: Config) -> str:
+    backend = str(cfg.raw.get("state", {}).get("backend", "json")).strip().lower()
+    if backend not in ("json", "sqlite", "binary"):
+        raise ValueError(f"unknown state.backend: {backend!r} (expected json|sqlite|binary)")
+    return backend
+
+
+def _empty_manifest() -> dict:
+    return {"version": 1, "generated_at": "", "files": {}, "changelog": []}
+
+
+def _sqlite(cfg: Config) -> sqlite3.Connection:
+    db = cfg.state_dir / "manifest.db"
+    key = str(db.resolve())
+    conn = _CONNECTIONS.get(key)
+    if conn is not None:
+        return conn
+    ensure_state(cfg)
+    conn = sqlite3.connect(db)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(_SCHEMA)
+    _CONNECTIONS[key] = conn
+    if conn.execute("SELECT 1 FROM meta WHERE key = 'version'").fetchone() is None:
+        _migrate_json(cfg, conn)
+    return conn
+
+
+def _migrate_json(cfg: Config, conn: sqlite3.Connection) -> None:
+    """One-shot import of an existing manifest.json into a fresh manifest.db."""
+    p = cfg.state_dir / "manifest.json"
+    manifest = json.loads(p.read_text(encoding="utf-8")) if p.exists() else _empty_manifest()
+    with conn:
+        for sp, entry in manifest.get("files", {}).items():
+            _upsert_file(conn, sp, entry)
+        _insert_changelog(conn, manifest.get("changelog", []))
+        _write_meta(conn, manifest)
+
+
+def _upsert_file(conn: sqlite3.Connection, sp: str, entry: dict) -> None:
+    extra = {k: v for k, v in entry.items() if k not in ("sha256", "mtime", "summary")}
+    conn.execute(
+        "INSERT INTO files (path, sha256, mtime, extra) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(path) DO UPDATE SET sha256 = excluded.sha256, mtime = excluded.mtime, extra = excluded.extra",
+        (sp, entry.get("sha256", ""), entry.get("mtime"), json.dumps(extra, ensure_ascii=False)),
+    )
+    conn.execute(
+        "INSERT INTO summaries (path, bullets) VALUES (?, ?) "
+        "ON CONFLICT(path) DO UPDATE SET bullets = excluded.bullets",
+        (sp, json.dumps(entry.get("summary", []), ensure_ascii=False)),
+    )
+
+
+def _insert_changelog(conn: sqlite3.Connection, rows: list[dict]) -> None:
+    conn.executemany(
+        "INSERT INTO changelog (date, target, message, extra) VALUES (?, ?, ?, ?)",
+        [
+            (
+                r.get("date", ""),
+                r.get("target", ""),
+                r.get("message", ""),
+                json.dumps({k: v for k, v in r.items() if k not in ("date", "target", "message")}, ensure_ascii=False),
+            )
+            for r in rows
+        ],
+    )
+
+
+def _write_meta(conn: sqlite3.Connection, manifest: dict) -> None:
+    conn.executemany(
+        "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+        [
+            ("version", str(manifest.get("version", 1))),
+            ("generated_at", manifest.get("generated_at", "")),
+            ("changelog_archived", str(manifest.get("changelog_archived", 0))),
+        ],
+    )
+    for key in _JSON_META:
+        if manifest.get(key):
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(manifest[key], ensure_ascii=False)))
+        else:
+            conn.execute("DELETE FROM meta WHERE key = ?", (key,))
+
+
+def _load_sqlite(cfg: Config) -> dict:
+    conn = _sqlite(cfg)
+    meta = dict(conn.execute("SELECT key, value FROM meta"))
+    manifest = _empty_manifest()
+    manifest["version"] = int(meta.get("version", 1))
+    manifest["generated_at"] = meta.get("generated_at", "")
+    if int(meta.get("changelog_archived", 0)):
+        manifest["changelog_archived"] = int(meta["changelog_archived"])
+    for key in _JSON_META:
+        if key in meta:
+            manifest[key] = json.loads(meta[key])
+    rows = conn.execute(
+        "SELECT f.path, f.sha256, f.mtime, f.extra, s.bullets "
+        "FROM files f LEFT JOIN summaries s ON s.path = f.path ORDER BY f.path"
+    )
+    for sp, sha, mtime, extra, bullets in rows:
+        manifest["files"][sp] = {
+            "sha256": sha,
+            "mtime": mtime,
+            **json.loads(extra),
+            "summary": json.loads(bullets) if bullets else [],
+        }
+    for date, target, message, extra in conn.execute("SELECT date, target, message, extra FROM changelog ORDER BY id"):
+        manifest["changelog"].append({"date": date, "target": target, "message": message, **json.loads(extra)})
+    return manifest
+
+
+def _save_sqlite(cfg: Config, manifest: dict) -> None:
+    conn = _sqlite(cfg)
+    with conn:
+        # File rows are written as they are produced (set_file_entry); here we
+        # only drop stale rows, append new changelog rows and update meta.
+        stale = [(sp,) for (sp,) in conn.execute("SELECT path FROM files") if sp not in manifest.get("files", {})]
+        conn.executemany("DELETE FROM files WHERE path = ?", stale)
+        (n_rows,) = conn.execute("SELECT COUNT(*) FROM changelog").fetchone()
+        _insert_changelog(conn, manifest.get("changelog", [])[n_rows:])
+        _write_meta(conn, manifest)
+
+
+def _load_binary(cfg: Config) -> dict:
+    p = cfg.state_dir / "manifest.bin"
+    if p.exists():
+        return load_binary(p)
+    # first use: start from an existing manifest.json (written on the first save)
+    j = cfg.state_dir / "manifest.json"
+    manifest = json.loads(j.read_text(encoding="utf-8")) if j.exists() else _empty_manifest()
+    files = BinaryFiles()
+    for sp, entry in manifest.get("files", {}).items():
+        files[sp] = entry
+    manifest["files"] = files
+    return manifest
+
+
 def load_manifest(cfg: Config) -> dict:
     ensure_state(cfg)
+    if state_backend(cfg) == "sqlite":
+        return _load_sqlite(cfg)
+    if state_backend(cfg) == "binary":
+        return _load_binary(cfg)
     p = cfg.state_dir / "manifest.json"
     if not p.exists():
-        return {"version": 1, "generated_at": "", "files": {}, "changelog": []}
+        return _empty_manifest()
     return json.loads(p.read_text(encoding="utf-8"))
 
 
 def save_manifest(cfg: Config, manifest: dict) -> None:
     ensure_state(cfg)
-    p = cfg.state_dir / "manifest.json"
-    p.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    if state_backend(cfg) == "sqlite":
+        _save_sqlite(cfg, manifest)
+        return
+    if state_backend(cfg) == "binary":
+        write_manifest(cfg.state_dir / "manifest.bin", manifest)
+        return
+    _write_json_atomic(cfg.state_dir / "manifest.json", manifest)
+
+
+def _write_json_atomic(p: Path, data: dict) -> None:
+    """temp file + fsync + rename: a crash mid-save leaves the previous manifest intact."""
+    try:
+        mode = p.stat().st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    fd, tmp = tempfile.mkstemp(dir=p.parent, prefix=f".{p.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, mode)
+        os.replace(tmp, p)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def manifest_overview(cfg: Config) -> dict:
+    """Counts and small manifest keys for status; the binary backend reads only its header/meta."""
+    ensure_state(cfg)
+    p = cfg.state_dir / "manifest.bin"
+    if state_backend(cfg) == "binary" and p.exists():
+        return read_overview(p)
+    m = load_manifest(cfg)
+    return {
+        **{k: v for k, v in m.items() if k not in ("files", "changelog")},
+        "n_files": len(m.get("files", {})),
+        "n_changelog": len(m.get("changelog", [])),
+    }
+
+
+def set_file_entry(cfg: Config, manifest: dict, sp: str, entry: dict) -> None:
+    """Store one file entry; the sqlite backend persists it immediately."""
+    manifest.setdefault("files", {})[sp] = entry
+    if state_backend(cfg) == "sqlite":
+        conn = _sqlite(cfg)
+        with conn:
+            _upsert_file(conn, sp, entry)
+
+
+def drop_file_entry(cfg: Config, manifest: dict, sp: str) -> None:
+    manifest.get("files", {}).pop(sp, None)
+    if state_backend(cfg) == "sqlite":
+        conn = _sqlite(cfg)
+        with conn:
+            conn.execute("DELETE FROM files WHERE path = ?", (sp,))
+
+
+def trim_changelog(cfg: Config, manifest: dict, n: int) -> None:
+    """Drop the n oldest changelog rows (already archived) and count them as archived."""
+    manifest["changelog"] = manifest.get("changelog", [])[n:]
+    manifest["changelog_archived"] = int(manifest.get("changelog_archived", 0)) + n
+    if state_backend(cfg) == "sqlite":
+        conn = _sqlite(cfg)
+        with conn:
+            # rows not saved yet exist only in the manifest; _save_sqlite
+            # appends whatever lies beyond the rows left in the table
+            conn.execute("DELETE FROM changelog WHERE id IN (SELECT id FROM changelog ORDER BY id LIMIT ?)", (n,))
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('changelog_archived', ?)",
+                (str(manifest["changelog_archived"]),),
+            )
 
 
 def wipe_state(cfg: Config) -> None:
     """Delete state directory (.docxbrief/)."""
     import shutil
+    for key in [k for k in _CONNECTIONS if Path(k).parent == cfg.state_dir.resolve()]:
+        _CONNECTIONS.pop(key).close()
     if cfg.state_dir.exists():
         shutil.rmtree(cfg.state_dir)
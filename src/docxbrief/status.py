@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from .config import Config
-from .state import load_manifest
+from .state import manifest_overview
+from .changelog import changelog_settings, list_segments
 
 
 def show_status(cfg: Config) -> None:
@@ -10,7 +11,16 @@ def show_status(cfg: Config) -> None:
     print(f"  input_dir: {cfg.input_dir}")
     print(f"  output  : {cfg.output_adoc}")
     print(f"  state   : {cfg.state_dir}")
-    m = load_manifest(cfg)
+    m = manifest_overview(cfg)
     print(f"  manifest version: {m.get('version')}")
-    print(f"  tracked files   : {len(m.get('files', {}))}")
-    print(f"  changelog rows  : {len(m.get('changelog', []))}")
+    print(f"  tracked files   : {m['n_files']}")
+    print(f"  changelog rows  : {m['n_changelog']}")
+    if changelog_settings(cfg)["mode"] == "rotate" or m.get("changelog_archived"):
+        print(f"  archived rows   : {m.get('changelog_archived', 0)} in {len(list_segments(cfg))} segment(s)")
+    if m.get("checkpoint"):
+        cp = m["checkpoint"]
+        print(f"  interrupted     : {cp.get('command')} ({len(cp.get('done', []))} file(s) stored; rerun to resume)")
+    failed = m.get("failed", {})
+    print(f"  failed files    : {len(failed)}" + (" (retry with --retry-failed)" if failed else ""))
+    for sp, f in sorted(failed.items()):
+        print(f"    {sp}: {f.get('error', '')} ({f.get('date', '')})")
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import functools
+import hashlib
+import json
 import re
 from typing import List, Tuple
 from .config import Config
@@ -27,19 +30,56 @@ _KNOWN_HEADINGS = (
 )
 
 
+def _alternation(keywords) -> re.Pattern:
+    """One compiled pattern that finds any of the keywords (plain substrings)."""
+    # longest first so the regex engine tries specific terms before their prefixes
+    terms = sorted(set(keywords), key=lambda k: (-len(k), k))
+    return re.compile("|".join(re.escape(k) for k in terms))
+
+
+_KNOWN_RE = _alternation(_KNOWN_HEADINGS)
+
+# per-paragraph classification bits
+_HEADING = 1  # _is_heading_candidate()
+_KNOWN = 2    # contains a known heading
+
+
+@functools.lru_cache(maxsize=32)
+def _focus_matcher(focus: tuple[str, ...]):
+    """Compiled `any(k in line for k in focus)` test; built once per focus list."""
+    if not focus:
+        return None
+    return _alternation(focus).search
+
+
+def _classify(paras: List[str]) -> List[int]:
+    """Single pass over (stripped, non-empty) paragraphs: heading/known flags.
+
+    Focus keywords are only searched later, in the sections that get a new
+    bullet (_section_bullet), so reused sections cost no focus matching.
+    """
+    known_search = _KNOWN_RE.search
+    punct_search = _PUNCT_RE.search
+    stop = _HEADING_STOP
+    flags: List[int] = []
+    for s in paras:
+        f = 0
+        if known_search(s):
+            f = _KNOWN
+            if s not in stop:
+                f |= _HEADING
+        elif len(s) <= 18 and s not in stop and not punct_search(s):
+            # Short-ish, low punctuation, looks like a label
+            f = _HEADING
+        flags.append(f)
+    return flags
+
+
 def _is_heading_candidate(line: str) -> bool:
     s = line.strip()
     if not s:
         return False
-    if s in _HEADING_STOP:
-        return False
-    # known headings
-    if any(k in s for k in _KNOWN_HEADINGS):
-        return True
-    # Short-ish, low punctuation, looks like a label
-    if len(s) <= 18 and not _PUNCT_RE.search(s):
-        return True
-    return False
+    return bool(_classify([s])[0] & _HEADING)
 
 
 def _first_meaningful_line(lines: List[str]) -> str | None:
@@ -60,21 +100,65 @@ def _truncate(s: str, n: int = 160) -> str:
     return s[: n - 3] + "..."
 
 
-def summarize_text(cfg: Config, text: str) -> list[str]:
-    """Stage A: Section-aware heuristic summary.
+def summarize_settings(cfg: Config) -> dict:
+    """The summarize.* settings the summarizer reads (fingerprinted into manifest entries).
 
-    Goals:
-    - Keep original order (no re-order surprises)
-    - Prefer real section headings and first sentences under them
-    - Avoid cover-page / revision-table noise
+    Keys it does not read (language, mode) are left out, so editing them
+    does not mark every entry as made with other settings.
     """
-    bullets_max = int(cfg.raw.get("summarize", {}).get("bullets_max", 8))
+    s = cfg.raw.get("summarize", {}) or {}
+    return {"bullets_max": int(s.get("bullets_max", 8)), "focus": list(s.get("focus") or [])}
+
+
+def section_settings_key(cfg: Config) -> str:
+    """Settings a single section bullet depends on (focus keywords); stored
+    with the section index so cached bullets are only reused when it matches."""
+    focus = summarize_settings(cfg)["focus"]
+    return hashlib.sha256(json.dumps(list(focus), ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+
+def _section_hash(lines: List[str]) -> str:
+    return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()[:16]
+
+
+def _section_bullet(paras: List[str], focus_search, hi: int, next_hi: int) -> str:
+    """"Heading — key line" for the section paras[hi:next_hi] (paras[hi] is the heading)."""
+    heading = paras[hi].strip()
+    # pick a key line in section: focus keyword line > first meaningful line
+    key = None
+    if focus_search is not None:
+        for j in range(hi + 1, next_hi):
+            if focus_search(paras[j]):
+                key = paras[j].strip()
+                break
+    if key is None:
+        key = _first_meaningful_line(paras[hi + 1 : next_hi])
+    if key:
+        return f"{heading} — {_truncate(key)}"
+    return heading
+
+
+def summarize_sections(
+    cfg: Config, text: str, reuse: dict[str, str] | None = None
+) -> Tuple[list[str], list[dict]]:
+    """summarize_text() plus the section index it worked from.
+
+    The index lists every section in paragraph order as {heading, start, end,
+    hash[, bullet]}: paragraphs [start, end) of the non-empty stripped lines,
+    heading "" for front matter before the first heading (or the whole body
+    when there are no headings). `bullet` is set for the sections that were
+    summarized. `reuse` maps section hash -> bullet from an earlier run with
+    the same section_settings_key(); those sections are only hashed, not
+    searched for focus keywords or summarized again.
+    """
+    settings = summarize_settings(cfg)
+    bullets_max = settings["bullets_max"]
 
     # Preserve paragraph boundaries (extract.py joins paragraphs with \n)
     paras = [ln.strip() for ln in text.splitlines() if ln.strip()]
 
     if not paras:
-        return []
+        return [], []
 
     # 1) Pick a compact "doc header" (title-ish lines) from the beginning
     header: list[str] = []
@@ -90,23 +174,28 @@ def summarize_text(cfg: Config, text: str) -> list[str]:
         if len(header) >= 3:
             break
 
+    flags = _classify(paras)
+
     # 2) Find first real section heading to start summarizing the body
-    heading_idxs = [i for i, ln in enumerate(paras) if _is_heading_candidate(ln)]
+    heading_idxs = [i for i, f in enumerate(flags) if f & _HEADING]
     start_i = heading_idxs[0] if heading_idxs else 0
 
     # If the first heading is very early and looks like cover, push start to the first known heading if exists
-    for i, ln in enumerate(paras):
-        if any(k in ln for k in _KNOWN_HEADINGS):
+    for i, f in enumerate(flags):
+        if f & _KNOWN:
             start_i = i
             break
 
-    body = paras[start_i:]
+    index: list[dict] = []
+    if start_i:
+        index.append({"heading": "", "start": 0, "end": start_i, "hash": _section_hash(paras[:start_i])})
 
-    # Recompute heading indices within body
-    rel_heading_idxs = [i for i, ln in enumerate(body) if _is_heading_candidate(ln)]
-    if not rel_heading_idxs:
+    # Heading indices within body (absolute)
+    body_heading_idxs = [i for i in heading_idxs if i >= start_i]
+    if not body_heading_idxs:
+        index.append({"heading": "", "start": start_i, "end": len(paras), "hash": _section_hash(paras[start_i:])})
         # fallback: pick first N lines as-is
-        picked = header + body[: max(0, bullets_max - len(header))]
+        picked = header + paras[start_i : start_i + max(0, bullets_max - len(header))]
         # de-dup preserving order
         seen = set()
         out = []
@@ -115,33 +204,28 @@ def summarize_text(cfg: Config, text: str) -> list[str]:
                 continue
             seen.add(x)
             out.append(_truncate(x))
-        return out[:bullets_max]
+        return out[:bullets_max], index
+
+    spans = list(zip(body_heading_idxs, body_heading_idxs[1:] + [len(paras)]))
+    sections = [
+        {"heading": paras[hi], "start": hi, "end": next_hi, "hash": _section_hash(paras[hi:next_hi])}
+        for hi, next_hi in spans
+    ]
+    index.extend(sections)
 
     # 3) Build section bullets in order: "Heading — first line / key line"
-    focus = cfg.raw.get("summarize", {}).get("focus", []) or []
     out: list[str] = []
 
     # include header lines first (dedup later)
     out.extend(header)
 
-    for idx_pos, hi in enumerate(rel_heading_idxs):
-        heading = body[hi].strip()
-        next_hi = rel_heading_idxs[idx_pos + 1] if idx_pos + 1 < len(rel_heading_idxs) else len(body)
-        section_lines = body[hi + 1 : next_hi]
-
-        # pick a key line in section: focus keyword line > first meaningful line
-        key = None
-        for ln in section_lines:
-            if any(k in ln for k in focus):
-                key = ln.strip()
-                break
-        if key is None:
-            key = _first_meaningful_line(section_lines)
-
-        if key:
-            out.append(f"{heading} — {_truncate(key)}")
-        else:
-            out.append(heading)
+    focus_search = _focus_matcher(tuple(settings["focus"]))
+    for sec in sections:
+        bullet = reuse.get(sec["hash"]) if reuse else None
+        if bullet is None:
+            bullet = _section_bullet(paras, focus_search, sec["start"], sec["end"])
+        sec["bullet"] = bullet
+        out.append(bullet)
 
         if len(out) >= bullets_max:
             break
@@ -156,4 +240,15 @@ def summarize_text(cfg: Config, text: str) -> list[str]:
         seen.add(x)
         deduped.append(x)
 
-    return deduped[:bullets_max]
+    return deduped[:bullets_max], index
+
+
+def summarize_text(cfg: Config, text: str) -> list[str]:
+    """Stage A: Section-aware heuristic summary.
+
+    Goals:
+    - Keep original order (no re-order surprises)
+    - Prefer real section headings and first sentences under them
+    - Avoid cover-page / revision-table noise
+    """
+    return summarize_sections(cfg, text)[0]
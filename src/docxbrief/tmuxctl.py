@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import subprocess
+import time
+from typing import Sequence
+
+
+def quote(arg: str) -> str:
+    """Quote one argument for the tmux command parser (single quotes, no escapes).
+
+    `$` is not safe: tmux expands $VAR (and ~) in unquoted words.
+    """
+    if arg and all(c.isalnum() or c in "%@:._-/=+," for c in arg):
+        return arg
+    return "'" + arg.replace("'", "'\"'\"'") + "'"
+
+
+class TmuxCli:
+    """One `tmux <command>` process per command (the classic backend)."""
+
+    def __init__(self, session: str) -> None:
+        self.session = session
+        try:
+            subprocess.check_call(["tmux", "has-session", "-t", session])
+        except (OSError, subprocess.CalledProcessError) as exc:
+            raise RuntimeError(f"tmux session not found: {session}") from exc
+
+    def run(self, commands: Sequence[Sequence[str]]) -> list[list[str]]:
+        out = []
+        for argv in commands:
+            try:
+                text = subprocess.check_output(["tmux", *argv], text=True)
+            except subprocess.CalledProcessError as exc:
+                raise RuntimeError(f"tmux {argv[0]} failed: {exc}") from exc
+            out.append(text.splitlines())
+        return out
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class TmuxControl:
+    """A single `tmux -C` control-mode connection.
+
+    run() writes a whole batch of commands before reading any reply; tmux
+    answers each with a %begin/%end (or %error) block, in order. Blocks with
+    flags 0 (not issued by us, e.g. the attach itself) and %-notifications
+    between blocks are skipped.
+    """
+
+    def __init__(self, session: str) -> None:
+        self.session = session
+        try:
+            self.proc = subprocess.Popen(
+                ["tmux", "-C", "attach-session", "-t", session, "-f", "ignore-size,no-output"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1,
+            )
+        except OSError as exc:
+            raise RuntimeError(f"cannot start tmux: {exc}") from exc
+        # an empty round trip: fails fast if the session does not exist
+        try:
+            self.run([])
+        except RuntimeError as exc:
+            self.close()
+            raise RuntimeError(f"tmux session not found: {session}") from exc
+
+    def _read_block(self) -> tuple[bool, list[str]]:
+        """Next reply block to one of our commands: (ok, output lines)."""
+        while True:
+            line = self.proc.stdout.readline()
+            if not line or line.startswith("%exit"):
+                raise RuntimeError(f"tmux control connection to '{self.session}' closed")
+            if not line.startswith("%begin "):
+                continue  # notification
+            ours = line.split()[-1] == "1"
+            body: list[str] = []
+            while True:
+                line = self.proc.stdout.readline()
+                if not line:
+                    raise RuntimeError(f"tmux control connection to '{self.session}' closed")
+                if line.startswith(("%end ", "%error ")):
+                    break
+                body.append(line.rstrip("\n"))
+            if ours:
+                return line.startswith("%end "), body
+
+    def run(self, commands: Sequence[Sequence[str]]) -> list[list[str]]:
+        if self.proc is None:
+            raise RuntimeError("tmux control connection is closed")
+        # `display-message -p` gives an empty batch a reply to wait for
+        batch = list(commands) or [["display-message", "-p", ""]]
+        try:
+            self.proc.stdin.write("".join(" ".join(quote(a) for a in argv) + "\n" for argv in batch))
+            self.proc.stdin.flush()
+        except (BrokenPipeError, ValueError) as exc:
+            raise RuntimeError(f"tmux control connection to '{self.session}' closed") from exc
+        out = []
+        errors = []
+        for argv in batch:
+            ok, body = self._read_block()
+            if not ok:
+                errors.append(f"tmux {argv[0]}: {' '.join(body)}")
+            out.append(body)
+        if errors:
+            raise RuntimeError("; ".join(errors))
+        return out if commands else []
+
+    def close(self) -> None:
+        proc = getattr(self, "proc", None)
+        if proc is None:
+            return
+        try:
+            if proc.stdin and not proc.stdin.closed:
+                proc.stdin.close()  # EOF detaches the control client
+            proc.wait(timeout=2)
+        except (BrokenPipeError, subprocess.TimeoutExpired):
+            proc.kill()
+        if proc.stdout:
+            proc.stdout.close()
+        self.proc = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+BACKENDS = {"control": TmuxControl, "cli": TmuxCli}
+
+
+def open_tmux(session: str, backend: str = "control"):
+    """Connect to a session; "control" falls back to the cli backend when the
+    control client cannot attach (`attach-session -f` needs tmux >= 3.2)."""
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown tmux backend: {backend} (use: {', '.join(sorted(BACKENDS))})")
+    if backend != "control":
+        return BACKENDS[backend](session)
+    try:
+        return TmuxControl(session)
+    except RuntimeError:
+        tmux = TmuxCli(session)  # raises if the session really is missing
+        print("tmux control mode unavailable (needs tmux >= 3.2); using --backend cli.")
+        return tmux
+
+
+def send_lines(tmux, panes: dict[str, list[str]], delay: float = 0.05) -> None:
+    """Type lines into panes: each line literally, then Enter twice.
+
+    Panes are fed in lock-step rounds, so the pause that keeps TUIs from
+    treating text + Enter as one paste is paid once per round for all panes,
+    not once per keystroke per task.
+    """
+    rounds = max((len(v) for v in panes.values()), default=0)
+    for i in range(rounds):
+        targets = [t for t, lines in panes.items() if i < len(lines)]
+        tmux.run([["send-keys", "-t", t, "-l", panes[t][i]] for t in targets])
+        for _ in range(2):
+            time.sleep(delay)
+            tmux.run([["send-keys", "-t", t, "Enter"] for t in targets])
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+from pathlib import Path
+import datetime
+import os
+import re
+import time
+import traceback
+
+from .config import Config
+from .build import update_summary
+from .scan import scan_entries
+from .render import archive_dir, keep_fragments, shard_dir
+from .inotify import (
+    Inotify,
+    inotify_available,
+    IN_CLOSE_WRITE,
+    IN_CREATE,
+    IN_DELETE,
+    IN_DELETE_SELF,
+    IN_IGNORED,
+    IN_ISDIR,
+    IN_MOVE_SELF,
+    IN_MOVED_FROM,
+    IN_MOVED_TO,
+    IN_ONLYDIR,
+    IN_Q_OVERFLOW,
+)
+
+_DIR_MASK = (
+    IN_CLOSE_WRITE | IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+
+
+class _InotifySource:
+    """Recursive inotify watch on input_dir.
+
+    wait() returns (touched paths, needs_full_rescan). A full rescan is
+    requested on queue overflow or when a whole directory disappears.
+    Paths for which ignore() is true are neither watched nor reported.
+    """
+
+    def __init__(self, root: str, ignore=lambda path: False) -> None:
+        self.root = root
+        self.ignore = ignore
+        self.ino = Inotify()
+        self.dirs: dict[int, str] = {}
+        self._add_tree(root)
+
+    def _add_tree(self, top: str) -> set[str]:
+        found: set[str] = set()
+        if self.ignore(top):
+            return found
+        for dirpath, dirnames, filenames in os.walk(top):
+            dirnames[:] = [d for d in dirnames if not self.ignore(os.path.join(dirpath, d))]
+            try:
+                self.dirs[self.ino.add_watch(dirpath, _DIR_MASK)] = dirpath
+            except OSError:
+                continue
+            found.update(p for p in (os.path.join(dirpath, f) for f in filenames) if not self.ignore(p))
+        return found
+
+    def wait(self, timeout: float | None) -> tuple[set[str], bool]:
+        touched: set[str] = set()
+        full = False
+        for wd, mask, _cookie, name in self.ino.read(timeout):
+            if mask & IN_Q_OVERFLOW:
+                full = True
+                continue
+            d = self.dirs.get(wd)
+            if d is None:
+                continue
+            if mask & IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                full = full or d == self.root
+                continue
+            path = os.path.join(d, name)
+            if self.ignore(path):
+                continue
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # files may already be inside (mkdir -p + copy, or a moved tree)
+                    touched |= self._add_tree(path)
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    full = True
+                continue
+            touched.add(path)
+        return touched, full
+
+    def close(self) -> None:
+        self.ino.close()
+
+
+class _PollSource:
+    """Fallback: compare stat snapshots of scan_entries() every interval."""
+
+    def __init__(self, cfg: Config, interval: float) -> None:
+        self.cfg = cfg
+        self.interval = interval
+        self.snapshot = self._snap()
+
+    def _snap(self) -> dict[str, tuple[int, int, int]]:
+        return {str(p): (st.st_size, st.st_mtime_ns, st.st_ino) for p, st in scan_entries(self.cfg)}
+
+    def wait(self, timeout: float | None) -> tuple[set[str], bool]:
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        snap = self._snap()
+        touched = {p for p in snap.keys() | self.snapshot.keys() if snap.get(p) != self.snapshot.get(p)}
+        self.snapshot = snap
+        return touched, False
+
+    def close(self) -> None:
+        pass
+
+
+# inotify only sees changes made through this kernel: edits by other NFS/SMB
+# clients never raise an event on these
+_NETWORK_FS = {"nfs", "nfs4", "cifs", "smb3", "smbfs", "9p", "ceph", "glusterfs", "afs", "fuse.sshfs", "lustre", "gpfs"}
+
+
+def _fs_type(path: Path) -> str | None:
+    """Filesystem type of the mount holding path (Linux /proc/self/mounts), or None."""
+    try:
+        with open("/proc/self/mounts", encoding="utf-8") as f:
+            mounts = [line.split()[1:3] for line in f if len(line.split()) >= 3]
+    except OSError:
+        return None
+    real = os.path.realpath(path)
+    best, fstype = "", None
+    for mnt, typ in mounts:
+        mnt = re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), mnt)  # \040 = space
+        if (real == mnt or real.startswith(mnt.rstrip("/") + "/")) and len(mnt) > len(best):
+            best, fstype = mnt, typ
+    return fstype
+
+
+def _own_paths(cfg: Config):
+    """Predicate for paths docxbrief itself writes (state dir, output, shards,
+    changelog archive, the output's temp files). With input_dir: . they sit in
+    the watched tree, and reacting to them would make every update trigger
+    the next one."""
+    out = os.path.abspath(cfg.output_adoc)
+    trees = [os.path.abspath(d) for d in (cfg.state_dir, shard_dir(cfg), archive_dir(cfg))]
+    out_dir, out_name = os.path.split(out)
+
+    def own(path: str) -> bool:
+        path = os.path.abspath(path)
+        if path == out or any(path == t or path.startswith(t + os.sep) for t in trees):
+            return True
+        d, name = os.path.split(path)
+        return d == out_dir and name.startswith(f".{out_name}.") and name.endswith(".tmp")
+
+    return own
+
+
+def _log(message: str) -> None:
+    now = datetime.datetime.now().isoformat(timespec="seconds")
+    print(f"[{now}] {message}", flush=True)
+
+
+def watch_project(
+    cfg: Config,
+    *,
+    debounce: float | None = None,
+    poll: bool | None = None,
+    interval: float | None = None,
+    jobs: int | None = None,
+) -> None:
+    """Watch input_dir and run incremental updates until interrupted.
+
+    Bursts of events are coalesced: after the first event we keep collecting
+    until nothing new arrives for `debounce` seconds (capped at max_wait),
+    then only the touched paths are fed into update_summary().
+    """
+    wcfg = cfg.raw.get("watch", {})
+    debounce = float(wcfg.get("debounce_seconds", 2.0) if debounce is None else debounce)
+    max_wait = float(wcfg.get("max_wait_seconds", 30.0))
+    interval = float(wcfg.get("poll_interval", 5.0) if interval is None else interval)
+    if poll is None:
+        backend = str(wcfg.get("backend", "auto")).strip().lower()
+        if backend not in ("auto", "inotify", "poll"):
+            raise ValueError(f"unknown watch.backend: {backend!r} (expected auto|inotify|poll)")
+        fstype = _fs_type(cfg.input_dir) if backend != "poll" and inotify_available() else None
+        if fstype in _NETWORK_FS:
+            if backend == "auto":
+                _log(f"{cfg.input_dir} is on {fstype}: inotify misses other clients' changes, polling instead")
+                backend = "poll"
+            else:
+                _log(f"warning: {cfg.input_dir} is on {fstype}; inotify misses changes made by other clients")
+        poll = backend == "poll"
+
+    keep_fragments()  # re-renders then only format the files whose entry changed
+    carried: set = set()  # touched paths of a failed update, re-checked with the next batch
+    carried_full = False
+    try:
+        update_summary(cfg, jobs=jobs)
+    except Exception:
+        _log(f"initial update failed:\n{traceback.format_exc().rstrip()}")
+        carried_full = True
+    if not poll and inotify_available():
+        source = _InotifySource(str(cfg.input_dir), _own_paths(cfg))
+        _log(f"watching {cfg.input_dir} (inotify, {len(source.dirs)} dir(s))")
+    else:
+        source = _PollSource(cfg, interval)
+        _log(f"watching {cfg.input_dir} (polling every {interval:g}s)")
+
+    try:
+        while True:
+            touched, full = source.wait(None)
+            if not touched and not full:
+                continue
+            touched |= carried
+            full = full or carried_full
+            started = time.monotonic()
+            while time.monotonic() - started < max_wait:
+                more, more_full = source.wait(debounce)
+                if not more and not more_full:
+                    break
+                touched |= more
+                full = full or more_full
+            t0 = time.monotonic()
+            what = "full rescan" if full else f"{len(touched)} touched path(s)"
+            try:
+                update_summary(cfg, jobs=jobs, touched=None if full else touched)
+            except Exception:
+                # e.g. a file deleted mid-update, a PermissionError, a locked database:
+                # log it and keep watching; only Ctrl-C stops the watcher
+                _log(f"update failed ({what}):\n{traceback.format_exc().rstrip()}")
+                carried, carried_full = touched, full
+                continue
+            carried, carried_full = set(), False
+            _log(f"updated {cfg.output_adoc} ({what}, {time.monotonic() - t0:.2f}s)")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        source.close()
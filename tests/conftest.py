@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from docxbrief.config import Config
+
+
+def make_docx(path: Path, paragraphs: list[str]) -> Path:
+    """Write a .docx with one paragraph per item (python-docx)."""
+    from docx import Document
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    doc = Document()
+    for text in paragraphs:
+        doc.add_paragraph(text)
+    doc.save(str(path))
+    return path
+
+
+def doc_paragraphs(title: str, sections: int = 3) -> list[str]:
+    paras = [title, "Revision List", "改訂", "目的"]
+    paras.append(f"{title} の目的を説明する。")
+    for i in range(sections):
+        paras.append(f"結果{i}")
+        paras.append(f"{title} の結果 {i} は良好だった。")
+        paras.append(f"結論: {title} 節 {i} の決定事項。")
+    return paras
+
+
+@pytest.fixture
+def project(tmp_path: Path):
+    """Config factory for a project under tmp_path; keyword args are dotted-key overrides."""
+
+    def factory(**overrides) -> Config:
+        raw = {
+            "project": {
+                "name": "test",
+                "input_dir": str(tmp_path / "docs"),
+                "output_adoc": str(tmp_path / "summary.adoc"),
+                "state_dir": str(tmp_path / ".docxbrief"),
+            },
+            "scan": {"include_glob": ["**/*.docx"], "exclude_glob": ["**/~$*.docx"]},
+            "filter": {"filename_regex": [], "max_files": 200},
+            "cache": {"enabled": True, "max_mb": 64},
+            "summarize": {"focus": ["目的", "結論", "決定事項"], "bullets_max": 8},
+        }
+        for key, value in overrides.items():
+            section, _, name = key.partition("__")
+            raw.setdefault(section, {})[name] = value
+        return Config(raw=raw, config_path=tmp_path / "docxbrief.yaml")
+
+    return factory
+
+
+@pytest.fixture
+def corpus(tmp_path: Path) -> list[Path]:
+    docs = tmp_path / "docs"
+    paths = [
+        make_docx(docs / "a.docx", doc_paragraphs("Alpha")),
+        make_docx(docs / "b.docx", doc_paragraphs("Beta", 5)),
+        make_docx(docs / "sub" / "c.docx", doc_paragraphs("Gamma", 2)),
+        make_docx(docs / "sub" / "deep" / "d.docx", doc_paragraphs("Delta", 4)),
+    ]
+    (docs / "sub" / "~$c.docx").write_bytes(b"lock")
+    (docs / "notes.txt").write_text("not a docx", encoding="utf-8")
+    return paths
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+import docxbrief.build as build
+from docxbrief.build import build_summary, update_summary
+from docxbrief.state import load_manifest, wipe_state
+
+from conftest import doc_paragraphs, make_docx
+
+BACKENDS = ["json", "sqlite", "binary"]
+
+
+def _files(cfg) -> dict:
+    return {sp: dict(e) for sp, e in load_manifest(cfg)["files"].items()}
+
+
+def _last_run(cfg) -> dict:
+    return json.loads((cfg.state_dir / "metrics.jsonl").read_text(encoding="utf-8").splitlines()[-1])
+
+
+def _interrupt_after(monkeypatch, n: int) -> None:
+    """Make the n-th stored entry of the next run raise KeyboardInterrupt (like Ctrl-C)."""
+    real, calls = build.set_file_entry, [0]
+
+    def set_file_entry(*args):
+        calls[0] += 1
+        if calls[0] > n:
+            raise KeyboardInterrupt
+        real(*args)
+
+    monkeypatch.setattr(build, "set_file_entry", set_file_entry)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_build_then_update_only_changed(project, corpus, backend):
+    cfg = project(state__backend=backend)
+    build_summary(cfg)
+    before = _files(cfg)
+    assert sorted(before) == sorted(str(p) for p in corpus)
+
+    make_docx(corpus[1], doc_paragraphs("Beta changed", 5))
+    update_summary(cfg)
+    after = _files(cfg)
+    assert _last_run(cfg)["processed"] == 1
+    assert after[str(corpus[1])]["sha256"] != before[str(corpus[1])]["sha256"]
+    assert {sp: e for sp, e in after.items() if sp != str(corpus[1])} == {
+        sp: e for sp, e in before.items() if sp != str(corpus[1])
+    }
+    rows = load_manifest(cfg)["changelog"]
+    assert rows[-1]["target"] == str(corpus[1])
+    assert "Beta changed" in cfg.output_adoc.read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_interrupted_build_resumes(project, corpus, backend, monkeypatch):
+    cfg = project(state__backend=backend, build__checkpoint_files=1)
+    build_summary(cfg)
+    expected_files, expected_adoc = _files(cfg), cfg.output_adoc.read_text(encoding="utf-8")
+
+    wipe_state(cfg)
+    cfg.output_adoc.unlink()
+    with monkeypatch.context() as m:
+        _interrupt_after(m, 2)
+        with pytest.raises(KeyboardInterrupt):
+            build_summary(cfg)
+    partial = load_manifest(cfg)
+    assert partial["checkpoint"]["command"] == "build"
+    assert len(partial["files"]) == 2
+
+    build_summary(cfg)
+    manifest = load_manifest(cfg)
+    assert "checkpoint" not in manifest
+    assert _files(cfg) == expected_files
+    assert cfg.output_adoc.read_text(encoding="utf-8") == expected_adoc
+    assert _last_run(cfg)["processed"] == len(corpus) - 2  # stored files are not redone
+    assert [r["message"] for r in manifest["changelog"]] == [f"Initial build: {len(corpus)} file(s) processed."]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_interrupted_forced_update_resumes(project, corpus, backend, monkeypatch):
+    cfg = project(state__backend=backend, build__checkpoint_files=1)
+    build_summary(cfg)
+    with monkeypatch.context() as m:
+        _interrupt_after(m, 3)
+        with pytest.raises(KeyboardInterrupt):
+            update_summary(cfg, force=True)
+    assert load_manifest(cfg)["checkpoint"]["done"] == [str(p) for p in sorted(corpus)][:3]
+
+    update_summary(cfg)  # resumes forced, skipping what it already stored
+    assert _last_run(cfg)["processed"] == len(corpus) - 3
+    assert "checkpoint" not in load_manifest(cfg)
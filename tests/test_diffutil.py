@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import difflib
+import random
+
+import pytest
+
+from docxbrief.diffutil import diff_lines, diff_stats, unified_diff
+
+
+def _apply(ops, a, b):
+    """Rebuild b from a and the opcodes, checking they tile both sequences."""
+    out, i, j = [], 0, 0
+    for tag, i1, i2, j1, j2 in ops:
+        assert (i1, j1) == (i, j)
+        if tag == "equal":
+            assert a[i1:i2] == b[j1:j2]
+            out.extend(a[i1:i2])
+        else:
+            assert tag in ("replace", "delete", "insert")
+            out.extend(b[j1:j2])
+        i, j = i2, j2
+    assert (i, j) == (len(a), len(b))
+    return out
+
+
+def _edit_distance(a, b):
+    """Inserted + deleted lines of a shortest edit script (LCS DP)."""
+    prev = [0] * (len(b) + 1)
+    for x in a:
+        cur = [0]
+        for k, y in enumerate(b):
+            cur.append(prev[k] + 1 if x == y else max(prev[k + 1], cur[k]))
+        prev = cur
+    return len(a) + len(b) - 2 * prev[-1]
+
+
+def _cases(n=200, seed=7):
+    rnd = random.Random(seed)
+    for _ in range(n):
+        alphabet = "abcde"[: rnd.randint(1, 5)]
+        a = [rnd.choice(alphabet) for _ in range(rnd.randint(0, 25))]
+        b = list(a)
+        for _ in range(rnd.randint(0, 8)):
+            op = rnd.random()
+            if op < 0.3 and b:
+                del b[rnd.randrange(len(b))]
+            elif op < 0.6:
+                b.insert(rnd.randint(0, len(b)), rnd.choice(alphabet))
+            elif b:
+                b[rnd.randrange(len(b))] = rnd.choice(alphabet)
+        yield a, b
+
+
+def test_opcodes_rebuild_and_are_minimal():
+    for a, b in _cases():
+        ops = diff_lines(a, b, max_edits=1000)
+        assert _apply(ops, a, b) == b
+        edits = sum((i2 - i1) + (j2 - j1) for tag, i1, i2, j1, j2 in ops if tag != "equal")
+        assert edits == _edit_distance(a, b)
+
+
+def test_stats_never_exceed_difflib():
+    for a, b in _cases(seed=11):
+        ours = diff_stats("\n".join(a), "\n".join(b))
+        sm = difflib.SequenceMatcher(None, a, b, autojunk=False)
+        removed = sum(i2 - i1 for tag, i1, i2, _, _ in sm.get_opcodes() if tag in ("replace", "delete"))
+        added = sum(j2 - j1 for tag, _, _, j1, j2 in sm.get_opcodes() if tag in ("replace", "insert"))
+        assert ours["added"] + ours["removed"] <= added + removed
+        assert ours["added"] - ours["removed"] == len(b) - len(a)
+        assert "approx" not in ours
+
+
+def test_identical_and_empty():
+    assert diff_lines([], [], 0) == []
+    assert diff_lines(["x"], ["x"], 0) == [("equal", 0, 1, 0, 1)]
+    assert diff_stats("", "a\nb") == {"added": 2, "removed": 0}
+    assert diff_stats("a\nb", "") == {"added": 0, "removed": 2}
+
+
+@pytest.mark.parametrize("a, b", [(["a"] * 10, ["b"] * 10), ([], ["x"] * 10), (["x"] * 10, [])])
+def test_cutoff(a, b):
+    assert diff_lines(a, b, max_edits=5) is None
+    stats = diff_stats("\n".join(a), "\n".join(b), max_edits=5)
+    assert stats == {"added": len(b), "removed": len(a), "approx": True}
+
+
+def test_unified_diff_matches_difflib_hunks():
+    a = [f"line {i}" for i in range(40)]
+    b = list(a)
+    b[5] = "changed"
+    b.insert(30, "inserted")
+    del b[12]
+    assert unified_diff(a, b, n=2, fromfile="old", tofile="new") == list(
+        difflib.unified_diff(a, b, "old", "new", lineterm="", n=2)
+    )
+    assert unified_diff(a, a) == []
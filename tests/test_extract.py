@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import pytest
+
+from docxbrief.extract import content_fingerprint, extract_docx_text
+
+from conftest import doc_paragraphs, make_docx
+
+
+def _both(project, path, **overrides):
+    return [extract_docx_text(project(extract__engine=e, **overrides), path) for e in ("python-docx", "stream")]
+
+
+def test_stream_matches_python_docx(tmp_path, project):
+    path = make_docx(tmp_path / "a.docx", doc_paragraphs("Alpha", 6) + ["", "  indented  ", "tab\tinside"])
+    docx_text, stream_text = _both(project, path)
+    assert stream_text == docx_text
+    assert "Alpha の結果 5 は良好だった。" in stream_text
+
+
+def test_stream_matches_runs_breaks_and_tables(tmp_path, project):
+    from docx import Document
+    from docx.enum.text import WD_BREAK
+
+    doc = Document()
+    p = doc.add_paragraph("bold ")
+    p.add_run("run").bold = True
+    p.add_run(" line").add_break()
+    p.add_run("after break")
+    p.add_run("page").add_break(WD_BREAK.PAGE)
+    table = doc.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = "cell text"  # table cells are not body paragraphs
+    doc.add_paragraph("結論: end")
+    path = tmp_path / "runs.docx"
+    doc.save(str(path))
+
+    docx_text, stream_text = _both(project, path)
+    assert stream_text == docx_text
+    assert "cell text" not in stream_text
+
+
+@pytest.mark.parametrize("max_chars", [1, 10, 57, 200])
+def test_stream_matches_python_docx_truncated(tmp_path, project, max_chars):
+    path = make_docx(tmp_path / "a.docx", doc_paragraphs("Alpha", 10))
+    docx_text, stream_text = _both(project, path, extract__max_chars_per_file=max_chars)
+    assert stream_text == docx_text
+    assert len(stream_text) <= max_chars
+
+
+def test_content_fingerprint(tmp_path):
+    a = make_docx(tmp_path / "a.docx", ["one", "two"])
+    b = make_docx(tmp_path / "b.docx", ["one", "two"])
+    c = make_docx(tmp_path / "c.docx", ["one", "three"])
+    assert content_fingerprint(a) == content_fingerprint(b)
+    assert content_fingerprint(a) != content_fingerprint(c)
+    (tmp_path / "bad.docx").write_bytes(b"not a zip")
+    assert content_fingerprint(tmp_path / "bad.docx") is None
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from docxbrief.scan import path_matcher, scan_files
+
+
+def _touch(root: Path, names: list[str]) -> None:
+    for name in names:
+        p = root / name
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_bytes(b"x")
+
+
+def _reference(root: Path, include: list[str], exclude: list[str]) -> list[Path]:
+    found = {p for pat in include for p in root.glob(pat) if p.is_file()}
+    excluded = {p for pat in exclude for p in root.glob(pat)}
+    return sorted(found - excluded)
+
+
+NAMES = [
+    "a.docx", "b.DOCX", "~$a.docx", "x.txt",
+    "sub/c.docx", "sub/~$c.docx", "sub/deep/d.docx", "sub/deep/e.doc",
+    "other/f.docx", "other/skip/g.docx", ".hidden/h.docx", "a-b/i.docx",
+]
+
+
+@pytest.mark.parametrize(
+    "include, exclude",
+    [
+        (["**/*.docx"], []),
+        (["**/*.docx"], ["**/~$*.docx"]),
+        (["*.docx"], []),
+        (["sub/**/*.docx"], []),
+        (["sub/*.docx", "other/**/*.docx"], ["other/skip/**/*"]),
+        (["**/[a-d].docx"], ["sub/deep/*"]),
+        (["**/*.doc?"], ["**/~$*"]),
+    ],
+)
+def test_scan_matches_path_glob(tmp_path, project, include, exclude):
+    root = tmp_path / "docs"
+    _touch(root, NAMES)
+    cfg = project(scan__include_glob=include, scan__exclude_glob=exclude)
+    expected = _reference(root, include, exclude)
+    assert scan_files(cfg) == expected
+    matches = path_matcher(cfg)
+    assert sorted(p for p in root.rglob("*") if matches(p)) == expected
+
+
+def test_scan_regex_and_max_files(tmp_path, project):
+    root = tmp_path / "docs"
+    _touch(root, NAMES)
+    cfg = project(filter__filename_regex=[r"^[a-d]\."], filter__max_files=2)
+    expected = [p for p in _reference(root, ["**/*.docx"], []) if p.name[0] in "abcd" and p.name[1] == "."]
+    assert len(expected) > 2
+    assert scan_files(cfg) == expected[:2]
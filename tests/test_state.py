@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import hashlib
+
+import pytest
+
+from docxbrief.state import drop_file_entry, load_manifest, manifest_overview, save_manifest, set_file_entry
+
+BACKENDS = ["json", "sqlite", "binary"]
+
+
+def _sha(s: str) -> str:
+    return hashlib.sha256(s.encode("utf-8")).hexdigest()
+
+
+def _entries() -> dict[str, dict]:
+    return {
+        "docs/a.docx": {
+            "sha256": _sha("a"), "mtime": 1700000000.25, "size": 1234, "mtime_ns": 1700000000250000000,
+            "inode": 2**40 + 7, "chars": 99, "sections": [{"heading": "目的", "start": 0, "end": 2, "hash": "ab"}],
+            "sections_key": "k", "summary": ["目的 — 説明", "結論 — 決定"],
+        },
+        "docs/sub/b.docx": {"sha256": _sha("b"), "mtime": 1.5, "summary": []},  # no stat fields
+        "docs/sub/レシピ.docx": {"sha256": _sha("c"), "mtime": None, "size": 0, "content_fp": None, "summary": ["x"]},
+        # sqlite/binary always load a summary (shared entries read theirs from manifest["shared"])
+        "top.docx": {
+            "sha256": _sha("d"), "mtime": 2.0, "size": 5, "mtime_ns": 0, "inode": 0, "shared": True, "summary": [],
+        },
+    }
+
+
+def _plain(manifest: dict) -> dict:
+    return {
+        **{k: v for k, v in manifest.items() if k not in ("files", "changelog")},
+        "files": {sp: dict(e) for sp, e in manifest["files"].items()},
+        "changelog": list(manifest["changelog"]),
+    }
+
+
+def _store(cfg, entries: dict[str, dict]) -> dict:
+    manifest = load_manifest(cfg)
+    for sp, e in entries.items():
+        set_file_entry(cfg, manifest, sp, e)
+    manifest["generated_at"] = "2026-01-01T00:00:00+00:00"
+    manifest["changelog"].append({"date": "2026-01-01", "target": "(all)", "message": "Initial build."})
+    manifest["changelog"].append({"date": "2026-01-02", "target": "docs/a.docx", "message": "Updated.", "diff": "-a\n+b"})
+    manifest["failed"] = {"docs/bad.docx": {"sha256": _sha("bad"), "error": "BadZipFile", "date": "2026-01-02"}}
+    manifest["shared"] = {_sha("d"): {"summary": ["shared"], "sections": [], "sections_key": "k"}}
+    manifest["settings"] = {"extract": {"engine": "stream"}, "summarize": {"bullets_max": 8, "focus": []}}
+    save_manifest(cfg, manifest)
+    return manifest
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_round_trip(project, backend):
+    cfg = project(state__backend=backend)
+    expected = _plain(_store(cfg, _entries()))
+    loaded = _plain(load_manifest(cfg))
+    assert loaded == expected
+    assert loaded["files"] == {sp: {k: v for k, v in e.items()} for sp, e in _entries().items()}
+    overview = manifest_overview(cfg)
+    assert overview["n_files"] == 4 and overview["n_changelog"] == 2
+    assert overview["failed"] == expected["failed"]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_round_trip_after_edits(project, backend):
+    cfg = project(state__backend=backend)
+    _store(cfg, _entries())
+    manifest = load_manifest(cfg)
+    changed = {**manifest["files"]["docs/a.docx"], "summary": ["new"], "mtime": 3.0}
+    set_file_entry(cfg, manifest, "docs/a.docx", changed)
+    set_file_entry(cfg, manifest, "docs/new.docx", {"sha256": _sha("n"), "mtime": 4.0, "summary": ["n"]})
+    drop_file_entry(cfg, manifest, "docs/sub/b.docx")
+    manifest["changelog"].append({"date": "2026-01-03", "target": "docs/sub/b.docx", "message": "Removed."})
+    manifest.pop("failed")
+    save_manifest(cfg, manifest)
+    expected = _plain(manifest)
+
+    # a second save copies the unchanged (binary: raw) records again
+    again = load_manifest(cfg)
+    save_manifest(cfg, again)
+    loaded = _plain(load_manifest(cfg))
+    assert loaded == expected
+    assert sorted(loaded["files"]) == ["docs/a.docx", "docs/new.docx", "docs/sub/レシピ.docx", "top.docx"]
+    assert loaded["files"]["docs/a.docx"]["summary"] == ["new"]
+    assert "failed" not in loaded
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "binary"])
+def test_imports_existing_json(project, backend):
+    expected = _plain(_store(project(), _entries()))
+    cfg = project(state__backend=backend)
+    assert _plain(load_manifest(cfg))["files"] == expected["files"]
@@ -0,0 +1,45 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# Runs `docxbrief b run` on a small diamond DAG against tools/fake-tmux
+# (no tmux session or agents needed):
+#   A -> (B, C) -> D, plus E on any free pane.
+
+ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+cd "$ROOT_DIR"
+
+TASKS=(A B C D E)
+
+cleanup() {
+  for t in "${TASKS[@]}"; do
+    rm -f "b/tasks/TASK-run$t.yaml" "b/results/RESULT-run$t.yaml"
+  done
+}
+trap cleanup EXIT
+
+task() {
+  # task <letter> <assignee> [depends_on...]
+  local t="$1" assignee="$2"
+  shift 2
+  {
+    echo "version: 1"
+    echo "id: \"TASK-run$t\""
+    echo "assignee: \"$assignee\""
+    echo "title: \"b run repro $t\""
+    echo "outputs:"
+    echo "  expected:"
+    echo "    - \"b/results/RESULT-run$t.yaml\""
+    if [ $# -gt 0 ]; then
+      echo "depends_on: [$(printf '"TASK-run%s",' "$@" | sed 's/,$//')]"
+    fi
+  } > "b/tasks/TASK-run$t.yaml"
+}
+
+task A ashigaru1
+task B ashigaru1 A
+task C ashigaru2 A
+task D ashigaru2 B C
+task E any
+
+PATH="$ROOT_DIR/tools/fake-tmux:$PATH" FAKE_TMUX_DELAY="${FAKE_TMUX_DELAY:-1}" \
+  docxbrief b run b/tasks/TASK-run*.yaml --backend cli --timeout 30